@@ -0,0 +1,146 @@
+"""Word timings from the actual TTS audio (offline, NumPy only)
+- Energy envelope -> speech / pause segmentation
+- The longest pauses become sentence boundaries (the Hindi voice keeps the
+  English sentence order, so sentences line up even though words don't)
+- Inside a sentence, words are spread over *speech* time (pauses skipped)
+  in proportion to their syllable count
+- Results are cached as JSON next to the audio file
+"""
+
+from pathlib import Path
+import hashlib
+import json
+import re
+import numpy as np
+import config
+
+FRAME_MS = 10.0
+
+
+def split_sentences(text: str) -> list[str]:
+    """Same sentence split the subtitles use"""
+    sentences = [s.strip() + '.' for s in text.split('.') if s.strip()]
+    return sentences or ["Generating content..."]
+
+
+def syllable_weight(word: str) -> int:
+    """Rough syllable count: vowel groups, at least 1"""
+    groups = re.findall(r"[aeiouy]+", word.lower())
+    n = len(groups)
+    if word.lower().endswith("e") and n > 1:
+        n -= 1
+    return max(1, n) + (1 if any(c.isdigit() for c in word) else 0)
+
+
+def speech_mask(voice: np.ndarray, rate: int):
+    """Boolean voiced/unvoiced flag per FRAME_MS frame"""
+    hop = max(1, int(rate * FRAME_MS / 1000))
+    n = len(voice) // hop
+    if n == 0:
+        return np.zeros(0, dtype=bool), hop
+    frames = voice[:n * hop].reshape(n, hop)
+    energy = np.sqrt(np.mean(frames * frames, axis=1))
+
+    # Smooth over ~50 ms so consonant gaps don't split words
+    k = 5
+    energy = np.convolve(energy, np.ones(k) / k, mode="same")
+    floor = float(np.percentile(energy, 10))
+    peak = float(np.percentile(energy, 95))
+    threshold = floor + (peak - floor) * config.ALIGNMENT["energy_threshold"]
+    voiced = energy > threshold
+
+    # Close short gaps inside words / phrases
+    min_gap = int(config.ALIGNMENT["min_pause_ms"] / FRAME_MS)
+    for start, end in _pauses(voiced):
+        if end - start < min_gap:
+            voiced[start:end] = True
+    return voiced, hop
+
+
+def _pauses(voiced: np.ndarray):
+    """(start_frame, end_frame) of every unvoiced run strictly inside the speech"""
+    idx = np.flatnonzero(voiced)
+    if idx.size == 0:
+        return []
+    first, last = idx[0], idx[-1]
+    inner = ~voiced[first:last + 1]
+    change = np.diff(np.concatenate([[0], inner.astype(np.int8), [0]]))
+    starts = np.flatnonzero(change == 1) + first
+    ends = np.flatnonzero(change == -1) + first
+    return list(zip(starts, ends))
+
+
+def align(voice: np.ndarray, rate: int, english_text: str) -> dict:
+    """
+    Compute sentence and word timings (seconds) for the subtitles.
+    Returns {"sentences": [[start, end, text]], "words": [[start, end, word]]}.
+    """
+    duration = len(voice) / rate
+    sentences = split_sentences(english_text)
+    voiced, hop = speech_mask(voice, rate)
+    frame_s = hop / rate
+
+    if not voiced.any():
+        raise ValueError("no speech detected")
+
+    idx = np.flatnonzero(voiced)
+    speech_start, speech_end = idx[0], idx[-1] + 1
+
+    # Sentence boundaries = the N-1 longest pauses, in time order
+    pauses = sorted(_pauses(voiced), key=lambda p: p[1] - p[0], reverse=True)
+    cuts = sorted(pauses[:len(sentences) - 1])
+    bounds = [speech_start] + [c for p in cuts for c in p] + [speech_end]
+    spans = list(zip(bounds[0::2], bounds[1::2]))
+    while len(spans) < len(sentences):
+        # Fewer pauses than sentences: split the longest span proportionally
+        i = max(range(len(spans)), key=lambda j: spans[j][1] - spans[j][0])
+        s, e = spans[i]
+        spans[i:i + 1] = [(s, (s + e) // 2), ((s + e) // 2, e)]
+
+    result = {"sentences": [], "words": []}
+    for sentence, (s, e) in zip(sentences, spans):
+        result["sentences"].append([round(float(s * frame_s), 3), round(float(e * frame_s), 3), sentence])
+
+        words = sentence.split()
+        weights = np.array([syllable_weight(w) for w in words], dtype=np.float64)
+        if not words:
+            continue
+
+        # Map cumulative syllable share onto cumulative voiced time in the span
+        span_voiced = voiced[s:e]
+        speech_time = np.concatenate([[0], np.cumsum(span_voiced)])
+        if speech_time[-1] == 0:
+            speech_time = np.arange(e - s + 1, dtype=np.float64)
+        targets = np.concatenate([[0], np.cumsum(weights)]) / weights.sum() * speech_time[-1]
+        frames = np.searchsorted(speech_time, targets, side="left")
+        frames = np.clip(frames, 0, e - s)
+
+        for word, a, b in zip(words, frames[:-1], frames[1:]):
+            start, end = (s + a) * frame_s, (s + max(b, a + 1)) * frame_s
+            result["words"].append([round(float(start), 3), round(float(min(end, duration)), 3), word])
+
+    return result
+
+
+def get_timings(voice: np.ndarray, rate: int, english_text: str, cache_path: str | Path) -> dict:
+    """Cached align(): recomputed only when the audio or the text changes"""
+    key = hashlib.sha1(
+        np.ascontiguousarray(voice).tobytes() + english_text.encode("utf-8") + str(rate).encode()
+    ).hexdigest()
+
+    cache_path = Path(cache_path)
+    if cache_path.exists():
+        try:
+            cached = json.loads(cache_path.read_text(encoding="utf-8"))
+            if cached.get("key") == key:
+                print(f"[ALIGN] Using cached timings {cache_path}")
+                return cached["timings"]
+        except Exception:
+            pass
+
+    timings = align(voice, rate, english_text)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    cache_path.write_text(json.dumps({"key": key, "timings": timings}, ensure_ascii=False, indent=1),
+                          encoding="utf-8")
+    print(f"[ALIGN] {len(timings['words'])} word timings from audio → {cache_path}")
+    return timings
@@ -0,0 +1,176 @@
+"""Per-run pool of immutable render assets
+Every scene of a batch shares the same channel styles, so layout plans,
+static layer bitmaps, music tracks and placeholder images are built once
+and looked up by kind + a hash of the style / content that produced them.
+
+- In the main process, arrays are published to multiprocessing.shared_memory
+- Worker processes (--jobs) attach to those blocks by name through handle(),
+  so they map the parent's bitmaps instead of rebuilding or unpickling them
+- Hits / misses are counted per kind for the run report
+"""
+
+from collections import defaultdict
+from multiprocessing import shared_memory
+import atexit
+import hashlib
+import threading
+import numpy as np
+
+
+def asset_key(kind: str, data) -> str:
+    """Stable key for an asset: kind + hash of whatever determines its content"""
+    return f"{kind}:{hashlib.sha1(repr(data).encode('utf-8')).hexdigest()[:16]}"
+
+
+class AssetPool:
+    def __init__(self, manifest: dict = None):
+        self.objects = {}                      # key -> in-process object
+        self.manifest = dict(manifest or {})   # key -> (shm name, shape, dtype) shared by the owner
+        self.owner = manifest is None
+        self._blocks = {}                      # key -> SharedMemory kept open
+        self._lock = threading.RLock()         # guards the dicts; never held while building
+        self._building = {}                    # key -> RLock held by the thread building it
+        self.stats = defaultdict(lambda: {"hits": 0, "misses": 0, "shared": 0})
+        self._counters = {}                    # kind -> fn() -> (hits, misses), e.g. lru caches
+
+    # ───────────────────────────────────────────────
+    # Lookups
+    # ───────────────────────────────────────────────
+    def _lookup(self, kind, key, make):
+        """
+        Cached object for key, else make() -> (obj, stat) under a lock of
+        this key only: a slow build blocks other lookups of the same key,
+        which wait for its result, but not hits or builds of other keys
+        """
+        with self._lock:
+            if key in self.objects:
+                self.stats[kind]["hits"] += 1
+                return self.objects[key]
+            key_lock = self._building.setdefault(key, threading.RLock())
+        with key_lock:
+            with self._lock:
+                if key in self.objects:   # built by another thread while this one waited
+                    self.stats[kind]["hits"] += 1
+                    return self.objects[key]
+            obj, stat = make()
+            with self._lock:
+                self.stats[kind][stat] += 1
+                self.objects[key] = obj
+                self._building.pop(key, None)
+            return obj
+
+    def get(self, kind: str, data, build):
+        """Any immutable object, shared within this process"""
+        return self._lookup(kind, asset_key(kind, data), lambda: (build(), "misses"))
+
+    def array(self, kind: str, data, build) -> np.ndarray:
+        """A read-only NumPy array, shared with worker processes through shared memory"""
+        key = asset_key(kind, data)
+
+        def make():
+            if key in self.manifest and not self.owner:
+                arr, stat = self._attach(key), "shared"
+            else:
+                arr, stat = build(), "misses"
+                if self.owner:
+                    arr = self._publish(key, arr)
+            arr.flags.writeable = False
+            return arr, stat
+
+        return self._lookup(kind, key, make)
+
+    def register_counter(self, kind: str, counter):
+        """Report an external cache (counter() -> (hits, misses)) alongside the pool"""
+        self._counters[kind] = counter
+
+    # ───────────────────────────────────────────────
+    # Shared memory
+    # ───────────────────────────────────────────────
+    def _publish(self, key, arr):
+        arr = np.ascontiguousarray(arr)
+        shm = shared_memory.SharedMemory(create=True, size=max(1, arr.nbytes))
+        view = np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)
+        view[...] = arr
+        with self._lock:
+            self._blocks[key] = shm
+            self.manifest[key] = (shm.name, arr.shape, arr.dtype.str)
+        return view
+
+    def _attach(self, key):
+        name, shape, dtype = self.manifest[key]
+        # Workers are children of the owner and share its resource tracker,
+        # so the block is unlinked exactly once, by the owner
+        shm = shared_memory.SharedMemory(name=name)
+        with self._lock:
+            self._blocks[key] = shm
+        return np.ndarray(tuple(shape), dtype=np.dtype(dtype), buffer=shm.buf)
+
+    def handle(self) -> dict:
+        """Picklable description of the shared arrays, for attach() in a worker"""
+        with self._lock:
+            return dict(self.manifest)
+
+    def close(self):
+        with self._lock:
+            self.objects.clear()
+            for shm in self._blocks.values():
+                try:
+                    shm.close()
+                    if self.owner:
+                        shm.unlink()
+                except (FileNotFoundError, BufferError):
+                    pass
+            self._blocks.clear()
+
+    # ───────────────────────────────────────────────
+    # Reporting
+    # ───────────────────────────────────────────────
+    def snapshot(self) -> dict:
+        with self._lock:
+            stats = {kind: dict(s) for kind, s in self.stats.items()}
+        for kind, counter in self._counters.items():
+            hits, misses = counter()
+            stats[kind] = {"hits": hits, "misses": misses, "shared": 0}
+        return stats
+
+
+def merge_stats(*snapshots) -> dict:
+    """Sum snapshots (e.g. from worker processes) and add hit rates"""
+    total = defaultdict(lambda: {"hits": 0, "misses": 0, "shared": 0})
+    for snap in snapshots:
+        for kind, s in (snap or {}).items():
+            for field in ("hits", "misses", "shared"):
+                total[kind][field] += s.get(field, 0)
+    for s in total.values():
+        lookups = s["hits"] + s["misses"] + s["shared"]
+        s["hit_rate"] = round((s["hits"] + s["shared"]) / lookups, 3) if lookups else 0.0
+    return dict(total)
+
+
+def print_stats(stats: dict):
+    for kind, s in sorted(stats.items()):
+        print(f"  {kind:14} hits {s['hits']:4d}  shared {s['shared']:3d}  "
+              f"built {s['misses']:3d}  hit rate {s['hit_rate']:.0%}")
+
+
+_pool = None
+
+
+def get_pool() -> AssetPool:
+    """The process-wide pool (created on first use; owner of its shared memory)"""
+    global _pool
+    if _pool is None:
+        _pool = AssetPool()
+        atexit.register(_pool.close)
+    return _pool
+
+
+def attach(manifest: dict) -> AssetPool:
+    """Use the parent's shared assets in a worker process"""
+    global _pool
+    if _pool is None or (_pool.owner and not _pool.objects):
+        counters = _pool._counters if _pool is not None else {}
+        _pool = AssetPool(manifest)
+        _pool._counters.update(counters)   # caches registered at import time
+        atexit.register(_pool.close)
+    return _pool
@@ -1,19 +1,148 @@
-# Audio TTS 
-"""Generate Hindi TTS audio"""
+# Audio TTS
+"""Generate Hindi TTS audio
+- Pluggable backends, selected with config.TTS["backend"]:
+    gtts    Google TTS over the network (MP3)
+    espeak  espeak-ng CLI, fully offline (WAV)
+    piper   Piper neural TTS CLI with a local .onnx voice, offline (WAV)
+- generate_many() synthesizes several scenes at once; offline engines run
+  one process per core, gTTS is kept to a few requests to avoid rate limits
+"""
 
-from gtts import gTTS
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import os
+import shutil
+import subprocess
+import config
 
-def generate_audio(text_hindi: str, output_path: str | Path = "temp/audio.mp3") -> str:
-    path = Path(output_path)
+
+class TTSBackend:
+    """Interface: synthesize(text, output_path) -> path of the written file"""
+
+    name = "base"
+    extension = ".wav"
+    offline = True
+
+    def synthesize(self, text: str, output_path: Path) -> Path:
+        raise NotImplementedError
+
+    def available(self) -> bool:
+        return True
+
+
+class GTTSBackend(TTSBackend):
+    name = "gtts"
+    extension = ".mp3"
+    offline = False
+
+    def synthesize(self, text, output_path):
+        from gtts import gTTS
+        tts = gTTS(text=text, lang=config.TTS["language"], slow=False)
+        tts.save(str(output_path))
+        return output_path
+
+    def available(self):
+        try:
+            import gtts  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+
+class CommandBackend(TTSBackend):
+    """Local CLI engine: text on stdin, WAV written to output_path"""
+
+    binary_key = None
+
+    @property
+    def binary(self) -> str:
+        return config.TTS[self.binary_key]
+
+    def command(self, output_path: Path) -> list[str]:
+        raise NotImplementedError
+
+    def synthesize(self, text, output_path):
+        proc = subprocess.run(self.command(output_path), input=text.encode("utf-8"), capture_output=True)
+        if proc.returncode != 0:
+            raise RuntimeError(f"{self.name} failed: {proc.stderr.decode(errors='ignore')[-300:]}")
+        return output_path
+
+    def available(self):
+        return shutil.which(self.binary) is not None
+
+
+class EspeakBackend(CommandBackend):
+    name = "espeak"
+    binary_key = "espeak_binary"
+
+    def command(self, output_path):
+        cfg = config.TTS
+        return [self.binary, "-v", cfg["espeak_voice"], "-s", str(cfg["espeak_speed"]),
+                "-w", str(output_path), "--stdin"]
+
+
+class PiperBackend(CommandBackend):
+    name = "piper"
+    binary_key = "piper_binary"
+
+    def command(self, output_path):
+        return [self.binary, "--model", config.TTS["piper_model"], "--output_file", str(output_path)]
+
+    def available(self):
+        return super().available() and Path(config.TTS["piper_model"]).exists()
+
+
+BACKENDS = {cls.name: cls for cls in (GTTSBackend, EspeakBackend, PiperBackend)}
+
+
+def get_backend(name: str = None) -> TTSBackend:
+    """Backend by name (default: config.TTS["backend"])"""
+    name = name or config.TTS["backend"]
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown TTS backend '{name}' (choose from {', '.join(BACKENDS)})")
+    return BACKENDS[name]()
+
+
+def generate_audio(text_hindi: str, output_path: str | Path = "temp/audio.mp3", backend: str = None) -> str:
+    """Synthesize one text. The extension of output_path follows the backend's format."""
+    engine = get_backend(backend)
+    path = Path(output_path).with_suffix(engine.extension)
     path.parent.mkdir(parents=True, exist_ok=True)
 
-    tts = gTTS(text=text_hindi, lang="hi", slow=False)
-    tts.save(str(path))
+    engine.synthesize(text_hindi, path)
 
-    if not path.is_file():
+    if not path.is_file() or path.stat().st_size == 0:
         raise RuntimeError("Audio file was not created")
 
-    print(f"Audio saved → {path}")
-    return str(path)
\ No newline at end of file
+    print(f"Audio saved → {path} ({engine.name})")
+    return str(path)
+
+
+def default_workers(backend: str = None) -> int:
+    engine = get_backend(backend)
+    if config.TTS["workers"]:
+        return config.TTS["workers"]
+    if engine.offline:
+        return os.cpu_count() or 1
+    return config.TTS["online_workers"]
+
+
+def generate_many(jobs: list[tuple[str, str | Path]], backend: str = None, max_workers: int = None) -> list:
+    """
+    Synthesize [(text, output_path), ...] in parallel.
+    Returns paths in job order; a failed job gives its exception instead of a path.
+    """
+    if not jobs:
+        return []
+    max_workers = max(1, min(max_workers or default_workers(backend), len(jobs)))
+
+    def run(job):
+        text, path = job
+        try:
+            return generate_audio(text, path, backend=backend)
+        except Exception as e:
+            return e
+
+    # CLI engines do their work in child processes, so threads are enough to fill the cores
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(run, jobs))
@@ -0,0 +1,139 @@
+"""NumPy audio stage: one decode, one mix, one encode
+- TTS voice decoded once to PCM
+- WSOLA time-stretch to AUDIO["speed_factor"] (tempo changes, pitch does not)
+- Background music from the music cache, ducked under speech
+- Written as a single AAC track that the video encode only has to mux
+"""
+
+from pathlib import Path
+import time
+import numpy as np
+import config
+from ffmpeg_tools import decode_audio, encode_audio
+from music_cache import get_music_track
+
+
+def time_stretch(x: np.ndarray, speed: float, rate: int,
+                 frame_ms: float = None, tolerance_ms: float = None) -> np.ndarray:
+    """
+    WSOLA time-scale modification of a mono signal.
+    speed > 1 shortens the audio. Each output frame is taken from near its
+    ideal input position, shifted (within the tolerance) to the offset whose
+    waveform best continues the previous frame, then overlap-added.
+    """
+    if abs(speed - 1.0) < 1e-3 or len(x) == 0:
+        return x.astype(np.float32, copy=True)
+
+    frame_ms = frame_ms or config.AUDIO["stretch_frame_ms"]
+    tolerance_ms = tolerance_ms or config.AUDIO["stretch_tolerance_ms"]
+    n = int(rate * frame_ms / 1000) // 2 * 2
+    hop_out = n // 2
+    hop_in = hop_out * speed
+    tol = int(rate * tolerance_ms / 1000)
+    win = np.hanning(n).astype(np.float32)
+
+    xp = np.concatenate([np.zeros(tol, np.float32), x.astype(np.float32), np.zeros(n + 2 * tol + hop_out, np.float32)])
+    n_frames = max(1, int(np.ceil(len(x) / hop_in)))
+    out = np.zeros(n_frames * hop_out + n, dtype=np.float32)
+    norm = np.zeros_like(out)
+
+    nfft = 1 << int(np.ceil(np.log2(n + 2 * tol)))
+    prev = None
+    for k in range(n_frames):
+        ideal = int(k * hop_in) + tol
+        if prev is None:
+            pos = ideal
+        else:
+            # Cross-correlate the natural continuation of the previous frame
+            # with the search region (FFT, so cost does not grow with tol)
+            target = xp[prev + hop_out:prev + hop_out + n]
+            region = xp[ideal - tol:ideal + tol + n]
+            spec = np.fft.rfft(region, nfft) * np.conj(np.fft.rfft(target, nfft))
+            corr = np.fft.irfft(spec, nfft)[:2 * tol + 1]
+            pos = ideal - tol + int(np.argmax(corr))
+        o = k * hop_out
+        out[o:o + n] += xp[pos:pos + n] * win
+        norm[o:o + n] += win
+        prev = pos
+
+    out /= np.maximum(norm, 1e-3)
+    return out[:int(round(len(x) / speed))]
+
+
+def speech_envelope(voice: np.ndarray, rate: int, window_ms: float = 20.0):
+    """Frame RMS of the voice, returned with the frame hop in samples"""
+    hop = max(1, int(rate * window_ms / 1000))
+    n = len(voice) // hop
+    frames = voice[:n * hop].reshape(n, hop)
+    return np.sqrt(np.mean(frames * frames, axis=1)), hop
+
+
+def duck_gain(voice: np.ndarray, rate: int, n_samples: int) -> np.ndarray:
+    """
+    Per-sample music gain: 1.0 in pauses, AUDIO["duck_db"] under speech,
+    with attack/release smoothing so the music doesn't pump.
+    """
+    cfg = config.AUDIO
+    rms, hop = speech_envelope(voice, rate)
+    if rms.size == 0:
+        return np.ones(n_samples, dtype=np.float32)
+
+    threshold = max(1e-4, float(np.percentile(rms, 95)) * 0.1)
+    speaking = rms > threshold
+    target = np.where(speaking, 10 ** (cfg["duck_db"] / 20), 1.0)
+
+    frame_s = hop / rate
+    attack = 1 - np.exp(-frame_s / (cfg["duck_attack_ms"] / 1000))
+    release = 1 - np.exp(-frame_s / (cfg["duck_release_ms"] / 1000))
+
+    # One-pole smoothing toward a target that only changes between runs of
+    # speech / pause: inside a run, g_k = t + (g_0 - t) * (1 - c)^k in closed
+    # form, so only the run boundaries are visited in Python
+    edges = np.flatnonzero(np.diff(speaking)) + 1
+    gain = np.empty_like(target)
+    g = 1.0
+    for s, e in zip(np.concatenate([[0], edges]), np.concatenate([edges, [len(target)]])):
+        t = target[s]
+        c = attack if t < g else release
+        gain[s:e] = t + (g - t) * (1 - c) ** np.arange(1, e - s + 1)
+        g = gain[e - 1]
+
+    centers = (np.arange(len(gain)) + 0.5) * hop
+    return np.interp(np.arange(n_samples), centers, gain).astype(np.float32)
+
+
+def prepare_audio(voice_path: str, news_type: str = "default", out_path: str = None) -> dict:
+    """
+    Build the final soundtrack for a scene.
+    Returns {"path", "duration", "rate", "voice"} where voice is the
+    time-stretched mono speech (used for subtitle alignment).
+    """
+    start = time.time()
+    cfg = config.AUDIO
+    rate = cfg["sample_rate"]
+
+    voice = decode_audio(voice_path, rate=rate, channels=1)[:, 0]
+    if voice.size == 0:
+        raise RuntimeError(f"Audio file has no samples: {voice_path}")
+    voice = time_stretch(voice, cfg["speed_factor"], rate)
+    n = len(voice)
+    duration = n / rate
+
+    mix = np.repeat(voice[:, None], 2, axis=1)
+    track = get_music_track(news_type, rate)
+    if not track.silent:
+        music = track.loop(duration, volume=cfg["background_music_volume"], rate=rate)
+        music *= duck_gain(voice, rate, n)[:, None]
+        mix += music
+        print(f"[AUDIO] Music from {track.source} ducked {cfg['duck_db']} dB under speech")
+
+    peak = float(np.abs(mix).max())
+    if peak > 0.99:
+        mix *= 0.99 / peak
+
+    out_path = out_path or str(Path(voice_path).with_name(Path(voice_path).stem + "_mix.m4a"))
+    encode_audio(mix, rate, out_path)
+
+    print(f"[AUDIO] Final track {out_path}: {duration:.2f}s "
+          f"(x{cfg['speed_factor']} stretch) in {time.time() - start:.2f}s")
+    return {"path": out_path, "duration": duration, "rate": rate, "voice": voice}
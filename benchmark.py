@@ -0,0 +1,250 @@
+# benchmark.py
+# Performance checks for the Shorts pipeline. Run one section at a time:
+#
+#   python benchmark.py importtime     # startup cost of main.py (fails on regression)
+#   python benchmark.py tts            # TTS throughput per backend (gtts vs offline engines)
+#   python benchmark.py scaling        # split-encode wall time from 1 to N chunk processes
+#   python benchmark.py fps            # frames/s of MoviePy's compositor vs the raw frame writer
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# ───────────────────────────────────────────────
+# Import time (python -X importtime)
+# ───────────────────────────────────────────────
+
+IMPORT_BUDGET_MS = 150   # Cumulative import time allowed for `import main`
+
+# Modules that must only be imported inside the stage that needs them
+HEAVY_MODULES = [
+    "moviepy", "numpy", "PIL", "scipy", "pydub", "gtts", "googletrans",
+    "deep_translator", "googleapiclient", "google_auth_oauthlib", "requests", "pydantic"
+]
+
+
+def measure_import_time(module: str = "main") -> tuple[float, dict]:
+    """
+    Import `module` in a fresh interpreter with -X importtime.
+    Returns (total_ms, {top_level_module: cumulative_ms}).
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue   # header line
+        modules[name.strip()] = int(cumulative) / 1000.0
+        if name.startswith(" ") and not name.startswith("  ") and name.strip() != module:
+            # A finished top-level import that isn't ours (site, .pth hooks): drop its subtree
+            modules = {}
+
+    # The module's own cumulative time covers everything it pulls in
+    return modules.get(module, 0.0), modules
+
+
+def bench_importtime(args) -> int:
+    total_ms, modules = measure_import_time(args.module)
+    top = sorted(modules.items(), key=lambda kv: kv[1], reverse=True)[:10]
+
+    print(f"[IMPORT] import {args.module}: {total_ms:.1f} ms (budget {args.budget} ms)")
+    for name, ms in top:
+        print(f"  {ms:8.1f} ms  {name}")
+
+    heavy = sorted({name.split(".")[0] for name in modules} & set(HEAVY_MODULES))
+    failed = False
+    if heavy:
+        print(f"[FAIL] Heavy modules imported at startup: {', '.join(heavy)}")
+        failed = True
+    if total_ms > args.budget:
+        print(f"[FAIL] Import time {total_ms:.1f} ms exceeds budget {args.budget} ms")
+        failed = True
+    if not failed:
+        print("[PASS] Startup is lazy")
+    return 1 if failed else 0
+
+
+# ───────────────────────────────────────────────
+# TTS throughput
+# ───────────────────────────────────────────────
+
+TTS_SAMPLE = ("भारत ने आज एक नया अंतरिक्ष मिशन लॉन्च किया। वैज्ञानिकों का कहना है कि यह मिशन "
+              "चंद्रमा के दक्षिणी ध्रुव का अध्ययन करेगा। ऐसी और खबरों के लिए सब्सक्राइब करें।")
+
+
+def bench_tts(args) -> int:
+    from audio_gen import BACKENDS, get_backend, generate_many, default_workers
+    from ffmpeg_tools import decode_audio
+
+    names = args.backends or list(BACKENDS)
+    texts = [f"{TTS_SAMPLE} ({i + 1})" for i in range(args.scenes)]
+    print(f"[TTS] {args.scenes} scenes x {len(TTS_SAMPLE)} chars")
+    print(f"  {'backend':8} {'workers':>7} {'wall s':>8} {'scenes/s':>9} {'audio s':>8} {'x realtime':>10}")
+
+    failed = False
+    for name in names:
+        engine = get_backend(name)
+        if not engine.available():
+            print(f"  {name:8} skipped (not installed / not configured)")
+            continue
+        workers = args.workers or default_workers(name)
+        with tempfile.TemporaryDirectory() as tmp:
+            jobs = [(t, Path(tmp) / f"scene_{i}") for i, t in enumerate(texts)]
+            start = time.perf_counter()
+            results = generate_many(jobs, backend=name, max_workers=workers)
+            wall = time.perf_counter() - start
+
+            errors = [r for r in results if isinstance(r, Exception)]
+            if errors:
+                print(f"  {name:8} FAILED {len(errors)}/{len(jobs)}: {errors[0]}")
+                failed = True
+                continue
+            audio_s = sum(len(decode_audio(r, rate=16000, channels=1)) / 16000 for r in results)
+        print(f"  {name:8} {workers:7d} {wall:8.2f} {len(jobs) / wall:9.2f} {audio_s:8.1f} {audio_s / wall:10.1f}")
+    return 1 if failed else 0
+
+
+# ───────────────────────────────────────────────
+# Split-encode scaling
+# ───────────────────────────────────────────────
+
+SCALING_TEXT = ("India launched a new lunar mission today. Scientists say it will study the south pole. "
+                "The lander carries four instruments. Subscribe for more space news.")
+
+
+def synthetic_spec(seconds: float) -> dict:
+    """compose_scene spec for a scene with no images and uniform subtitle timings"""
+    from video_compose import uniform_timings
+    return {
+        "images": [],
+        "duration": seconds,
+        "content": {"headline": "Benchmark headline", "hook": "Split encode!", "subscribe_hook": "Subscribe!"},
+        "timings": uniform_timings(SCALING_TEXT, seconds),
+        "scale": 1.0,
+        "burn_in": False
+    }
+
+
+def bench_scaling(args) -> int:
+    import os
+    import config
+    from ffmpeg_tools import encode_video
+    from frame_parallel import frame_times
+    from frame_writer import pipe_format, render_frames
+    from renditions import plan_outputs
+    from split_encode import split_encode
+    from video_compose import compose_scene
+
+    spec = synthetic_spec(args.seconds)
+    fps = config.FPS
+    max_chunks = args.max_chunks or os.cpu_count() or 1
+    counts = sorted({1, max_chunks} | {2 ** i for i in range(1, max_chunks.bit_length()) if 2 ** i < max_chunks})
+    print(f"[SCALING] {args.seconds:.0f}s scene at {fps} fps, {os.cpu_count()} CPUs")
+    print(f"  {'chunks':>6} {'wall s':>8} {'fps':>7} {'speedup':>8}")
+
+    baseline = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in counts:
+            outputs = plan_outputs(Path(tmp) / f"scaling_{n}.mp4", extra=[])
+            start = time.perf_counter()
+            if n == 1:
+                # Same frame writer as the chunks, so the speedup is core scaling only
+                clip, owned, _ = compose_scene(spec)
+                encode_video(render_frames(clip, frame_times(args.seconds, fps)), clip.size, fps, outputs,
+                             preset=config.OUTPUT["preset"], gop=round(fps * config.OUTPUT["keyframe_s"]),
+                             pix_fmt=pipe_format())
+                for c in reversed(owned):
+                    c.close()
+            else:
+                split_encode(spec, fps, outputs, chunks=n, preset=config.OUTPUT["preset"])
+            wall = time.perf_counter() - start
+            baseline = baseline or wall
+            frames = len(frame_times(args.seconds, fps))
+            print(f"  {n:6d} {wall:8.2f} {frames / wall:7.1f} {baseline / wall:7.2f}x")
+    return 0
+
+
+# ───────────────────────────────────────────────
+# Frame writer throughput
+# ───────────────────────────────────────────────
+
+def bench_fps(args) -> int:
+    import config
+    from ffmpeg_tools import encode_video
+    from frame_parallel import frame_times
+    from frame_writer import RawFrameWriter
+    from renditions import plan_outputs
+    from video_compose import compose_scene
+
+    fps = config.FPS
+    times = frame_times(args.seconds, fps)
+    clip, owned, _ = compose_scene(synthetic_spec(args.seconds))
+    modes = {
+        "moviepy": ("rgb24", lambda: (clip.get_frame(t).astype("uint8", copy=False) for t in times)),
+        "raw rgb24": ("rgb24", lambda: RawFrameWriter(clip, "rgb24").frames(times)),
+        "raw yuv420p": ("yuv420p", lambda: RawFrameWriter(clip, "yuv420p").frames(times))
+    }
+    print(f"[FPS] {len(times)} frames at {clip.size[0]}x{clip.size[1]}, encode preset {args.preset}")
+    print(f"  {'writer':12} {'compose fps':>11} {'encode fps':>10} {'MB piped':>9} {'gain':>6}")
+
+    baseline = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, (pix_fmt, frames) in modes.items():
+            start = time.perf_counter()
+            piped = sum(frame.nbytes for frame in frames())
+            compose_fps = len(times) / (time.perf_counter() - start)
+
+            outputs = plan_outputs(Path(tmp) / "fps.mp4", extra=[])
+            start = time.perf_counter()
+            encode_video(frames(), clip.size, fps, outputs, preset=args.preset, pix_fmt=pix_fmt)
+            encode_fps = len(times) / (time.perf_counter() - start)
+            baseline = baseline or encode_fps
+            print(f"  {name:12} {compose_fps:11.1f} {encode_fps:10.1f} {piped / 2 ** 20:9.0f} "
+                  f"{encode_fps / baseline:5.2f}x")
+    for c in reversed(owned):
+        c.close()
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shorts pipeline benchmarks")
+    sub = parser.add_subparsers(dest="bench", required=True)
+
+    p = sub.add_parser("importtime", help="Guard main.py startup cost")
+    p.add_argument("--module", default="main")
+    p.add_argument("--budget", type=float, default=IMPORT_BUDGET_MS, help="Budget in ms")
+    p.set_defaults(func=bench_importtime)
+
+    p = sub.add_parser("tts", help="Compare TTS backend throughput")
+    p.add_argument("--backends", nargs="+", help="Backends to compare (default: all installed)")
+    p.add_argument("--scenes", type=int, default=8, help="Texts to synthesize per backend")
+    p.add_argument("--workers", type=int, help="Parallel syntheses (default: per-backend config)")
+    p.set_defaults(func=bench_tts)
+
+    p = sub.add_parser("scaling", help="Split-encode scaling from 1 to N chunk processes")
+    p.add_argument("--seconds", type=float, default=30.0, help="Length of the synthetic scene")
+    p.add_argument("--max-chunks", type=int, help="Largest chunk count (default: CPU count)")
+    p.set_defaults(func=bench_scaling)
+
+    p = sub.add_parser("fps", help="Frame writer throughput (MoviePy compositor vs raw writer)")
+    p.add_argument("--seconds", type=float, default=5.0, help="Length of the synthetic scene")
+    p.add_argument("--preset", default="ultrafast", help="x264 preset for the encode pass")
+    p.set_defaults(func=bench_fps)
+
+    args = parser.parse_args()
+    sys.exit(args.func(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -23,6 +23,60 @@ VIDEO_HEIGHT   = 1920
 FPS            = 30
 HEADER_HEIGHT  = int(VIDEO_HEIGHT * 0.20)  # 384px ≈ 20% top for headline + hook
 
+# Output renditions (see renditions.py for the spec format)
+OUTPUT = {
+    "aspect_ratio": "9:16_FILL",   # Primary output when a story has no metadata.aspect_ratio
+    "renditions": [],              # Extra encodes from the same pass, e.g. ["9:16_FILL@720", "1:1_FILL", "16:9_FIT"]
+    "bitrate_k": 2000,             # For 1080x1920; other sizes scale by pixel count
+    "min_bitrate_k": 600,
+    "preset": "medium",
+    "keyframe_s": 2                # GOP length; split-encode chunks start on these keyframes
+}
+
+# Layout template compiled into a render plan (None = built-in layout from the style dicts above)
+LAYOUT = {
+    "template": None               # Path to a JSON template, see layout.py
+}
+
+# --preview: same layout, scaled down, fast encode, plus a contact sheet
+PREVIEW = {
+    "scale": 1 / 3,                # 360x640
+    "fps": 12,
+    "preset": "ultrafast",
+    "bitrate_k": 400
+}
+
+# Memory use of the render stage
+RENDER = {
+    "lazy_images": True,           # Decode only the slideshow image on screen (False = all up front)
+    "text_sprite_cache": 256,      # Rendered text images kept between scenes / daemon jobs
+    "memory_budget_mb": 0,         # Total for concurrent renders (0 = half of available RAM)
+    "scene_memory_mb": 900,        # Expected peak RSS of one scene render
+    "jobs": 1,                     # Default for --jobs
+    "frame_workers": 1,            # Processes composing frames of one video (1 = in-process)
+    "ring_slots": 4,               # Shared-memory frame buffers per frame worker
+    "split_chunks": 1,             # Keyframe-aligned chunks composed + encoded in parallel (1 = off)
+    "raw_writer": True,            # Compose into one reused buffer (frame_writer.py) instead of MoviePy's compositor
+    "pipe_format": "rgb24"         # Frames piped to ffmpeg: "rgb24" or "yuv420p" (converted in NumPy, half the bytes)
+}
+
+# Render-time estimates for --jobs scheduling (cost_model.py)
+COST_MODEL = {
+    "history": "output/render_costs.jsonl",   # One line per rendered scene: features + seconds
+    "min_records": 8,              # Fit only with at least this many timings (default weights before)
+    "max_records": 500,            # Most recent timings used for the fit
+    "seconds_per_word": 0.45       # Narration length estimate when the audio is not ready yet
+}
+
+# Finished renders reused when the same scene is rendered again (render_cache.py)
+RENDER_CACHE = {
+    "enabled": True,               # Previews are never cached
+    "dir": "output/render_cache",
+    "link": True,                  # Hard-link cached MP4s into output/ (False, or another filesystem = copy)
+    "max_age_days": 30,            # Entries not used for this long are removed
+    "max_mb": 10240                # Least recently used entries are removed above this total
+}
+
 # ───────────────────────────────────────────────
 # TEXT STYLING - Subtitles
 # ───────────────────────────────────────────────
@@ -36,7 +90,9 @@ SUBTITLE = {
     "font": "Arial-Bold",
     "position_y_offset": 250,    # Distance from bottom (config.VIDEO_HEIGHT - this value)
     "background_opacity": 0,      # 0 = no background, 0.5 = semi-transparent, 1 = solid
-    "background_color": (0, 0, 0) # Black background (if opacity > 0)
+    "background_color": (0, 0, 0), # Black background (if opacity > 0)
+    "renderer": "python",         # python (MoviePy overlay) | libass (ASS karaoke burned in by ffmpeg)
+    "export": True                # Write <video>.srt and <video>.ass next to each video
 }
 
 # ───────────────────────────────────────────────
@@ -113,6 +169,118 @@ AUDIO = {
     }
 }
 
+# ───────────────────────────────────────────────
+# TRANSLATION (English script -> Hindi)
+# ───────────────────────────────────────────────
+
+TRANSLATION = {
+    "backends": ["google", "argos", "phrasebook"],   # Tried in order; offline ones are skipped if not installed
+    "google_workers": 4,                            # Concurrent requests for a batch
+    "phrasebook": "phrasebook_hi.json",
+    "phrasebook_min_coverage": 0.85                 # Below this share of known words the phrasebook fails the
+                                                    # script (mixed Hindi/English reads badly in the Hindi voice)
+}
+
+# ───────────────────────────────────────────────
+# TEXT TO SPEECH
+# ───────────────────────────────────────────────
+
+TTS = {
+    "backend": "gtts",             # gtts (online) | espeak | piper (offline)
+    "language": "hi",
+    "workers": 0,                  # Parallel syntheses (0 = one per core offline, online_workers for gTTS)
+    "online_workers": 2,           # Keep gTTS requests few to avoid rate limiting
+    "espeak_binary": "espeak-ng",
+    "espeak_voice": "hi",
+    "espeak_speed": 160,           # Words per minute (the mixer speeds up by AUDIO["speed_factor"] too)
+    "piper_binary": "piper",
+    "piper_model": "models/hi_IN-voice.onnx"
+}
+
+# ───────────────────────────────────────────────
+# SUBTITLE ALIGNMENT (word timings from the TTS audio)
+# ───────────────────────────────────────────────
+
+ALIGNMENT = {
+    "enabled": True,
+    "energy_threshold": 0.15,      # Fraction between noise floor and speech level
+    "min_pause_ms": 120            # Shorter silences are treated as part of speech
+}
+
+# ───────────────────────────────────────────────
+# IMAGE DEDUPLICATION (perceptual hashing)
+# ───────────────────────────────────────────────
+
+IMAGE_DEDUP = {
+    "enabled": True,
+    "algorithm": "dhash",          # "dhash" (fast) or "phash" (more robust to crops)
+    "hash_size": 8,                # 8x8 = 64-bit hashes
+    "max_distance": 6,             # Hamming bits; <= this counts as a near-duplicate
+    "reserve_factor": 2,           # Pexels results requested per missing image, to replace rejected duplicates
+    "persistent_store": None       # e.g. "temp/image_hashes.npy" to dedupe across runs
+}
+
+# ───────────────────────────────────────────────
+# IMAGE RANKING (score candidates before downloading)
+# ───────────────────────────────────────────────
+
+IMAGE_RANKING = {
+    "enabled": True,
+    "target_aspect": 9 / 16,       # width / height of the Shorts frame
+    "shortlist_factor": 2,         # thumbnails checked = count * this
+    "thumbnail_workers": 6,        # parallel thumbnail fetches
+    "thumbnail_timeout": 5,
+    "sharpness_midpoint": 300.0,   # Laplacian variance that scores 0.5
+    "weights": {
+        "aspect": 0.6,
+        "resolution": 0.4,
+        "thumbnail": 0.5           # share of the final score from the thumbnail check
+    }
+}
+
+# ───────────────────────────────────────────────
+# THUMBNAIL (uses metadata.thumbnail_text_overlay, falls back to headline)
+# ───────────────────────────────────────────────
+
+THUMBNAIL = {
+    "enabled": True,
+    "width": 1080,
+    "height": 1920,
+    "font_path": "arialbd.ttf",    # TrueType file (Pillow, not ImageMagick); falls back to DejaVu / Liberation Sans Bold
+    "fontsize": 110,
+    "color": "yellow",
+    "stroke_color": "black",
+    "stroke_width": 6,
+    "margin": 60,
+    "position_y": 0.45,            # Vertical center of the text band (fraction of height)
+    "band_opacity": 0.45,
+    "quality": 90,                 # JPEG quality (YouTube limit is 2 MB)
+    "workers": 4
+}
+
+# ───────────────────────────────────────────────
+# RENDER DAEMON (python render_daemon.py serve)
+# ───────────────────────────────────────────────
+
+DAEMON = {
+    "host": "127.0.0.1",           # Local only - the API has no authentication
+    "port": 8765,
+    "warm_hosts": ["https://api.pexels.com", "https://serpapi.com"]   # Connected before the first job
+}
+
+# ───────────────────────────────────────────────
+# RENDER QUEUE (main.py --enqueue / --worker, see render_queue.py)
+# ───────────────────────────────────────────────
+
+QUEUE = {
+    "path": "output/render_queue.sqlite",  # On storage every worker shares (with output/ and temp/)
+    "lease_s": 120,                 # A claimed job is requeued if its worker stops heartbeating this long
+    "heartbeat_s": 20,              # How often a worker extends its lease while rendering
+    "max_attempts": 3,              # Claims per job (crashes, expired leases) before it is marked failed
+    "poll_s": 2.0,                  # Idle workers / the waiting coordinator check the queue this often
+    "idle_exit_s": None             # Workers exit after this long without work (None = run forever)
+}
+
 # ───────────────────────────────────────────────
 # YouTube upload settings
 # ───────────────────────────────────────────────
@@ -130,13 +298,34 @@ OUTPUT_DIR = "output"
 DEFAULT_IMAGE_COUNT = 6
 
 # YouTube API settings (for uploader.py)
-YOUTUBE_SCOPES = ["https://www.googleapis.com/auth/youtube.upload"]
+YOUTUBE_SCOPES = [
+    "https://www.googleapis.com/auth/youtube.upload",
+    "https://www.googleapis.com/auth/youtube.force-ssl"   # captions().insert
+]
+
+UPLOAD = {
+    "token_file": "temp/youtube_token.json",       # Cached OAuth token incl. refresh token - never commit it
+    "state_file": "temp/upload_sessions.json",     # Resumable session URIs of unfinished uploads
+    "endpoint": "https://www.googleapis.com/upload/youtube/v3/videos",
+    "chunk_size": 8 * 1024 * 1024,                 # Must be a multiple of 256 KB
+    "max_retries": 5,                              # Per chunk, with exponential backoff
+    "max_concurrent": 2,                           # Parallel uploads for "Upload all"
+    "captions": True,                              # Upload <video>.srt as an English caption track
+    "caption_language": "en"
+}
 
 # AUDIO SETTINGS
 AUDIO = {
     "speed_factor": 1.2,              # Speed up audio (1.0 = normal)
     "background_music_volume": 0.08,   # 0.0 to 1.0
     "auto_download_music": False,       # Set to False initially until you have real URLs
+    "sample_rate": 44100,               # PCM rate for the music cache / mixer
+    "music_target_dbfs": -20,           # Loudness (RMS) every music track is normalized to
+    "duck_db": -8,                      # Music reduction while the voice is speaking
+    "duck_attack_ms": 40,
+    "duck_release_ms": 350,
+    "stretch_frame_ms": 46,             # WSOLA frame length for the speed-up
+    "stretch_tolerance_ms": 10,         # WSOLA search range around each frame
     "music_urls": {                     # Category-specific music URLs
         "default": "",                   # Leave empty to use silent audio
         "TechNews": "",
@@ -0,0 +1,139 @@
+"""Render-time cost model and longest-job-first scheduling
+Every rendered scene appends its features and wall time to
+COST_MODEL["history"] (JSON lines). CostModel fits
+
+    seconds ~ intercept + sum(weight * feature)
+
+by least squares (numpy.linalg.lstsq) over the most recent records, and
+falls back to DEFAULT_WEIGHTS until there are COST_MODEL["min_records"].
+
+Features:
+    words          spoken words drawn as highlighted subtitle sprites (0 with libass)
+    megapixels     composed pixels: narration seconds x fps x frame size (preview is ~1/9)
+    encoded_mp     encoded pixels over every rendition
+    images         slideshow images to decode
+
+lpt_schedule() orders scenes longest-predicted-first; a process pool fed in
+that order assigns each to the first free worker, which is LPT scheduling.
+"""
+
+from pathlib import Path
+import datetime
+import heapq
+import json
+import config
+
+FEATURES = ("words", "megapixels", "encoded_mp", "images")
+
+# Seconds per unit, before any history (roughly one 1080x1920 scene on one core)
+DEFAULT_WEIGHTS = {"intercept": 5.0, "words": 0.15, "megapixels": 0.03, "encoded_mp": 0.01, "images": 0.3}
+
+EXPECTED_IMAGES = 6   # fetch_images() default count
+
+
+def audio_seconds(path) -> float:
+    """Duration of an audio file (decoded at 8 kHz mono; 0 if unreadable)"""
+    try:
+        from ffmpeg_tools import decode_audio
+        return len(decode_audio(path, rate=8000, channels=1)) / 8000
+    except Exception:
+        return 0.0
+
+
+def scene_features(scene: dict, duration_s: float = None, images: int = None, preview: bool = False,
+                   renditions: list[str] = None) -> dict:
+    """Cost features of one scene; duration_s defaults to an estimate from the word count"""
+    from script_gen import build_english_script
+    from renditions import plan_outputs
+
+    words = len(build_english_script(scene).split())
+    if not duration_s:
+        duration_s = words * config.COST_MODEL["seconds_per_word"]
+    meta = scene.get("metadata", {})
+    if preview:
+        scale, fps = config.PREVIEW["scale"], config.PREVIEW["fps"]
+        out_sizes = [(int(config.VIDEO_WIDTH * scale), int(config.VIDEO_HEIGHT * scale))]
+    else:
+        scale, fps = 1.0, config.FPS
+        outputs = plan_outputs("scene.mp4", meta.get("aspect_ratio"),
+                               renditions if renditions is not None else meta.get("renditions"))
+        out_sizes = [out["size"] for out in outputs]
+
+    frames = duration_s * fps
+    frame_px = config.VIDEO_WIDTH * config.VIDEO_HEIGHT * scale * scale
+    highlights = preview or config.SUBTITLE["renderer"] != "libass"
+    return {
+        "words": words if highlights else 0,
+        "megapixels": round(frames * frame_px / 1e6, 2),
+        "encoded_mp": round(frames * sum(w * h for w, h in out_sizes) / 1e6, 2),
+        "images": EXPECTED_IMAGES if images is None else images
+    }
+
+
+class CostModel:
+    def __init__(self, weights: dict = None, records: int = 0):
+        self.weights = dict(weights or DEFAULT_WEIGHTS)
+        self.records = records   # how many timings the weights were fitted on (0 = defaults)
+
+    @classmethod
+    def fit(cls, history: list[dict]) -> "CostModel":
+        """Least-squares fit of seconds on FEATURES; defaults if history is too short"""
+        if len(history) < max(config.COST_MODEL["min_records"], len(FEATURES) + 1):
+            return cls()
+        import numpy as np
+        X = np.array([[1.0] + [float(r["features"].get(f, 0)) for f in FEATURES] for r in history])
+        y = np.array([float(r["seconds"]) for r in history])
+        coef, *_ = np.linalg.lstsq(X, y, rcond=None)
+        return cls(dict(zip(("intercept",) + FEATURES, (round(float(c), 6) for c in coef))), len(history))
+
+    @classmethod
+    def load(cls, path: str | Path = None) -> "CostModel":
+        return cls.fit(load_history(path))
+
+    def predict(self, features: dict) -> float:
+        seconds = self.weights["intercept"] + sum(self.weights[f] * features.get(f, 0) for f in FEATURES)
+        return max(0.1, round(seconds, 2))
+
+    def describe(self) -> str:
+        return f"fitted on {self.records} timings" if self.records else "default weights"
+
+
+def load_history(path: str | Path = None) -> list[dict]:
+    """Most recent COST_MODEL["max_records"] timings"""
+    path = Path(path or config.COST_MODEL["history"])
+    if not path.exists():
+        return []
+    records = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return records[-config.COST_MODEL["max_records"]:]
+
+
+def record_timing(features: dict, seconds: float, path: str | Path = None):
+    """Append one rendered scene to the history"""
+    path = Path(path or config.COST_MODEL["history"])
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps({
+            "time": datetime.datetime.now().isoformat(timespec="seconds"),
+            "features": features,
+            "seconds": round(seconds, 2)
+        }) + "\n")
+
+
+def makespan(costs: list[float], workers: int, order: list[int] = None) -> float:
+    """Finish time of list scheduling: each job in `order` goes to the least-loaded worker"""
+    loads = [0.0] * max(1, workers)
+    for i in (order if order is not None else range(len(costs))):
+        heapq.heapreplace(loads, loads[0] + costs[i])
+    return max(loads)
+
+
+def lpt_schedule(costs: list[float], workers: int) -> tuple[list[int], float]:
+    """(job order, predicted makespan) for longest-processing-time-first"""
+    order = sorted(range(len(costs)), key=lambda i: costs[i], reverse=True)
+    return order, makespan(costs, workers, order)
@@ -0,0 +1,154 @@
+"""Small helpers around the ffmpeg binary MoviePy is configured with"""
+
+from functools import lru_cache
+from pathlib import Path
+import subprocess
+import tempfile
+import numpy as np
+
+
+@lru_cache(maxsize=1)
+def ffmpeg_binary() -> str:
+    from moviepy.config import get_setting
+    return get_setting("FFMPEG_BINARY")
+
+
+@lru_cache(maxsize=1)
+def ffmpeg_version() -> str:
+    """First line of `ffmpeg -version`, e.g. "ffmpeg version 7.0.2-static ..." """
+    proc = subprocess.run([ffmpeg_binary(), "-hide_banner", "-version"], capture_output=True, text=True)
+    return (proc.stdout.splitlines() or ["unknown"])[0].strip()
+
+
+@lru_cache(maxsize=None)
+def has_filter(name: str) -> bool:
+    """Whether this ffmpeg build has a filter (e.g. "subtitles" needs libass)"""
+    proc = subprocess.run([ffmpeg_binary(), "-hide_banner", "-filters"], capture_output=True, text=True)
+    return any(line.split()[1:2] == [name] for line in proc.stdout.splitlines())
+
+
+def filter_path(path: str | Path) -> str:
+    """Quote a file path for use as a filter argument (subtitles=...)"""
+    path = Path(path).as_posix().replace("\\", "/")
+    return "'" + path.replace(":", "\\:").replace("'", "'\\\\\\''") + "'"
+
+
+def decode_audio(path: str | Path, rate: int = 44100, channels: int = 2) -> np.ndarray:
+    """Decode any audio file to float32 PCM, shape (frames, channels)"""
+    cmd = [
+        ffmpeg_binary(), "-v", "error", "-i", str(path),
+        "-f", "f32le", "-acodec", "pcm_f32le", "-ac", str(channels), "-ar", str(rate), "-"
+    ]
+    proc = subprocess.run(cmd, capture_output=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"ffmpeg could not decode {path}: {proc.stderr.decode(errors='ignore')[-300:]}")
+    return np.frombuffer(proc.stdout, dtype=np.float32).reshape(-1, channels)
+
+
+def encode_audio(samples: np.ndarray, rate: int, out_path: str | Path, bitrate: str = "192k") -> str:
+    """Encode float32 PCM (frames, channels) to a file; codec chosen from the extension"""
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    channels = samples.shape[1] if samples.ndim == 2 else 1
+    cmd = [
+        ffmpeg_binary(), "-v", "error", "-y",
+        "-f", "f32le", "-ar", str(rate), "-ac", str(channels), "-i", "-"
+    ]
+    if out_path.suffix.lower() == ".wav":
+        cmd += ["-acodec", "pcm_s16le"]
+    else:
+        cmd += ["-acodec", "aac", "-b:a", bitrate]
+    cmd.append(str(out_path))
+
+    data = np.ascontiguousarray(samples, dtype=np.float32)
+    proc = subprocess.run(cmd, input=memoryview(data).cast("B"), capture_output=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"ffmpeg could not encode {out_path}: {proc.stderr.decode(errors='ignore')[-300:]}")
+    return str(out_path)
+
+
+def mux_audio(video_path: str | Path, audio_path: str | Path, out_path: str | Path) -> str:
+    """Combine a video-only file with a finished audio track, without re-encoding either"""
+    cmd = [
+        ffmpeg_binary(), "-v", "error", "-y",
+        "-i", str(video_path), "-i", str(audio_path),
+        "-map", "0:v:0", "-map", "1:a:0", "-c", "copy", "-shortest",
+        "-movflags", "+faststart", str(out_path)
+    ]
+    proc = subprocess.run(cmd, capture_output=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"ffmpeg could not mux {out_path}: {proc.stderr.decode(errors='ignore')[-300:]}")
+    return str(out_path)
+
+
+def encode_video(frames, size: tuple[int, int], fps: float, outputs: list[dict],
+                 audio_path: str | Path = None, pre_filter: str = None, preset: str = "medium",
+                 gop: int = None, threads: int = None, pix_fmt: str = "rgb24") -> list[str]:
+    """
+    One ffmpeg process for every rendition: raw frames (rgb24 or yuv420p) are
+    piped in once, optionally run through pre_filter (e.g. subtitle burn-in),
+    then split and encoded to each output ({"path", "filter", "bitrate"}). The finished audio
+    track, if given, is copied into every output. gop forces a keyframe every
+    `gop` frames and nowhere else (chunks that concatenate cleanly).
+    """
+    width, height = size
+    n = len(outputs)
+    graph = [f"[0:v]{pre_filter + ',' if pre_filter else ''}split={n}" + "".join(f"[s{i}]" for i in range(n))]
+    graph += [f"[s{i}]{out.get('filter') or 'null'}[v{i}]" for i, out in enumerate(outputs)]
+
+    cmd = [
+        ffmpeg_binary(), "-v", "error", "-y",
+        "-f", "rawvideo", "-pix_fmt", pix_fmt, "-s", f"{width}x{height}", "-r", f"{fps:.02f}", "-i", "-"
+    ]
+    if audio_path:
+        cmd += ["-i", str(audio_path)]
+    cmd += ["-filter_complex", ";".join(graph)]
+    for i, out in enumerate(outputs):
+        Path(out["path"]).parent.mkdir(parents=True, exist_ok=True)
+        cmd += ["-map", f"[v{i}]"]
+        if audio_path:
+            cmd += ["-map", "1:a:0", "-c:a", "copy", "-shortest"]
+        cmd += ["-c:v", "libx264", "-preset", preset, "-b:v", out["bitrate"], "-pix_fmt", "yuv420p",
+                "-r", f"{fps:.02f}"]   # pre_filter may drop the stream rate (setpts)
+        if gop:
+            cmd += ["-g", str(gop), "-keyint_min", str(gop), "-sc_threshold", "0"]
+        if threads:
+            cmd += ["-threads", str(threads)]
+        cmd += ["-movflags", "+faststart", str(out["path"])]
+
+    with tempfile.TemporaryFile() as log:
+        proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=log)
+        try:
+            for frame in frames:
+                proc.stdin.write(np.ascontiguousarray(frame).data)   # no copy for contiguous frames
+        except BrokenPipeError:
+            pass
+        finally:
+            proc.stdin.close()
+            proc.wait()
+        if proc.returncode != 0:
+            log.seek(0)
+            raise RuntimeError(f"ffmpeg encode failed: {log.read().decode(errors='ignore')[-500:]}")
+    return [out["path"] for out in outputs]
+
+
+def concat_videos(parts: list[str | Path], out_path: str | Path, audio_path: str | Path = None) -> str:
+    """
+    Join video parts encoded with identical settings through the concat
+    demuxer (stream copy, no re-encode). The audio track, if given, is muxed
+    once over the whole result.
+    """
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False, encoding="utf-8") as listing:
+        for part in parts:
+            listing.write("file '{}'\n".format(Path(part).resolve().as_posix().replace("'", "'\\''")))
+    cmd = [ffmpeg_binary(), "-v", "error", "-y", "-f", "concat", "-safe", "0", "-i", listing.name]
+    if audio_path:
+        cmd += ["-i", str(audio_path), "-map", "0:v:0", "-map", "1:a:0", "-shortest"]
+    cmd += ["-c", "copy", "-movflags", "+faststart", str(out_path)]
+    try:
+        proc = subprocess.run(cmd, capture_output=True)
+    finally:
+        Path(listing.name).unlink(missing_ok=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"ffmpeg could not concat {out_path}: {proc.stderr.decode(errors='ignore')[-300:]}")
+    return str(out_path)
@@ -0,0 +1,105 @@
+"""Frame-parallel rendering of one composition
+The timeline is striped across worker processes: with N workers, worker w
+composes frames w, w + N, w + 2N, ... Each worker owns a ring of frame
+buffers in multiprocessing.shared_memory and two semaphores (free / filled
+slots). The parent takes frames in order straight out of those buffers and
+hands them to the single ffmpeg encoder, so a 6 MB frame is never pickled
+or copied between processes.
+
+Every worker rebuilds the composition from the picklable scene spec (see
+video_compose.compose_scene) and attaches to the parent's asset pool, so
+each one costs roughly one scene render of memory.
+"""
+
+import multiprocessing
+import traceback
+import numpy as np
+import config
+from frame_writer import RawFrameWriter, frame_bytes, pipe_format
+
+
+def frame_times(duration: float, fps: float) -> np.ndarray:
+    """Same timestamps as MoviePy's iter_frames"""
+    return np.arange(0, duration, 1.0 / fps)
+
+
+def _worker(spec, fps, index, workers, slots, shm_name, free, filled, assets, pix_fmt):
+    from multiprocessing import shared_memory
+    import asset_pool
+    asset_pool.attach(assets)
+    from video_compose import compose_scene
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    ring, owned = None, []
+    try:
+        clip, owned, _ = compose_scene(spec)
+        ring = np.ndarray((slots, frame_bytes(clip.size, pix_fmt)), dtype=np.uint8, buffer=shm.buf)
+        writer = RawFrameWriter(clip, pix_fmt) if config.RENDER["raw_writer"] else None
+        for n, t in enumerate(frame_times(spec["duration"], fps)[index::workers]):
+            free.acquire()
+            if writer is not None:
+                writer.render(t, out=ring[n % slots])   # composed straight into shared memory
+            else:
+                ring[n % slots] = clip.get_frame(t).reshape(-1)
+            filled.release()
+    except BaseException:
+        traceback.print_exc()
+        raise SystemExit(1)
+    finally:
+        for c in reversed(owned):
+            c.close()
+        del ring
+        shm.close()
+
+
+def parallel_frames(spec: dict, fps: float, workers: int, slots: int = 4):
+    """
+    Yield the frames of compose_scene(spec) in order (flat buffers in
+    pipe_format()), composed by `workers` processes. Each yielded array is a
+    view into shared memory that stays valid until the next frame is requested.
+    """
+    from multiprocessing import shared_memory
+    from asset_pool import get_pool
+    from layout import get_plan
+
+    width, height = get_plan(spec["scale"])["size"]   # also publishes the plan bitmaps
+    total = len(frame_times(spec["duration"], fps))
+    workers = max(1, min(workers, total))
+    ctx = multiprocessing.get_context("spawn")
+    pix_fmt = pipe_format()
+    slot_bytes = frame_bytes((width, height), pix_fmt)
+
+    rings, procs = [], []
+    try:
+        for w in range(workers):
+            shm = shared_memory.SharedMemory(create=True, size=slots * slot_bytes)
+            free, filled = ctx.Semaphore(slots), ctx.Semaphore(0)
+            rings.append((shm, np.ndarray((slots, slot_bytes), dtype=np.uint8, buffer=shm.buf),
+                          free, filled))
+            proc = ctx.Process(target=_worker, daemon=True,
+                               args=(spec, fps, w, workers, slots, shm.name, free, filled,
+                                     get_pool().handle(), pix_fmt))
+            proc.start()
+            procs.append(proc)
+
+        for i in range(total):
+            w = i % workers
+            shm, ring, free, filled = rings[w]
+            while not filled.acquire(timeout=1.0):
+                if not procs[w].is_alive():
+                    raise RuntimeError(f"Frame worker {w} exited with code {procs[w].exitcode}")
+            yield ring[(i // workers) % slots]
+            free.release()
+    finally:
+        for proc in procs:
+            if proc.is_alive():
+                proc.terminate()
+            proc.join()
+        blocks = [ring[0] for ring in rings]
+        rings.clear()
+        for shm in blocks:
+            try:
+                shm.close()
+            except BufferError:   # the consumer still holds the last frame view
+                pass
+            shm.unlink()
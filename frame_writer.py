@@ -0,0 +1,183 @@
+"""Raw frame writer for the encoder pipe
+MoviePy's CompositeVideoClip allocates a new frame (plus float temporaries)
+for every layer it blits, and its ffmpeg writer copies each frame again with
+tobytes(). RawFrameWriter composes the same layers, in the same order and
+with the same positioning rules, into one preallocated buffer that is
+blended in place and handed to ffmpeg as-is (ffmpeg_tools.encode_video
+writes it through a memoryview).
+
+pix_fmt="yuv420p" converts the frame to planar BT.601 YUV 4:2:0 in NumPy
+before it is piped: half the bytes of rgb24, and ffmpeg skips its own
+conversion. Chroma is the 2x2 block average (ffmpeg's "area" scaler); on
+fine colour detail it differs from ffmpeg's default bicubic chroma by up to
+~20 levels, luma matches within 1.
+"""
+
+import numpy as np
+import config
+
+# BT.601 limited range (ffmpeg's default for rgb24 -> yuv420p)
+_Y = np.array([65.481, 128.553, 24.966], dtype=np.float32) / 255
+_U = np.array([-37.797, -74.203, 112.0], dtype=np.float32) / 255
+_V = np.array([112.0, -93.786, -18.214], dtype=np.float32) / 255
+
+PIX_FMTS = ("rgb24", "yuv420p")
+
+
+def frame_bytes(size: tuple[int, int], pix_fmt: str = "rgb24") -> int:
+    width, height = size
+    return width * height * 3 if pix_fmt == "rgb24" else width * height * 3 // 2
+
+
+def pipe_format() -> str:
+    """Pixel format piped to ffmpeg (MoviePy's own frames are always rgb24)"""
+    return config.RENDER["pipe_format"] if config.RENDER["raw_writer"] else "rgb24"
+
+
+def render_frames(clip, times):
+    """Encoder-pipe frames of a composite clip, in pipe_format()"""
+    if config.RENDER["raw_writer"]:
+        yield from RawFrameWriter(clip, pipe_format()).frames(times)
+        return
+    for t in times:
+        yield clip.get_frame(t).astype("uint8", copy=False)
+
+
+def _position(clip, ct, frame_size, img_size):
+    """Top-left corner of a layer, resolved like VideoClip.blit_on"""
+    wf, hf = frame_size
+    wi, hi = img_size
+    pos = clip.pos(ct)
+    if isinstance(pos, str):
+        pos = {"center": ["center", "center"], "left": ["left", "center"], "right": ["right", "center"],
+               "top": ["center", "top"], "bottom": ["center", "bottom"]}[pos]
+    else:
+        pos = list(pos)
+    if clip.relative_pos:
+        for i, dim in enumerate((wf, hf)):
+            if not isinstance(pos[i], str):
+                pos[i] = dim * pos[i]
+    if isinstance(pos[0], str):
+        pos[0] = {"left": 0, "center": (wf - wi) / 2, "right": wf - wi}[pos[0]]
+    if isinstance(pos[1], str):
+        pos[1] = {"top": 0, "center": (hf - hi) / 2, "bottom": hf - hi}[pos[1]]
+    return int(pos[0]), int(pos[1])
+
+
+class RawFrameWriter:
+    """
+    writer = RawFrameWriter(composite_clip, pix_fmt="rgb24")
+    writer.render(t) -> the frame at t, in a buffer reused by every call
+    writer.frames(times) -> render() for each time
+    """
+
+    def __init__(self, clip, pix_fmt: str = "rgb24"):
+        if pix_fmt not in PIX_FMTS:
+            raise ValueError(f"Unsupported pipe pixel format '{pix_fmt}' (use one of {PIX_FMTS})")
+        self.clip = clip
+        self.pix_fmt = pix_fmt
+        self.size = width, height = tuple(clip.size)
+        self.frame_bytes = frame_bytes(self.size, pix_fmt)
+
+        self.rgb = np.zeros((height, width, 3), dtype=np.uint8)
+        self._blend = np.empty((height, width, 3), dtype=np.float32)
+        self._static_bg = None
+        if getattr(clip, "created_bg", False):
+            self._static_bg = np.asarray(clip.bg.get_frame(0), dtype=np.uint8)
+
+        if pix_fmt == "yuv420p":
+            if width % 2 or height % 2:
+                raise ValueError(f"yuv420p needs an even frame size, got {width}x{height}")
+            self.yuv = np.empty(self.frame_bytes, dtype=np.uint8)
+            self._acc = np.empty((height, width), dtype=np.float32)
+            self._tmp = np.empty((height, width), dtype=np.float32)
+            self._chroma = np.empty((height // 2, width // 2, 3), dtype=np.float32)
+
+    # ───────────────────────────────────────────────
+    # Composition
+    # ───────────────────────────────────────────────
+    def _blit(self, out, layer, t):
+        ct = t - layer.start
+        img = layer.get_frame(ct)
+        mask = layer.mask.get_frame(ct) if layer.mask is not None else None
+        if mask is not None and img.shape[:2] != mask.shape[:2]:
+            img = layer.fill_array(img, mask.shape)
+
+        hi, wi = img.shape[:2]
+        hf, wf = out.shape[:2]
+        xp, yp = _position(layer, ct, (wf, hf), (wi, hi))
+        x1, y1 = max(0, -xp), max(0, -yp)
+        x2, y2 = min(wi, wf - xp), min(hi, hf - yp)
+        if x1 >= x2 or y1 >= y2:
+            return
+        region = out[yp + y1:yp + y2, xp + x1:xp + x2]
+        src = img[y1:y2, x1:x2]
+        if mask is None:
+            region[...] = src
+            return
+        # region += mask * (src - region), in one float scratch buffer
+        blend = self._blend[:y2 - y1, :x2 - x1]
+        np.subtract(src, region, out=blend, dtype=np.float32, casting="unsafe")
+        blend *= mask[y1:y2, x1:x2, None]
+        blend += region
+        region[...] = blend   # truncates like MoviePy's astype("uint8")
+
+    def compose(self, t, out: np.ndarray = None) -> np.ndarray:
+        """RGB frame at t, composed in place into `out` (default: self.rgb)"""
+        out = self.rgb if out is None else out
+        if self._static_bg is not None:
+            np.copyto(out, self._static_bg)
+        else:
+            np.copyto(out, self.clip.bg.get_frame(t), casting="unsafe")
+        for layer in self.clip.playing_clips(t):
+            self._blit(out, layer, t)
+        return out
+
+    # ───────────────────────────────────────────────
+    # Pipe formats
+    # ───────────────────────────────────────────────
+    def _mix(self, src, coeffs, out, offset):
+        """out = src[..., 0] * c0 + src[..., 1] * c1 + src[..., 2] * c2 + offset, without temporaries"""
+        tmp = self._tmp.reshape(-1)[:out.size].reshape(out.shape)
+        np.multiply(src[..., 0], coeffs[0], out=out)
+        for i in (1, 2):
+            np.multiply(src[..., i], coeffs[i], out=tmp)
+            out += tmp
+        out += offset
+        return out
+
+    def to_yuv420p(self, rgb: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+        """Planar Y, U, V (U and V from 2x2 averages) into a flat uint8 buffer"""
+        height, width = rgb.shape[:2]
+        out = self.yuv if out is None else out
+        luma, quarter = width * height, width * height // 4
+        planes = (
+            out[:luma].reshape(height, width),
+            out[luma:luma + quarter].reshape(height // 2, width // 2),
+            out[luma + quarter:luma + 2 * quarter].reshape(height // 2, width // 2)
+        )
+
+        np.copyto(planes[0], self._mix(rgb, _Y, self._acc, 16.5), casting="unsafe")
+
+        c = self._chroma   # sum of each 2x2 block; the 1/4 is folded into the coefficients
+        np.add(rgb[0::2, 0::2], rgb[1::2, 0::2], out=c, dtype=np.float32)
+        c += rgb[0::2, 1::2]
+        c += rgb[1::2, 1::2]
+        acc = self._acc.reshape(-1)[:quarter].reshape(height // 2, width // 2)
+        for plane, coeffs in ((planes[1], _U / 4), (planes[2], _V / 4)):
+            np.copyto(plane, self._mix(c, coeffs, acc, 128.5), casting="unsafe")
+        return out
+
+    def render(self, t, out: np.ndarray = None) -> np.ndarray:
+        """
+        Frame at t in the pipe format, in a reused buffer (or in `out`, a flat
+        uint8 buffer of frame_bytes, e.g. a shared-memory slot)
+        """
+        if self.pix_fmt == "rgb24":
+            target = None if out is None else out.reshape(self.size[1], self.size[0], 3)
+            return self.compose(t, target)
+        return self.to_yuv420p(self.compose(t), out)
+
+    def frames(self, times):
+        for t in times:
+            yield self.render(t)
@@ -0,0 +1,21 @@
+"""Shared HTTP session so connections (and TLS handshakes) are reused
+across queries, downloads and, in the render daemon, across jobs"""
+
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+
+_local = threading.local()
+
+
+def get_session() -> requests.Session:
+    """Keep-alive session, one per thread (requests.Session is not thread-safe)"""
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers["User-Agent"] = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+        _local.session = session
+    return session
@@ -3,12 +3,27 @@
 - Pexels for space, AI, gadgets, general / conceptual news
 """
 
-import requests
+from http_session import get_session
 from pathlib import Path
 from typing import List, Dict, Any
 import config
 import time
 import hashlib  # to detect true duplicate content
+from image_hash import PerceptualHashIndex  # to detect near-duplicates (resized / recompressed)
+from image_rank import rank_candidates
+from asset_pool import get_pool
+
+
+def placeholder_image(temp_dir: Path, size=(1080, 1920), color=(10, 10, 30)) -> Path:
+    """Dark placeholder JPEG, written once per run and shared by every scene"""
+    def build():
+        from PIL import Image
+        p = temp_dir / f"placeholder_{size[0]}x{size[1]}_{bytes(color).hex()}.jpg"
+        if not p.exists():
+            Image.new("RGB", size, color).save(p)
+        return p
+    return get_pool().get("placeholder", (str(temp_dir), size, color), build)
+
 
 def fetch_images(data: Dict[str, Any], count: int = 6) -> List[Path]:
     """
@@ -43,6 +58,9 @@ def fetch_images(data: Dict[str, Any], count: int = 6) -> List[Path]:
     temp_dir.mkdir(parents=True, exist_ok=True)
     print(f"[DEBUG] Temp folder: {temp_dir.resolve()}")
 
+    # Near-duplicate index shared by every source for this scene
+    phash_index = PerceptualHashIndex.from_config() if config.IMAGE_DEDUP["enabled"] else None
+
     # ───────────────────────────────────────────────
     # Google Images – for cricket / Bollywood / entertainment
     # ───────────────────────────────────────────────
@@ -59,6 +77,7 @@ def fetch_images(data: Dict[str, Any], count: int = 6) -> List[Path]:
         print(f"[Google] Using {len(queries)} refined queries")
 
         all_urls = []
+        candidates = []
         seen_hashes = set()
 
         for q in queries:
@@ -70,7 +89,7 @@ def fetch_images(data: Dict[str, Any], count: int = 6) -> List[Path]:
                     "tbs": "isz:lt,islt:qsvga,cdr:1,cd_min:1/1/2025",  # recent + large
                     "num": count * 3
                 }
-                r = requests.get("https://serpapi.com/search.json", params=params, timeout=15)
+                r = get_session().get("https://serpapi.com/search.json", params=params, timeout=15)
                 print(f"  Query '{q[:50]}...': Status {r.status_code}")
 
                 if r.status_code == 200:
@@ -80,14 +99,24 @@ def fetch_images(data: Dict[str, Any], count: int = 6) -> List[Path]:
                         src = img.get("original") or img.get("link")
                         if src and src not in all_urls:
                             all_urls.append(src)
+                            candidates.append({
+                                "url": src,
+                                "width": img.get("original_width"),
+                                "height": img.get("original_height"),
+                                "thumbnail": img.get("thumbnail")
+                            })
                 else:
                     print(f"    → Error: {r.text[:200]}...")
             except Exception as e:
                 print(f"  Query failed: {e}")
 
+        # Rank candidates cheaply so only the best get downloaded in full
+        if config.IMAGE_RANKING["enabled"] and candidates:
+            candidates = rank_candidates(candidates, top_k=count)
+
         # Download best unique images
         downloaded = []
-        for i, src_url in enumerate(all_urls):
+        for i, src_url in enumerate(c["url"] for c in candidates):
             if len(downloaded) >= count:
                 break
 
@@ -95,7 +124,7 @@ def fetch_images(data: Dict[str, Any], count: int = 6) -> List[Path]:
                 ext = src_url.split('.')[-1].split('?')[0].lower() or 'jpg'
                 img_path = temp_dir / f"google_{i:02d}_{int(time.time())}.{ext}"
 
-                img_resp = requests.get(src_url, timeout=12, stream=True)
+                img_resp = get_session().get(src_url, timeout=12, stream=True)
                 if img_resp.status_code != 200:
                     continue
 
@@ -112,6 +141,10 @@ def fetch_images(data: Dict[str, Any], count: int = 6) -> List[Path]:
                     continue
                 seen_hashes.add(img_hash)
 
+                # Near-duplicate check on a decoded thumbnail (same photo, other size/crop)
+                if phash_index is not None and phash_index.check_and_add(img_data, src_url):
+                    continue
+
                 with open(img_path, "wb") as f:
                     f.write(img_data)
                 print(f"[Google] Saved: {img_path.name} ({size_kb:.1f} KB)")
@@ -131,12 +164,14 @@ def fetch_images(data: Dict[str, Any], count: int = 6) -> List[Path]:
         try:
             url = "https://api.pexels.com/v1/search"
             headers = {"Authorization": config.PEXELS_API_KEY}
+            # Extra results replace photos rejected as near-duplicates
+            reserve = config.IMAGE_DEDUP["reserve_factor"] if phash_index is not None else 1
             params = {
                 "query": search_key or headline,
-                "per_page": count - len(images),
+                "per_page": min(80, (count - len(images)) * reserve),   # 80 = Pexels page limit
                 "orientation": "portrait"
             }
-            r = requests.get(url, params=params, headers=headers, timeout=15)
+            r = get_session().get(url, params=params, headers=headers, timeout=15)
             print(f"[Pexels] Status: {r.status_code}")
 
             if r.status_code == 200:
@@ -144,11 +179,15 @@ def fetch_images(data: Dict[str, Any], count: int = 6) -> List[Path]:
                 print(f"[Pexels] Found {len(photos)} photos")
 
                 for i, photo in enumerate(photos):
+                    if len(images) >= count:
+                        break
                     img_url = photo["src"].get("large2x") or photo["src"].get("large")
                     if img_url:
                         img_url += "?w=1080&h=1920&fit=crop&auto=compress"
                         img_path = temp_dir / f"pexels_{len(images):02d}.jpg"
-                        img_data = requests.get(img_url, timeout=10).content
+                        img_data = get_session().get(img_url, timeout=10).content
+                        if phash_index is not None and phash_index.check_and_add(img_data, img_url):
+                            continue
                         with open(img_path, "wb") as f:
                             f.write(img_data)
                         print(f"[Pexels] Saved: {img_path.name}")
@@ -158,16 +197,16 @@ def fetch_images(data: Dict[str, Any], count: int = 6) -> List[Path]:
         except Exception as e:
             print(f"[Pexels] Error: {e}")
 
+    if phash_index is not None:
+        phash_index.save()
+
     # ───────────────────────────────────────────────
-    # Ultimate fallback: black images
+    # Ultimate fallback: black images (one shared placeholder file per run)
     # ───────────────────────────────────────────────
-    while len(images) < count:
-        from PIL import Image
-        black = Image.new("RGB", (1080, 1920), (10,10,30))
-        p = temp_dir / f"fallback_{len(images):02d}.jpg"
-        black.save(p)
-        images.append(p)
-        print(f"[FALLBACK] Created black placeholder: {p.name}")
+    if len(images) < count:
+        p = placeholder_image(temp_dir)
+        print(f"[FALLBACK] Using black placeholder {p.name} for {count - len(images)} image(s)")
+        images.extend([p] * (count - len(images)))
 
     print(f"[IMAGE FETCH END] Returning {len(images)} images")
     return images[:count]
\ No newline at end of file
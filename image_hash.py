@@ -0,0 +1,158 @@
+"""Perceptual hashing for near-duplicate image detection
+- dHash / pHash computed on a small decoded thumbnail
+- Hamming-distance lookup vectorized in NumPy
+- Optional persistent store so duplicates are caught across runs; each hash
+  keeps a key of its source (URL or file), so re-fetching the same image in
+  a later run does not count as a duplicate of itself
+"""
+
+from io import BytesIO
+import hashlib
+from pathlib import Path
+import numpy as np
+from PIL import Image
+import config
+
+# Number of set bits for every byte value, used for vectorized popcount
+_POPCOUNT8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+_DCT_CACHE = {}
+
+
+def _load_thumbnail(data: bytes, size: tuple[int, int]) -> np.ndarray:
+    """Decode image bytes straight to a small grayscale array.
+
+    For JPEGs, draft() lets the decoder scale down by up to 8x while
+    decoding, so the full-resolution image is never materialised.
+    """
+    img = Image.open(BytesIO(data))
+    img.draft("L", (size[0] * 4, size[1] * 4))
+    img = img.convert("L").resize(size, Image.BILINEAR)
+    return np.asarray(img, dtype=np.float32)
+
+
+def _dct_matrix(n: int) -> np.ndarray:
+    """Orthonormal DCT-II basis, cached per size"""
+    if n not in _DCT_CACHE:
+        k = np.arange(n)[:, None]
+        i = np.arange(n)[None, :]
+        m = np.cos(np.pi * (2 * i + 1) * k / (2 * n)) * np.sqrt(2.0 / n)
+        m[0] /= np.sqrt(2.0)
+        _DCT_CACHE[n] = m.astype(np.float32)
+    return _DCT_CACHE[n]
+
+
+def _pack_bits(bits: np.ndarray) -> np.uint64:
+    return np.packbits(bits.astype(np.uint8).ravel()).view(">u8")[0].astype(np.uint64)
+
+
+def dhash(data: bytes, hash_size: int = 8) -> np.uint64:
+    """Difference hash: sign of horizontal gradients on a (hash_size+1) x hash_size thumbnail"""
+    pixels = _load_thumbnail(data, (hash_size + 1, hash_size))
+    return _pack_bits(pixels[:, 1:] > pixels[:, :-1])
+
+
+def phash(data: bytes, hash_size: int = 8) -> np.uint64:
+    """DCT hash: low-frequency DCT coefficients compared against their median"""
+    n = hash_size * 4
+    pixels = _load_thumbnail(data, (n, n))
+    dct = _dct_matrix(n)
+    coeffs = (dct @ pixels @ dct.T)[:hash_size, :hash_size]
+    return _pack_bits(coeffs > np.median(coeffs.ravel()[1:]))
+
+
+def source_key(source: str | None) -> np.uint64:
+    """64-bit key of an image's URL or path (0 = unknown source)"""
+    if not source:
+        return np.uint64(0)
+    return np.frombuffer(hashlib.sha1(str(source).encode("utf-8")).digest()[:8], dtype=">u8")[0].astype(np.uint64)
+
+
+def hamming_distances(hashes: np.ndarray, value: np.uint64) -> np.ndarray:
+    """Hamming distance from value to every hash in the array"""
+    if hashes.size == 0:
+        return np.zeros(0, dtype=np.int32)
+    xor = np.bitwise_xor(hashes, np.uint64(value))
+    return _POPCOUNT8[xor.view(np.uint8)].reshape(-1, 8).sum(axis=1, dtype=np.int32)
+
+
+class PerceptualHashIndex:
+    """In-memory set of perceptual hashes with near-duplicate lookup"""
+
+    def __init__(self, algorithm="dhash", hash_size=8, max_distance=6, store_path=None):
+        if hash_size * hash_size != 64:
+            raise ValueError("hash_size must be 8 (hashes are packed into 64 bits)")
+        self.hash_fn = phash if algorithm == "phash" else dhash
+        self.hash_size = hash_size
+        self.max_distance = max_distance
+        self.store_path = Path(store_path) if store_path else None
+        self._hashes = np.zeros(0, dtype=np.uint64)
+        self._sources = np.zeros(0, dtype=np.uint64)
+        self._new = 0
+
+        if self.store_path and self.store_path.exists():
+            try:
+                stored = np.load(self.store_path).astype(np.uint64)
+                if stored.ndim == 1:   # older stores: hashes only
+                    stored = np.stack([stored, np.zeros_like(stored)], axis=1)
+                self._hashes, self._sources = stored[:, 0].copy(), stored[:, 1].copy()
+                print(f"[DEDUP] Loaded {len(self._hashes)} hashes from {self.store_path}")
+            except Exception as e:
+                print(f"[WARN] Could not read hash store {self.store_path}: {e}")
+
+    @classmethod
+    def from_config(cls):
+        cfg = config.IMAGE_DEDUP
+        return cls(
+            algorithm=cfg["algorithm"],
+            hash_size=cfg["hash_size"],
+            max_distance=cfg["max_distance"],
+            store_path=cfg["persistent_store"]
+        )
+
+    def __len__(self):
+        return len(self._hashes)
+
+    def nearest(self, value: np.uint64, source: str = None) -> int | None:
+        """Smallest Hamming distance to any stored hash not from `source` (None if there is none)"""
+        dists = hamming_distances(self._hashes, value)
+        if source:
+            dists = dists[self._sources != source_key(source)]
+        return int(dists.min()) if dists.size else None
+
+    def add(self, value: np.uint64, source: str = None):
+        self._hashes = np.append(self._hashes, np.uint64(value))
+        self._sources = np.append(self._sources, source_key(source))
+        self._new += 1
+
+    def check_and_add(self, data: bytes, source: str = None) -> bool:
+        """
+        Hash image bytes and record them under `source` (URL or path).
+        Returns True if the image is a near-duplicate of one already seen
+        from another source (in which case it is not added). Undecodable
+        data is never a duplicate.
+        """
+        try:
+            value = self.hash_fn(data, self.hash_size)
+        except Exception as e:
+            print(f"  [DEDUP] Could not hash image: {e}")
+            return False
+
+        dist = self.nearest(value, source)
+        if dist is not None and dist <= self.max_distance:
+            print(f"  Skip near-duplicate (distance {dist})")
+            return True
+
+        if not source or source_key(source) not in self._sources:
+            self.add(value, source)
+        return False
+
+    def save(self):
+        """Persist hashes to the store file (no-op without a store)"""
+        if not self.store_path or not self._new:
+            return
+        self.store_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.store_path, "wb") as f:
+            np.save(f, np.stack([self._hashes, self._sources], axis=1))
+        self._new = 0
+        print(f"[DEDUP] Saved {len(self._hashes)} hashes to {self.store_path}")
@@ -0,0 +1,102 @@
+"""Cheap candidate scoring so only the best images get downloaded in full
+- Stage 1: metadata only (reported dimensions, aspect ratio vs 9:16)
+- Stage 2: small thumbnail decode (sharpness, brightness) for the shortlist
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import List, Dict, Any
+import math
+import numpy as np
+from http_session import get_session
+from PIL import Image
+import config
+
+
+def score_metadata(candidate: Dict[str, Any]) -> float:
+    """
+    0..1 score from the dimensions reported by the search API.
+    Unknown dimensions get a neutral score instead of being dropped.
+    """
+    cfg = config.IMAGE_RANKING
+    w = candidate.get("width") or 0
+    h = candidate.get("height") or 0
+    if w <= 0 or h <= 0:
+        return 0.5
+
+    # Aspect closeness: 1.0 at exactly 9:16, falls off with the log-ratio
+    aspect_score = math.exp(-abs(math.log((w / h) / cfg["target_aspect"])) * 2)
+
+    # Resolution: how much of the frame the image covers without upscaling
+    res_score = min(1.0, min(w / config.VIDEO_WIDTH, h / config.VIDEO_HEIGHT))
+
+    weights = cfg["weights"]
+    total = weights["aspect"] + weights["resolution"]
+    return (weights["aspect"] * aspect_score + weights["resolution"] * res_score) / total
+
+
+def score_thumbnail(data: bytes) -> float:
+    """
+    0..1 quality score from a small decoded thumbnail:
+    Laplacian variance for sharpness, mean luminance for exposure.
+    """
+    img = Image.open(BytesIO(data))
+    img.draft("L", (256, 256))
+    gray = np.asarray(img.convert("L"), dtype=np.float32)
+
+    lap = (
+        -4 * gray[1:-1, 1:-1]
+        + gray[:-2, 1:-1] + gray[2:, 1:-1]
+        + gray[1:-1, :-2] + gray[1:-1, 2:]
+    )
+    sharpness = float(lap.var())
+    sharp_score = sharpness / (sharpness + config.IMAGE_RANKING["sharpness_midpoint"])
+
+    brightness = float(gray.mean()) / 255.0
+    bright_score = max(0.0, 1.0 - abs(brightness - 0.5) * 2)
+
+    return 0.7 * sharp_score + 0.3 * bright_score
+
+
+def _fetch_thumbnail_score(candidate: Dict[str, Any]) -> float | None:
+    url = candidate.get("thumbnail")
+    if not url:
+        return None
+    try:
+        r = get_session().get(url, timeout=config.IMAGE_RANKING["thumbnail_timeout"])
+        if r.status_code != 200:
+            return None
+        return score_thumbnail(r.content)
+    except Exception:
+        return None
+
+
+def rank_candidates(candidates: List[Dict[str, Any]], top_k: int) -> List[Dict[str, Any]]:
+    """
+    Return candidates best-first. The top `top_k * shortlist_factor` by metadata
+    are re-scored from their thumbnails; the rest follow in metadata order as a
+    reserve for failed downloads.
+    """
+    cfg = config.IMAGE_RANKING
+    for c in candidates:
+        c["score"] = score_metadata(c)
+
+    ordered = sorted(candidates, key=lambda c: c["score"], reverse=True)
+    shortlist = ordered[:top_k * cfg["shortlist_factor"]]
+    reserve = ordered[len(shortlist):]
+
+    with ThreadPoolExecutor(max_workers=cfg["thumbnail_workers"]) as pool:
+        thumb_scores = list(pool.map(_fetch_thumbnail_score, shortlist))
+
+    w_thumb = cfg["weights"]["thumbnail"]
+    for c, ts in zip(shortlist, thumb_scores):
+        if ts is not None:
+            c["score"] = (1 - w_thumb) * c["score"] + w_thumb * ts
+
+    shortlist.sort(key=lambda c: c["score"], reverse=True)
+    print(f"[RANK] Scored {len(candidates)} candidates, "
+          f"{sum(ts is not None for ts in thumb_scores)} thumbnails checked")
+    for c in shortlist[:top_k]:
+        print(f"  {c['score']:.2f}  {c.get('width')}x{c.get('height')}  {c['url'][:70]}")
+
+    return shortlist + reserve
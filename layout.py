@@ -0,0 +1,156 @@
+"""Layout templates compiled into render plans
+A template is a declarative list of layers (JSON-serializable). Compiling it
+for an output scale resolves every position and size to pixels, scales the
+config text styles, and pre-renders the static layers (boxes, progress bar
+track) as arrays. Plans and bitmaps live in the asset pool, so every scene
+of a channel (and every --jobs worker, through shared memory) reuses them
+and only builds its dynamic content (images, text, subtitles).
+
+Layer keys:
+    type     box | text | subtitles | progress
+    style    name of a config style dict (HEADER, SUBTITLE, ...)
+    y        pixels from the top at 1080x1920, "center", a style key
+             ("position_y") or "-key" for distance from the bottom
+    height   pixels, a style key, or "full"
+    margin   horizontal margin (text wrap width = width - margin)
+    field    content field for text layers (headline, hook, subscribe_hook)
+    timing   full | hook | end
+"""
+
+from pathlib import Path
+import json
+import time
+import numpy as np
+import config
+from asset_pool import get_pool
+
+DEFAULT_TEMPLATE = {
+    "name": "default",
+    "layers": [
+        {"name": "header_bg", "type": "box", "style": "HEADER", "y": 0, "height": "height", "timing": "full"},
+        {"name": "headline", "type": "text", "style": "HEADER", "field": "headline", "upper": True,
+         "y": "position_y", "margin": 60, "timing": "full"},
+        {"name": "subtitles", "type": "subtitles", "style": "SUBTITLE", "y": "-position_y_offset", "margin": 100},
+        {"name": "progress", "type": "progress", "style": "PROGRESS_BAR", "y": "-position_y_offset",
+         "height": "height", "timing": "full"},
+        {"name": "hook", "type": "text", "style": "HOOK", "field": "hook", "y": "center", "margin": 100,
+         "timing": "hook"},
+        {"name": "end_bg", "type": "box", "style": "END_SCREEN", "y": 0, "height": "full", "timing": "end"},
+        {"name": "subscribe", "type": "text", "style": "END_SCREEN", "field": "subscribe_hook", "y": "center",
+         "margin": 120, "timing": "end"}
+    ]
+}
+
+LAYOUT_KEYS = ("fontsize", "stroke_width", "height", "position_y", "position_y_offset")
+
+
+def scaled_style(style: dict, scale: float) -> dict:
+    """Copy of a config style dict with its pixel sizes scaled (preview renders)"""
+    if scale == 1.0:
+        return dict(style)
+    scaled = dict(style)
+    for key in LAYOUT_KEYS:
+        if key in scaled and scaled[key]:
+            scaled[key] = max(1, int(round(scaled[key] * scale)))
+    return scaled
+
+
+def _rgb(color):
+    if isinstance(color, str):
+        from PIL import ImageColor
+        return ImageColor.getrgb(color)[:3]
+    return tuple(color[:3])
+
+
+def _resolve(value, style, scale, full):
+    """Template length -> pixels (already-scaled style keys are used as-is)"""
+    if isinstance(value, (int, float)):
+        return int(round(value * scale))
+    if value == "full":
+        return full
+    if value.startswith("-"):
+        return full - style[value[1:]]
+    return style[value]
+
+
+def solid_bitmap(size: tuple[int, int], color) -> np.ndarray:
+    """Shared read-only (h, w, 3) frame of one color"""
+    width, height = size
+    rgb = _rgb(color)
+    return get_pool().array("solid", (size, rgb),
+                            lambda: np.full((height, width, 3), rgb, dtype=np.uint8))
+
+
+def compile_plan(template: dict, scale: float = 1.0) -> dict:
+    """Resolve a template for one output scale. Returns the render plan dict."""
+    width = int(config.VIDEO_WIDTH * scale) // 2 * 2
+    height = int(config.VIDEO_HEIGHT * scale) // 2 * 2
+    plan = {"name": template.get("name", "custom"), "scale": scale, "size": (width, height), "layers": []}
+
+    for spec in template["layers"]:
+        style = scaled_style(getattr(config, spec["style"]), scale)
+        layer = {
+            "name": spec["name"],
+            "type": spec["type"],
+            "style": style,
+            "timing": spec.get("timing", "full"),
+            "y": "center" if spec.get("y") == "center" else _resolve(spec.get("y", 0), style, scale, height)
+        }
+
+        if spec["type"] in ("text", "subtitles"):
+            layer["width"] = width - int(round(spec.get("margin", 0) * scale))
+            layer["field"] = spec.get("field")
+            layer["upper"] = spec.get("upper", False)
+            if style.get("zoom_effect"):
+                layer["zoom"] = style["zoom_speed"]
+
+        elif spec["type"] == "box":
+            h = _resolve(spec.get("height", "full"), style, scale, height)
+            layer["bitmap"] = solid_bitmap((width, h), style["background_color"])
+            opacity = float(style.get("background_opacity", 1.0))
+            layer["mask"] = get_pool().array("mask", ((width, h), opacity),
+                                             lambda: np.full((h, width), opacity))
+
+        elif spec["type"] == "progress":
+            h = _resolve(spec.get("height", "height"), style, scale, height)
+            layer["bitmap"] = solid_bitmap((width, h), style["background_color"])
+            layer["fill"] = np.array(_rgb(style["fill_color"]), dtype=np.uint8)
+
+        else:
+            raise ValueError(f"Unknown layer type '{spec['type']}' in layout '{plan['name']}'")
+
+        plan["layers"].append(layer)
+    return plan
+
+
+def layer_window(layer: dict, duration: float) -> tuple[float, float]:
+    """(start, end) of a layer in a video of `duration` seconds"""
+    timing = layer["timing"]
+    if timing == "hook":
+        return 0.0, min(layer["style"]["duration"], duration)
+    if timing == "end":
+        start = max(0.0, duration - layer["style"]["duration"])
+        return start, start + layer["style"]["duration"]
+    return 0.0, duration
+
+
+def load_template(path: str | None = None) -> dict:
+    if not path:
+        return DEFAULT_TEMPLATE
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _build_plan(path, scale):
+    start = time.time()
+    plan = compile_plan(load_template(path), scale)
+    print(f"[LAYOUT] Compiled '{plan['name']}' at {plan['size'][0]}x{plan['size'][1]} "
+          f"in {(time.time() - start) * 1000:.1f} ms")
+    return plan
+
+
+def get_plan(scale: float = 1.0) -> dict:
+    """Render plan for config.LAYOUT["template"] at this scale, compiled once per process"""
+    path = config.LAYOUT["template"]
+    mtime = Path(path).stat().st_mtime if path else None
+    return get_pool().get("layout_plan", (path, mtime, scale), lambda: _build_plan(path, scale))
@@ -1,25 +1,10 @@
-# main.py - Force ImageMagick config FIRST (before any MoviePy import)
+# main.py - YouTube Shorts Generator entry point
+#
+# Startup is kept light on purpose: only the standard library and config are
+# imported here. MoviePy, gTTS, translators, the Google API client and pydub
+# are imported inside the stages that need them, so --help / --config-check
+# start instantly. Run --selftest to check ImageMagick.
 
-# === VERY IMPORTANT: THIS BLOCK MUST BE AT THE VERY TOP ===
-from moviepy.config import change_settings
-
-change_settings({
-    "IMAGEMAGICK_BINARY": r"C:\Program Files\ImageMagick-7.1.2-Q16-HDRI\magick.exe"
-})
-
-print("[CONFIG] ImageMagick path forced globally")
-
-# Quick test to prove TextClip works
-try:
-    from moviepy.editor import TextClip
-    test_clip = TextClip("TEST TEXT", fontsize=50, color='white')
-    print("[TEST] TextClip created successfully → ImageMagick is working!")
-except Exception as e:
-    print("[TEST FAIL] ImageMagick still not found:")
-    print(e)
-    raise
-
-# Now safe to import everything else
 import argparse
 import json
 from pathlib import Path
@@ -27,16 +12,16 @@ import os
 import datetime
 import sys
 
-# Import project modules
-from parser import parse_input
-from script_gen import build_english_script, translate_to_hindi
-from audio_gen import generate_audio
-from image_fetch import fetch_images
-from video_compose import make_short_video
-from uploader import upload_video
-from music_downloader import ensure_music_exists
 import config
 
+# Exit codes (machine-readable for batch workers / cron)
+EXIT_OK = 0
+EXIT_FATAL = 1            # Unexpected exception
+EXIT_INPUT_ERROR = 2      # Bad arguments, unreadable JSON or no valid scenes
+EXIT_RENDER_FAILED = 3    # At least one scene failed to render
+EXIT_UPLOAD_FAILED = 4    # Rendering succeeded but at least one upload failed
+EXIT_INTERRUPTED = 130
+
 
 def check_dependencies():
     """Check if all required dependencies are installed"""
@@ -50,100 +35,351 @@ def check_dependencies():
         print("[INFO] Run: pip install requests numpy pillow")
 
 
+def parse_upload_policy(value):
+    """
+    Parse --upload: "ask" (interactive), "all", "none" or "selected:1,3"
+    (1-based positions among the scenes this run processes, i.e. after
+    --scene filtering). Returns (mode, set_of_scene_numbers).
+    """
+    if value in ("ask", "all", "none"):
+        return value, set()
+    if value.startswith("selected:"):
+        try:
+            return "selected", {int(n) for n in value.split(":", 1)[1].split(",") if n.strip()}
+        except ValueError:
+            pass
+    raise argparse.ArgumentTypeError(f"invalid upload policy '{value}' (use all, none or selected:1,3)")
+
+
+def write_run_report(path, report):
+    """Write the machine-readable run report"""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"[REPORT] Run report written to {path}")
+
+
 def get_news_type(data):
     """Extract news type from data with fallback"""
     news_type = data.get("news_type") or data.get("type") or data.get("category", "default")
     return news_type
 
 
-def process_single_scene(scene_data, scene_index, total_scenes, timestamp, force_music=False):
-    """Process a single scene from the JSON array"""
+def process_single_scene(scene_data, scene_index, total_scenes, timestamp, force_music=False,
+                         thumbnail_jobs=None, report=None, on_progress=None, prepared=None, preview=False,
+                         plan=None, plan_dir=None):
+    """Process a single scene from the JSON array.
+    preview=True renders a fast low-resolution check (video_compose preview mode).
+    With plan_dir, the scene's render plan is written there instead of a video (see scene_plan.py);
+    with plan (from scene_plan.load_plan), only the render stage runs.
+    If prepared has "english", "hindi" and "audio_file" (see prepare_scenes), those stages are skipped.
+    If thumbnail_jobs is a list, a thumbnail job is appended for batch rendering.
+    If report is a dict, the failing stage and error are recorded in it.
+    on_progress(stage, message) is called as each stage starts and finishes."""
+    if report is None:
+        report = {}
+
+    def progress(stage, message):
+        if on_progress:
+            on_progress(stage, message)
+
+    def queue_thumbnail(images, video_path):
+        if thumbnail_jobs is not None and not preview:
+            overlay = scene_data.get("metadata", {}).get("thumbnail_text_overlay") or scene_data["headline"]
+            thumbnail_jobs.append({
+                "images": images,
+                "text": overlay,
+                "output_path": str(Path(video_path).with_suffix(".jpg"))
+            })
     
     print(f"\n{'='*60}")
     print(f"PROCESSING SCENE {scene_index + 1} OF {total_scenes}")
     print(f"Headline: {scene_data.get('headline', 'Untitled')}")
     print(f"{'='*60}\n")
     
-    # Get news type for category-specific music
-    news_type = get_news_type(scene_data)
+    scene_key = None
+    if plan is not None:
+        # Planned elsewhere (--render-plan): only the render stage runs here
+        preview = plan["preview"]
+        output_path = f"output/{plan['output']}"
+        audio_file, images = plan["audio"], plan["spec"]["images"]
+        report["audio_seconds"] = round(plan["spec"]["duration"], 2)
+        report["images"] = len(images)
+    else:
+        # Get news type for category-specific music
+        news_type = get_news_type(scene_data)
     
-    # Create output filename for this scene
-    safe_news_type = news_type.replace(" ", "_")
-    safe_headline = scene_data.get('headline', 'untitled')[:30].replace(' ', '_').replace('/', '_')
-    safe_headline = ''.join(c for c in safe_headline if c.isalnum() or c == '_')
-    output_path = f"output/{safe_news_type}_{safe_headline}_{timestamp}.mp4"
+        # Create output filename for this scene
+        safe_news_type = news_type.replace(" ", "_")
+        safe_headline = scene_data.get('headline', 'untitled')[:30].replace(' ', '_').replace('/', '_')
+        safe_headline = ''.join(c for c in safe_headline if c.isalnum() or c == '_')
+        output_path = f"output/{safe_news_type}_{safe_headline}_{timestamp}{'_preview' if preview else ''}.mp4"
+
+        # Unchanged since an earlier render: reuse it before any translation, TTS or image search
+        if plan_dir is None and not preview and config.RENDER_CACHE["enabled"]:
+            try:
+                import render_cache
+                scene_key = render_cache.scene_key(scene_data)
+                from video_compose import restore_scene
+                cached = restore_scene(scene_key, output_path, report)
+            except Exception as e:
+                print(f"[WARN] Render cache lookup failed ({e}), planning the scene")
+                cached = None
+            if cached is not None:
+                images = cached["spec"]["images"]
+                report["audio_seconds"] = round(cached["spec"]["duration"], 2)
+                report["images"] = len(images)
+                progress("done", output_path)
+                if all(Path(p).exists() for p in images):
+                    queue_thumbnail(images, output_path)
+                else:
+                    print("[WARN] Images of the cached render are gone, no thumbnail for this scene")
+                return output_path
     
-    # Ensure background music exists
-    try:
-        music_path = ensure_music_exists(news_type, force_download=force_music)
-        if music_path:
-            print(f"[OK] Background music ready")
-    except Exception as e:
-        print(f"[WARN] Music check failed: {e}")
+        # Ensure background music exists
+        try:
+            from music_downloader import ensure_music_exists
+            music_path = ensure_music_exists(news_type, force_download=force_music)
+            if music_path:
+                print(f"[OK] Background music ready")
+        except Exception as e:
+            print(f"[WARN] Music check failed: {e}")
     
-    # Build script
-    print("→ Building script...")
-    try:
-        english = build_english_script(scene_data)
-        hindi = translate_to_hindi(english)
-        print("[OK] Script generated")
-    except Exception as e:
-        print(f"[ERROR] Script generation failed: {e}")
-        return None
+        prepared = prepared or {}
+
+        # Build script
+        print("→ Building script...")
+        progress("script", "Building script")
+        try:
+            if "hindi" in prepared:
+                english, hindi = prepared["english"], prepared["hindi"]
+            else:
+                from script_gen import build_english_script, translate_to_hindi
+                english = build_english_script(scene_data)
+                hindi = translate_to_hindi(english)
+            print("[OK] Script generated")
+        except Exception as e:
+            print(f"[ERROR] Script generation failed: {e}")
+            report.update(stage="script", error=str(e))
+            return None
     
-    # Generate audio
-    print("→ Generating audio...")
-    try:
-        audio_file = generate_audio(hindi)
-        print(f"[OK] Audio generated")
-    except Exception as e:
-        print(f"[ERROR] Audio generation failed: {e}")
-        return None
+        # Generate audio
+        print("→ Generating audio...")
+        progress("audio", "Generating audio")
+        try:
+            audio_file = prepared.get("audio_file")
+            if isinstance(audio_file, Exception):
+                raise audio_file
+            if audio_file is None:
+                from audio_gen import generate_audio
+                audio_file = generate_audio(hindi, f"temp/audio_{timestamp}_{scene_index + 1}.mp3")
+            from cost_model import audio_seconds
+            report["audio_seconds"] = round(audio_seconds(audio_file), 2)
+            print(f"[OK] Audio generated")
+        except Exception as e:
+            print(f"[ERROR] Audio generation failed: {e}")
+            report.update(stage="audio", error=str(e))
+            return None
     
-    # Fetch images
-    print("→ Fetching images...")
-    try:
-        images = fetch_images(scene_data)
-        print(f"[OK] Fetched {len(images)} images")
-    except Exception as e:
-        print(f"[WARN] Image fetching had issues: {e}")
-        images = []
+        # Fetch images
+        print("→ Fetching images...")
+        progress("images", "Fetching images")
+        try:
+            from image_fetch import fetch_images
+            images = fetch_images(scene_data)
+            print(f"[OK] Fetched {len(images)} images")
+        except Exception as e:
+            print(f"[WARN] Image fetching had issues: {e}")
+            images = []
+        report["images"] = len(images)
     
     # Create video
     print(f"→ Creating video...")
+    progress("video", "Creating video")
     try:
-        video_path = make_short_video(
-            images=images,
-            audio_path=audio_file,
-            english_text=english,
-            headline=scene_data["headline"],
-            hook=scene_data["hook_text"],
-            subscribe_hook=scene_data["subscribe_hook"],
-            news_type=news_type,
-            output_path=output_path
-        )
+        from moviepy_config import configure_imagemagick
+        configure_imagemagick()
+        from video_compose import plan_video, render_plan
+        if plan is None:
+            plan = plan_video(
+                images=images,
+                audio_path=audio_file,
+                english_text=english,
+                headline=scene_data["headline"],
+                hook=scene_data["hook_text"],
+                subscribe_hook=scene_data["subscribe_hook"],
+                news_type=news_type,
+                output_path=output_path,
+                aspect_ratio=scene_data.get("metadata", {}).get("aspect_ratio"),
+                renditions=scene_data.get("metadata", {}).get("renditions"),
+                preview=preview
+            )
+            if plan_dir is not None:
+                from scene_plan import write_plan
+                plan_path = str(write_plan(plan, scene_data, plan_dir))
+                print(f"[PLAN] Scene {scene_index + 1} plan written: {plan_path}")
+                progress("done", plan_path)
+                return plan_path
+        video_path = render_plan(plan, output_path, report)
         print(f"[SUCCESS] Scene {scene_index + 1} video created: {video_path}")
+        if scene_key and report.get("cache_key"):
+            try:
+                import render_cache
+                render_cache.remember(scene_key, report["cache_key"], plan)
+            except OSError as e:
+                print(f"[WARN] Could not remember the scene in the render cache: {e}")
+        progress("done", video_path)
+        queue_thumbnail(images, video_path)
         return video_path
     except Exception as e:
         print(f"[ERROR] Video creation failed: {e}")
+        report.update(stage="video", error=str(e))
         import traceback
         traceback.print_exc()
         return None
 
 
+def render_scene(scene, scene_index, total_scenes, timestamp, force_music=False,
+                 want_thumbnails=False, prepared=None, preview=False, assets=None, plan=None, plan_dir=None):
+    """process_single_scene with timing and peak-RSS accounting.
+    Top-level and picklable so it can run in a worker process (--jobs);
+    `assets` is the parent's asset pool handle, attached before rendering.
+    Returns (video_path, report, thumbnail_jobs)."""
+    from memory_guard import PeakRSS
+
+    if assets is not None:
+        import asset_pool
+        asset_pool.attach(assets)
+
+    report, thumbnail_jobs = {}, ([] if want_thumbnails else None)
+    start = datetime.datetime.now()
+    with PeakRSS() as mem:
+        video_path = process_single_scene(
+            scene_data=scene,
+            scene_index=scene_index,
+            total_scenes=total_scenes,
+            timestamp=timestamp,
+            force_music=force_music,
+            thumbnail_jobs=thumbnail_jobs,
+            report=report,
+            prepared=prepared,
+            preview=preview,
+            plan=plan,
+            plan_dir=plan_dir
+        )
+    report["seconds"] = round((datetime.datetime.now() - start).total_seconds(), 2)
+    report["peak_rss_mb"] = mem.peak_mb
+    print(f"[MEMORY] Scene {scene_index + 1}: peak RSS {mem.peak_mb:.0f} MB "
+          f"(start {mem.start_mb:.0f} MB, end {mem.end_mb:.0f} MB)")
+    if assets is not None:
+        report["asset_pool"] = asset_pool.get_pool().snapshot()
+    return video_path, report, thumbnail_jobs
+
+
+def prepare_scenes(scenes, timestamp, skip=()):
+    """Translate the scripts and synthesize audio, in background worker pools.
+    The first script is translated on its own and the rest as one batch, so
+    scene 1's TTS starts as soon as its own translation is done.
+    Returns one Future per scene resolving to a dict for process_single_scene(prepared=...),
+    so scene 1 can render while later scenes are still being translated / spoken.
+    Scenes whose index is in skip (e.g. render cache hits) resolve to {}."""
+    from concurrent.futures import ThreadPoolExecutor
+    from script_gen import build_english_script, translate_many
+    from audio_gen import generate_audio, default_workers
+
+    scripts = []
+    for i, scene in enumerate(scenes):
+        if i in skip:
+            scripts.append(None)
+            continue
+        try:
+            scripts.append(build_english_script(scene))
+        except Exception as e:
+            print(f"[WARN] Script for '{scene.get('headline', '')}' failed early: {e}")
+            scripts.append(None)
+    indices = [i for i, s in enumerate(scripts) if s is not None]
+
+    translate_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="translate")
+    tts_pool = ThreadPoolExecutor(max_workers=default_workers(), thread_name_prefix="tts")
+    translated = {}   # scene index -> (batch future, position in the batch)
+    for batch in (indices[:1], indices[1:]):
+        if batch:
+            future = translate_pool.submit(translate_many, [scripts[i] for i in batch])
+            translated.update((i, (future, pos)) for pos, i in enumerate(batch))
+
+    def prepare(i):
+        if i not in translated:
+            return {}
+        future, pos = translated[i]
+        hindi = future.result()[pos]
+        prepared = {"english": scripts[i], "hindi": hindi}
+        try:
+            prepared["audio_file"] = generate_audio(hindi, f"temp/audio_{timestamp}_{i + 1}.mp3")
+        except Exception as e:
+            prepared["audio_file"] = e
+        return prepared
+
+    futures = [tts_pool.submit(prepare, i) for i in range(len(scripts))]
+    translate_pool.shutdown(wait=False)
+    tts_pool.shutdown(wait=False)
+    return futures
+
+
 def main():
     parser = argparse.ArgumentParser(description="YouTube Shorts Generator - Multi-Scene Support")
     parser.add_argument("--json", default="data.json", help="Input JSON file (can be single object or array)")
     parser.add_argument("--scene", type=int, help="Process only a specific scene (0-based index)")
-    parser.add_argument("--upload", action="store_true", help="Upload after creation")
+    parser.add_argument("--upload", nargs="?", const=("ask", set()), default="none", type=parse_upload_policy,
+                       metavar="POLICY",
+                       help="Upload after creation: all | none | selected:1,3 (no value = ask interactively). "
+                            "Numbers are the 1-based scene positions of this run, as printed in the "
+                            "summary (with --scene N the only scene is 1)")
+    parser.add_argument("--no-preview", action="store_true", help="Don't offer to open a video at the end")
+    parser.add_argument("--preview", action="store_true",
+                       help="Fast low-resolution render with a contact sheet of key frames (never uploaded)")
+    parser.add_argument("--headless", action="store_true",
+                       help="Never prompt (implies --no-preview); for batch workers and cron")
+    parser.add_argument("--report", help="Write a JSON run report to this path "
+                                         "(default in headless mode: output/run_report_<timestamp>.json)")
+    parser.add_argument("--jobs", type=int, default=config.RENDER["jobs"],
+                       help="Scenes to render at once (each in its own process), "
+                            "capped by RENDER['memory_budget_mb']")
+    parser.add_argument("--plan-only", nargs="?", const="plans", metavar="DIR",
+                       help="Run the network stages only and write one render plan per scene to DIR "
+                            "(default: plans), for --render-plan on another machine")
+    parser.add_argument("--render-plan", nargs="+", metavar="PLAN",
+                       help="Render plan files (or directories of *.plan.json) written by --plan-only")
+    parser.add_argument("--enqueue", nargs="?", const=config.QUEUE["path"], metavar="DB",
+                       help="Queue the scenes (or --render-plan plans) for --worker processes instead of "
+                            "rendering here, then wait for them (default DB: QUEUE['path'])")
+    parser.add_argument("--worker", nargs="?", const=config.QUEUE["path"], metavar="DB",
+                       help="Render jobs from a queue filled by --enqueue until stopped")
     parser.add_argument("--force-music-download", action="store_true", 
                        help="Force re-download of background music")
     parser.add_argument("--config-check", action="store_true", 
                        help="Check configuration and exit")
+    parser.add_argument("--selftest", action="store_true",
+                       help="Render a test TextClip to check ImageMagick, then exit")
     parser.add_argument("--combine", action="store_true",
                        help="Combine all scenes into one video (NOT IMPLEMENTED YET)")
     args = parser.parse_args()
 
+    if args.plan_only and args.render_plan:
+        parser.error("--plan-only and --render-plan are separate stages, use one")
+    if args.plan_only and args.enqueue:
+        parser.error("--enqueue queues renders; run --plan-only first, then --render-plan ... --enqueue")
+    upload_mode, upload_selected = args.upload
+    if args.plan_only:
+        # Plans are not videos: nothing to upload, open or thumbnail yet
+        upload_mode, args.no_preview = "none", True
+    if args.preview and upload_mode != "none":
+        print("[INFO] --preview renders are never uploaded")
+        upload_mode = "none"
+    if args.headless:
+        args.no_preview = True
+        if upload_mode == "ask":
+            parser.error("--headless needs an explicit upload policy (--upload=all|none|selected:N,...)")
+
     # Optional: Just check config and exit
     if args.config_check:
         print("\n" + "="*50)
@@ -153,8 +389,51 @@ def main():
         print(f"FPS: {config.FPS}")
         print(f"Auto-download music: {config.AUDIO['auto_download_music']}")
         print("="*50)
-        return
+        return EXIT_OK
+
+    if args.selftest:
+        from moviepy_config import selftest
+        return EXIT_OK if selftest() else EXIT_FATAL
 
+    if args.worker:
+        from render_queue import run_worker
+        run_worker(args.worker)
+        return EXIT_OK
+
+    # Generate timestamp for this run
+    now = datetime.datetime.now()
+    timestamp = now.strftime("%Y-%m-%d_%H-%M-%S")
+
+    report_path = args.report or (f"output/run_report_{timestamp}.json" if args.headless else None)
+    run_report = {
+        "started": now.isoformat(timespec="seconds"),
+        "json": args.json,
+        "upload_policy": upload_mode,
+        "scenes": []
+    }
+
+    def finish(code):
+        run_report["finished"] = datetime.datetime.now().isoformat(timespec="seconds")
+        run_report["exit_code"] = code
+        if report_path:
+            write_run_report(report_path, run_report)
+        return code
+
+    # The run report is written even when the batch is interrupted or crashes
+    try:
+        return run_batch(args, upload_mode, upload_selected, timestamp, run_report, finish)
+    except KeyboardInterrupt:
+        run_report["error"] = "Interrupted by user"
+        finish(EXIT_INTERRUPTED)
+        raise
+    except Exception as e:
+        run_report["error"] = f"Unexpected error: {e}"
+        finish(EXIT_FATAL)
+        raise
+
+
+def run_batch(args, upload_mode, upload_selected, timestamp, run_report, finish):
+    """Load, render, thumbnail and upload the scenes; returns finish(exit code)"""
     # Check dependencies
     check_dependencies()
 
@@ -164,24 +443,42 @@ def main():
     Path("background_music").mkdir(exist_ok=True)
 
     # Load and parse JSON
-    print(f"\n[START] Loading JSON: {args.json}")
-    try:
-        with open(args.json, 'r', encoding='utf-8') as f:
-            raw_data = json.load(f)
-    except Exception as e:
-        print(f"[ERROR] Failed to load JSON: {e}")
-        sys.exit(1)
-    
-    # Check if it's an array (multiple scenes) or single object
-    if isinstance(raw_data, list):
-        scenes = raw_data
-        print(f"[INFO] Detected {len(scenes)} scenes in JSON file")
+    plans = None
+    if args.render_plan:
+        # Scenes planned by --plan-only (possibly on another machine)
+        from scene_plan import find_plans, load_plan
+        print(f"\n[START] Loading render plans: {' '.join(args.render_plan)}")
+        plans = []
+        for path in find_plans(args.render_plan):
+            try:
+                plans.append(load_plan(path))
+            except Exception as e:
+                print(f"[WARN] Skipping plan {path}: {e}")
+        scenes = [plan["scene"] for plan in plans]
+        print(f"[INFO] Loaded {len(plans)} render plans")
+        if any(plan["preview"] for plan in plans):
+            args.preview = True
+            upload_mode = "none"
     else:
-        scenes = [raw_data]
-        print("[INFO] Detected single scene in JSON file")
+        print(f"\n[START] Loading JSON: {args.json}")
+        try:
+            with open(args.json, 'r', encoding='utf-8') as f:
+                raw_data = json.load(f)
+        except Exception as e:
+            print(f"[ERROR] Failed to load JSON: {e}")
+            run_report["error"] = f"Failed to load JSON: {e}"
+            return finish(EXIT_INPUT_ERROR)
+    
+        # Check if it's an array (multiple scenes) or single object
+        if isinstance(raw_data, list):
+            scenes = raw_data
+            print(f"[INFO] Detected {len(scenes)} scenes in JSON file")
+        else:
+            scenes = [raw_data]
+            print("[INFO] Detected single scene in JSON file")
     
     # Validate each scene has required fields
-    valid_scenes = []
+    valid_scenes, scene_plans = [], []
     for i, scene in enumerate(scenes):
         required_fields = ["headline", "hook_text", "details", "subscribe_hook"]
         missing = [f for f in required_fields if f not in scene]
@@ -189,10 +486,12 @@ def main():
             print(f"[WARN] Scene {i+1} missing fields: {missing} - skipping")
         else:
             valid_scenes.append(scene)
+            scene_plans.append(plans[i] if plans else None)
     
     if not valid_scenes:
         print("[ERROR] No valid scenes found")
-        sys.exit(1)
+        run_report["error"] = "No valid scenes found"
+        return finish(EXIT_INPUT_ERROR)
     
     print(f"[INFO] Processing {len(valid_scenes)} valid scenes")
     
@@ -200,50 +499,213 @@ def main():
     if args.scene is not None:
         if 0 <= args.scene < len(valid_scenes):
             valid_scenes = [valid_scenes[args.scene]]
+            scene_plans = [scene_plans[args.scene]]
             print(f"[INFO] Processing only scene {args.scene}")
         else:
             print(f"[ERROR] Scene {args.scene} not found (0-{len(valid_scenes)-1})")
-            sys.exit(1)
+            run_report["error"] = f"Scene {args.scene} not found"
+            return finish(EXIT_INPUT_ERROR)
     
     # Check if combining videos is requested (feature not yet implemented)
     if args.combine:
         print("[WARN] Combining videos is not yet implemented")
         print("[INFO] Will process scenes individually instead")
     
-    # Generate timestamp for this run
-    now = datetime.datetime.now()
-    timestamp = now.strftime("%Y-%m-%d_%H-%M-%S")
-    
+    # Scenes unchanged since an earlier render are restored, not translated / spoken again
+    cached = set()
+    if plans is None and not args.plan_only and not args.preview and config.RENDER_CACHE["enabled"]:
+        import render_cache
+        for i, scene in enumerate(valid_scenes):
+            try:
+                if render_cache.recall(render_cache.scene_key(scene)):
+                    cached.add(i)
+            except Exception as e:
+                print(f"[WARN] Render cache lookup failed for scene {i + 1}: {e}")
+        if cached:
+            print(f"[CACHE] {len(cached)} of {len(valid_scenes)} scenes match an earlier render")
+
+    # Translation + TTS for all scenes run in the background while scenes render
+    prepared = None
+    if len(valid_scenes) - len(cached) > 1 and plans is None and not args.enqueue:
+        print(f"\n→ Translating and synthesizing {len(valid_scenes) - len(cached)} scenes in the background...")
+        prepared = prepare_scenes(valid_scenes, timestamp, skip=cached)
+
     # Process each scene
     created_videos = []
-    for i, scene in enumerate(valid_scenes):
-        video_path = process_single_scene(
-            scene_data=scene,
-            scene_index=i,
-            total_scenes=len(valid_scenes),
-            timestamp=timestamp,
-            force_music=args.force_music_download
-        )
-        
+    thumbnail_jobs = [] if config.THUMBNAIL["enabled"] and not args.plan_only else None
+
+    def scene_prepared(i):
+        try:
+            return prepared[i].result() if prepared else None
+        except Exception as e:
+            print(f"[WARN] Background preparation failed, retrying inline: {e}")
+            return None
+
+    def record(i, scene, video_path, scene_report, scene_thumbnails):
+        scene_report.update(index=i + 1, headline=scene.get("headline", ""))
+        scene_report["status"] = "ok" if video_path else "failed"
+        scene_report["output"] = video_path
+        run_report["scenes"].append(scene_report)
+        if video_path and scene_report.get("seconds") and not args.plan_only and not scene_report.get("cached"):
+            # Timing history for the render-time cost model (cache hits rendered nothing)
+            try:
+                features = scene_features(scene, scene_report.get("audio_seconds"),
+                                          scene_report.get("images"), args.preview)
+                record_timing(features, scene_report["seconds"])
+            except Exception as e:
+                print(f"[WARN] Could not record render timing: {e}")
+        if scene_thumbnails:
+            thumbnail_jobs.extend(scene_thumbnails)
         if video_path:
             created_videos.append({
                 'path': video_path,
                 'scene': scene,
-                'index': i
+                'index': i,
+                'thumbnail': None,
+                'report': scene_report
             })
+
+    from memory_guard import render_slots
+    from asset_pool import get_pool
+    from cost_model import CostModel, audio_seconds, lpt_schedule, makespan, record_timing, scene_features
+    # Every frame worker or split-encode chunk of a scene builds its own copy of the composition
+    split_chunks = min(config.RENDER["split_chunks"], os.cpu_count() or 1)
+    compositions = split_chunks if split_chunks > 1 else min(config.RENDER["frame_workers"], os.cpu_count() or 1)
+    compositions = 1 if args.preview else max(1, compositions)
+    slots = render_slots(min(args.jobs, len(valid_scenes)),
+                         config.RENDER["memory_budget_mb"], config.RENDER["scene_memory_mb"], compositions)
+    if slots < min(args.jobs, len(valid_scenes)):
+        print(f"[MEMORY] --jobs {args.jobs} capped to {slots} by the memory budget")
+
+    if args.enqueue:
+        # Workers (python main.py --worker) render; this process waits and collects
+        from render_queue import RenderQueue
+        queue = RenderQueue(args.enqueue)
+        ids = queue.enqueue([{
+            "scene": scene,
+            "plan": plan["path"] if plan else None,
+            "index": i,
+            "total": len(valid_scenes),
+            "timestamp": timestamp,
+            "preview": args.preview,
+            "thumbnails": thumbnail_jobs is not None
+        } for i, (scene, plan) in enumerate(zip(valid_scenes, scene_plans))])
+        print(f"[QUEUE] Queued {len(ids)} scenes in {queue.path}; waiting for workers (python main.py --worker)")
+        for job in queue.wait(ids):
+            i = job["payload"]["index"]
+            result = job["result"] or {}
+            thumbs = result.pop("thumbnail_jobs", None)
+            if job["status"] != "done":
+                result.setdefault("stage", "worker")
+                result["error"] = job["error"]
+            result["attempts"] = job["attempts"]
+            print(f"[QUEUE] Scene {i + 1} {job['status']} by {result.get('worker', '?')}")
+            record(i, valid_scenes[i], job["output"] if job["status"] == "done" else None, result, thumbs)
+    elif slots <= 1:
+        for i, scene in enumerate(valid_scenes):
+            result = render_scene(scene, i, len(valid_scenes), timestamp, args.force_music_download,
+                                  thumbnail_jobs is not None, scene_prepared(i), args.preview,
+                                  plan=scene_plans[i], plan_dir=args.plan_only)
+            record(i, scene, *result)
+    else:
+        # One fresh process per scene, so each render's memory is returned to the OS
+        import multiprocessing
+        from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait as wait_futures
+        from layout import get_plan
+        # Build the shared assets once here; workers attach to them in shared memory
+        get_plan(config.PREVIEW["scale"] if args.preview else 1.0)
+        assets = get_pool().handle()
+
+        # Longest predicted scene first, so no straggler starts last
+        # Scenes still being translated / spoken are predicted from their word count
+        model = CostModel.load()
+        costs = []
+        for i, (scene, plan) in enumerate(zip(valid_scenes, scene_plans)):
+            duration, images = None, None
+            if i in cached:
+                costs.append(0.0)   # restored from the render cache
+                continue
+            if plan is not None:
+                duration, images = plan["spec"]["duration"], len(plan["spec"]["images"])
+            elif prepared and prepared[i].done():
+                audio = (scene_prepared(i) or {}).get("audio_file")
+                if isinstance(audio, (str, Path)):
+                    duration = audio_seconds(audio)
+            costs.append(model.predict(scene_features(scene, duration, images, preview=args.preview)))
+        order, predicted = lpt_schedule(costs, slots)
+        run_report["schedule"] = {
+            "model": model.describe(),
+            "weights": model.weights,
+            "predicted_seconds": costs,
+            "order": [i + 1 for i in order],
+            "predicted_makespan": round(predicted, 1),
+            "input_order_makespan": round(makespan(costs, slots), 1)
+        }
+        print(f"[SCHED] Cost model: {model.describe()}. Predicted batch time {predicted:.0f}s longest-first "
+              f"(vs {run_report['schedule']['input_order_makespan']:.0f}s in input order)")
+
+        print(f"[INFO] Rendering {len(valid_scenes)} scenes, {slots} at a time")
+        with ProcessPoolExecutor(max_workers=slots, max_tasks_per_child=1,
+                                 mp_context=multiprocessing.get_context("spawn")) as pool:
+            # Submit each scene as soon as its translation + TTS is done, longest first among
+            # the ready ones, so rendering overlaps the background preparation
+            futures, waiting = {}, list(order)
+            while waiting:
+                for i in [i for i in waiting if not prepared or prepared[i].done()]:
+                    futures[i] = pool.submit(render_scene, valid_scenes[i], i, len(valid_scenes), timestamp,
+                                             args.force_music_download, thumbnail_jobs is not None,
+                                             scene_prepared(i), args.preview, assets, scene_plans[i],
+                                             args.plan_only)
+                    waiting.remove(i)
+                if waiting:
+                    wait_futures([prepared[i] for i in waiting], return_when=FIRST_COMPLETED)
+            for i, scene in enumerate(valid_scenes):
+                future = futures[i]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"[ERROR] Scene {i + 1} worker crashed: {e}")
+                    result = (None, {"stage": "video", "error": str(e)}, None)
+                result[1]["predicted_seconds"] = costs[i]
+                record(i, scene, *result)
+    run_report["scenes"].sort(key=lambda r: r["index"])
+
+    from asset_pool import merge_stats, print_stats
+    run_report["asset_pool"] = merge_stats(get_pool().snapshot(),
+                                           *(r.pop("asset_pool", None) for r in run_report["scenes"]))
+    if run_report["asset_pool"]:
+        print("[POOL] Shared asset hit rates:")
+        print_stats(run_report["asset_pool"])
+
+    # Thumbnails for all scenes in one batch
+    if thumbnail_jobs:
+        from thumbnail_gen import generate_thumbnails
+        print("\n→ Generating thumbnails...")
+        thumbnails = dict(zip(
+            (job["output_path"] for job in thumbnail_jobs),
+            generate_thumbnails(thumbnail_jobs)
+        ))
+        for vid in created_videos:
+            vid['thumbnail'] = thumbnails.get(str(Path(vid['path']).with_suffix(".jpg")))
+            vid['report']["thumbnail"] = vid['thumbnail']
     
     # Summary
     print("\n" + "="*60)
     print("PROCESSING COMPLETE")
     print("="*60)
-    print(f"Successfully created: {len(created_videos)}/{len(valid_scenes)} videos")
+    print(f"Successfully created: {len(created_videos)}/{len(valid_scenes)} {'plans' if args.plan_only else 'videos'}")
     
+    run_report["cache_hits"] = sum(1 for r in run_report["scenes"] if r.get("cached"))
     for vid in created_videos:
         file_size = os.path.getsize(vid['path']) / (1024 * 1024)
-        print(f"  • Scene {vid['index']+1}: {vid['path']} ({file_size:.2f} MB)")
+        cached = ", reused from the render cache" if vid['report'].get("cached") else ""
+        print(f"  • Scene {vid['index']+1}: {vid['path']} ({file_size:.2f} MB{cached})")
+    if run_report["cache_hits"]:
+        print(f"[CACHE] {run_report['cache_hits']} of {len(valid_scenes)} scenes reused an identical earlier render")
     
     # Upload options
-    if created_videos and args.upload:
+    to_upload = []
+    if created_videos and upload_mode == "ask":
         print("\n" + "-"*60)
         print("Upload Options:")
         print("  1 = Upload all videos")
@@ -254,38 +716,48 @@ def main():
         upload_choice = input("Your choice (1/2/3): ").strip()
         
         if upload_choice == "1":
-            for vid in created_videos:
-                meta = vid['scene'].get("metadata", {})
-                print(f"\n→ Uploading scene {vid['index']+1}...")
-                try:
-                    upload_video(
-                        video_path=vid['path'],
-                        title=meta.get("title", vid['scene']["headline"]),
-                        description=meta.get("description", ""),
-                        tags=meta.get("tags", [])
-                    )
-                    print(f"[OK] Uploaded scene {vid['index']+1}")
-                except Exception as e:
-                    print(f"[ERROR] Upload failed for scene {vid['index']+1}: {e}")
-        
+            to_upload = created_videos
         elif upload_choice == "2":
             for vid in created_videos:
                 choice = input(f"\nUpload scene {vid['index']+1}? (y/n): ").strip().lower()
                 if choice in ['y', 'yes']:
-                    meta = vid['scene'].get("metadata", {})
-                    try:
-                        upload_video(
-                            video_path=vid['path'],
-                            title=meta.get("title", vid['scene']["headline"]),
-                            description=meta.get("description", ""),
-                            tags=meta.get("tags", [])
-                        )
-                        print(f"[OK] Uploaded scene {vid['index']+1}")
-                    except Exception as e:
-                        print(f"[ERROR] Upload failed: {e}")
+                    to_upload.append(vid)
+    elif upload_mode == "all":
+        to_upload = created_videos
+    elif upload_mode == "selected":
+        to_upload = [vid for vid in created_videos if vid['index'] + 1 in upload_selected]
+        unmatched = sorted(upload_selected - {vid['index'] + 1 for vid in created_videos})
+        if unmatched:
+            print(f"[WARN] --upload selected: no created video for scene number(s) "
+                  f"{', '.join(map(str, unmatched))} (numbers count the scenes processed, after --scene)")
+    
+    upload_failed = False
+    if to_upload:
+        from uploader import upload_many
+        jobs = []
+        for vid in to_upload:
+            meta = vid['scene'].get("metadata", {})
+            srt_path = Path(vid['path']).with_suffix(".srt")
+            jobs.append({
+                "video_path": vid['path'],
+                "title": meta.get("title", vid['scene']["headline"]),
+                "description": meta.get("description", ""),
+                "tags": meta.get("tags", []),
+                "thumbnail_path": vid['thumbnail'],
+                "captions_path": str(srt_path) if srt_path.exists() else None
+            })
+        print(f"\n→ Uploading {len(jobs)} videos ({config.UPLOAD['max_concurrent']} at a time)...")
+        for vid, result in zip(to_upload, upload_many(jobs)):
+            if isinstance(result, Exception):
+                print(f"[ERROR] Upload failed for scene {vid['index']+1}: {result}")
+                vid['report']["upload"] = {"status": "failed", "error": str(result)}
+                upload_failed = True
+            else:
+                print(f"[OK] Uploaded scene {vid['index']+1}")
+                vid['report']["upload"] = {"status": "ok", "video_id": result}
     
     # Preview option
-    if created_videos:
+    if created_videos and not args.no_preview:
         preview = input("\nPreview a video? (enter scene number or 'n'): ").strip()
         if preview.isdigit():
             idx = int(preview) - 1
@@ -302,16 +774,23 @@ def main():
     
     print("\n[ALL DONE] Thank you for using YouTube Shorts Generator!")
 
+    if len(created_videos) < len(valid_scenes):
+        return finish(EXIT_RENDER_FAILED)
+    if upload_failed:
+        return finish(EXIT_UPLOAD_FAILED)
+    return finish(EXIT_OK)
+
 
 if __name__ == "__main__":
     try:
-        main()
+        sys.exit(main())
     except KeyboardInterrupt:
         print("\n\n[INFO] Process interrupted by user")
-        sys.exit(0)
+        sys.exit(EXIT_INTERRUPTED)
     except Exception as e:
         print(f"\n[FATAL] Unexpected error: {e}")
         import traceback
         traceback.print_exc()
-        input("\nPress Enter to exit...")
-        sys.exit(1)
\ No newline at end of file
+        if "--headless" not in sys.argv and sys.stdin.isatty():
+            input("\nPress Enter to exit...")
+        sys.exit(EXIT_FATAL)
@@ -0,0 +1,137 @@
+"""Memory accounting for scene renders
+- PeakRSS: samples the resident set size of this process and its children
+  (frame workers, split-encode chunks, ffmpeg) while a block runs
+- render_slots(): how many scenes may render at once within a memory budget
+"""
+
+import os
+import threading
+
+
+def current_rss_mb() -> float:
+    """Resident set size of this process in MB"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        return 0.0
+
+
+def _proc_tree_rss(root: int) -> int | None:
+    """Bytes resident in `root` and its descendants, from /proc (None if unavailable)"""
+    parents = {}
+    try:
+        for entry in os.listdir("/proc"):
+            if entry.isdigit():
+                try:
+                    with open(f"/proc/{entry}/stat") as f:
+                        stat = f.read()
+                    parents[int(entry)] = int(stat[stat.rindex(")") + 2:].split()[1])
+                except (OSError, ValueError):
+                    continue   # exited while scanning
+    except OSError:
+        return None
+    if root not in parents:
+        return None
+    tree, frontier = {root}, [root]
+    while frontier:
+        children = [pid for pid, ppid in parents.items() if ppid in frontier and pid not in tree]
+        tree.update(children)
+        frontier = children
+    page, total = os.sysconf("SC_PAGE_SIZE"), 0
+    for pid in tree:
+        try:
+            with open(f"/proc/{pid}/statm") as f:
+                total += int(f.read().split()[1]) * page
+        except (OSError, ValueError):
+            continue
+    return total
+
+
+def tree_rss_mb() -> float:
+    """
+    RSS of this process plus all its descendants in MB. Pages shared between
+    them (asset pool, memory-mapped music) count once per process.
+    """
+    total = _proc_tree_rss(os.getpid())
+    if total is not None:
+        return total / (1024 * 1024)
+    try:
+        import psutil
+    except ImportError:
+        return current_rss_mb()
+    total = 0
+    proc = psutil.Process()
+    for p in [proc] + proc.children(recursive=True):
+        try:
+            total += p.memory_info().rss
+        except psutil.Error:
+            continue
+    return total / (1024 * 1024)
+
+
+def available_memory_mb() -> float:
+    """MemAvailable from /proc/meminfo (0 if unknown)"""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        import psutil
+        return psutil.virtual_memory().available / (1024 * 1024)
+    except ImportError:
+        return 0.0
+
+
+class PeakRSS:
+    """
+    with PeakRSS() as mem: ...
+    mem.peak_mb is the highest RSS of this process and its children seen while
+    the block ran (sampled every `interval` seconds), mem.start_mb / mem.end_mb
+    the RSS around it.
+    """
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.start_mb = self.end_mb = self.peak_mb = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak_mb = max(self.peak_mb, tree_rss_mb())
+
+    def __enter__(self):
+        self.start_mb = self.peak_mb = tree_rss_mb()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.end_mb = tree_rss_mb()
+        self.peak_mb = round(max(self.peak_mb, self.end_mb), 1)
+        return False
+
+
+def render_slots(jobs: int, budget_mb: float, scene_mb: float, compositions: int = 1) -> int:
+    """
+    Concurrent scene renders allowed: at most `jobs`, and at least 1.
+    compositions is how many copies of the scene one render builds (one per
+    frame worker or split-encode chunk), each costing about scene_mb.
+    """
+    if budget_mb <= 0:
+        budget_mb = available_memory_mb() * 0.5
+    if budget_mb <= 0 or scene_mb <= 0:
+        return max(1, jobs)
+    return max(1, min(jobs, int(budget_mb // (scene_mb * max(1, compositions)))))
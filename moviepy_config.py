@@ -1,11 +1,36 @@
 # moviepy_config.py
-# This file MUST be imported BEFORE any moviepy-related code
-# It sets the correct path to ImageMagick so TextClip works
+# Call configure_imagemagick() BEFORE creating any TextClip
+# It sets the correct path to ImageMagick so TextClip works.
+# Nothing happens at import time, so importing this module is free.
 
-from moviepy.config import change_settings
+import config
 
-change_settings({
-    "IMAGEMAGICK_BINARY": r"C:\Program Files\ImageMagick-7.1.2-Q16-HDRI\magick.exe"
-})
+_configured = False
 
-print("ImageMagick path configured successfully")  # optional debug line
\ No newline at end of file
+
+def configure_imagemagick():
+    """Point MoviePy at the ImageMagick binary from config (once per process)"""
+    global _configured
+    if _configured:
+        return
+
+    from moviepy.config import change_settings
+    change_settings({
+        "IMAGEMAGICK_BINARY": config.IMAGEMAGICK_BINARY
+    })
+    _configured = True
+    print("[CONFIG] ImageMagick path configured")
+
+
+def selftest() -> bool:
+    """Render a test TextClip to prove ImageMagick works"""
+    configure_imagemagick()
+    try:
+        from moviepy.editor import TextClip
+        TextClip("TEST TEXT", fontsize=50, color='white').close()
+        print("[TEST] TextClip created successfully → ImageMagick is working!")
+        return True
+    except Exception as e:
+        print("[TEST FAIL] ImageMagick not found:")
+        print(e)
+        return False
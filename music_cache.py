@@ -0,0 +1,137 @@
+"""Background music asset cache
+- Each category track is decoded through ffmpeg once, to float32 PCM on disk
+- Loudness (RMS) normalization gain is computed once and stored alongside
+- Tracks are memory-mapped, then sliced / looped with NumPy per scene
+- Missing or all-zero tracks become a virtual silent track (nothing decoded or mixed)
+- Loaded tracks are kept in the asset pool; --jobs workers map the same cache
+  file, so the PCM pages are shared through the OS page cache
+"""
+
+from pathlib import Path
+import hashlib
+import json
+import os
+import threading
+import numpy as np
+import config
+from ffmpeg_tools import decode_audio
+from asset_pool import get_pool
+
+CACHE_DIR = Path("temp/music_cache")
+
+
+class MusicTrack:
+    """A decoded, loudness-normalized music track backed by a memory map"""
+
+    silent = False
+
+    def __init__(self, samples: np.ndarray, rate: int, gain: float, source: str):
+        self.samples = samples
+        self.rate = rate
+        self.gain = gain
+        self.source = source
+
+    @property
+    def duration(self) -> float:
+        return len(self.samples) / self.rate
+
+    def loop(self, duration: float, volume: float = 1.0, rate: int = None) -> np.ndarray:
+        """Looped slice of `duration` seconds, normalized and scaled by volume"""
+        if rate is not None and rate != self.rate:
+            raise ValueError(f"Track is cached at {self.rate} Hz, not {rate} Hz")
+        n = int(round(duration * self.rate))
+        out = np.empty((n, self.samples.shape[1]), dtype=np.float32)
+        pos = 0
+        while pos < n:
+            take = min(len(self.samples), n - pos)
+            out[pos:pos + take] = self.samples[:take]
+            pos += take
+        out *= self.gain * volume
+        return out
+
+
+class SilentTrack:
+    """Virtual track: no file, no decode, and the mixer skips it"""
+
+    silent = True
+    source = "silence"
+    gain = 0.0
+
+    def __init__(self, rate: int):
+        self.rate = rate
+
+    def loop(self, duration: float, volume: float = 1.0, rate: int = None) -> np.ndarray:
+        return np.zeros((int(round(duration * (rate or self.rate))), 2), dtype=np.float32)
+
+
+def resolve_music_path(news_type: str) -> Path | None:
+    """Category-specific track first, then the default track"""
+    for name in (f"{news_type}_music.mp3", "default_music.mp3"):
+        path = Path("background_music") / name
+        if path.exists() and path.stat().st_size > 0:
+            return path
+    return None
+
+
+def _cache_key(path: Path, rate: int) -> str:
+    st = path.stat()
+    ident = f"{path.resolve()}|{st.st_size}|{int(st.st_mtime)}|{rate}"
+    return f"{path.stem}_{hashlib.sha1(ident.encode()).hexdigest()[:12]}"
+
+
+def load_track(path: str | Path, rate: int = None):
+    """Decode (first time only) and memory-map a music file"""
+    path = Path(path)
+    rate = rate or config.AUDIO["sample_rate"]
+    key = _cache_key(path, rate)
+    return get_pool().get("music", key, lambda: _open_track(path, rate, key))
+
+
+def _open_track(path: Path, rate: int, key: str):
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    base = CACHE_DIR / key
+    pcm_path, meta_path = base.with_suffix(".f32"), base.with_suffix(".json")
+
+    if not (pcm_path.exists() and meta_path.exists()):
+        print(f"[MUSIC] Decoding {path} once into the cache...")
+        samples = decode_audio(path, rate=rate, channels=2)
+        rms = float(np.sqrt(np.mean(np.square(samples, dtype=np.float64)))) if samples.size else 0.0
+        target = 10 ** (config.AUDIO["music_target_dbfs"] / 20)
+        meta = {
+            "source": str(path),
+            "rate": rate,
+            "frames": len(samples),
+            "rms": rms,
+            "gain": (target / rms) if rms > 1e-6 else 0.0,
+            "silent": rms <= 1e-6
+        }
+        # Other workers may decode the same track at once: each writes its own temp
+        # files and renames them into place, PCM first, so the .json marks a complete .f32
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        pcm_tmp, meta_tmp = pcm_path.with_name(pcm_path.name + suffix), meta_path.with_name(meta_path.name + suffix)
+        samples.tofile(pcm_tmp)
+        os.replace(pcm_tmp, pcm_path)
+        meta_tmp.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+        os.replace(meta_tmp, meta_path)
+    else:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+
+    if meta["silent"] or meta["frames"] == 0:
+        track = SilentTrack(rate)
+    else:
+        samples = np.memmap(pcm_path, dtype=np.float32, mode="r", shape=(meta["frames"], 2))
+        track = MusicTrack(samples, rate, meta["gain"], str(path))
+    return track
+
+
+def get_music_track(news_type: str, rate: int = None):
+    """Track for a category, or a virtual silent track when there is none"""
+    rate = rate or config.AUDIO["sample_rate"]
+    path = resolve_music_path(news_type)
+    if path is None:
+        return get_pool().get("music", ("silence", rate), lambda: SilentTrack(rate))
+    try:
+        return load_track(path, rate)
+    except Exception as e:
+        print(f"[WARN] Could not load background music {path}: {e}")
+        return SilentTrack(rate)
@@ -5,26 +5,6 @@ from pathlib import Path
 import config
 import sys
 
-# Try to import audio libraries, but provide fallbacks if not available
-try:
-    import numpy as np
-    HAS_NUMPY = True
-except ImportError:
-    HAS_NUMPY = False
-    print("[WARN] numpy not installed. Silent audio creation will be limited.")
-
-try:
-    from scipy.io import wavfile
-    HAS_SCIPY = True
-except ImportError:
-    HAS_SCIPY = False
-
-try:
-    from pydub import AudioSegment
-    HAS_PYDUB = True
-except ImportError:
-    HAS_PYDUB = False
-
 
 def download_music_for_category(category, force_download=False):
     """
@@ -59,10 +39,10 @@ def download_music_for_category(category, force_download=False):
     music_urls = getattr(config.AUDIO, "music_urls", {}) if hasattr(config, 'AUDIO') else {}
     url = music_urls.get(category, music_urls.get("default", ""))
     
-    # For demo purposes - if no URL or example.com, create placeholder
+    # No real URL: the mixer uses a virtual silent track, nothing to encode
     if not url or "example.com" in url:
-        print(f"[INFO] Using placeholder for {category}. Creating silent audio...")
-        return create_silent_audio(music_path)
+        print(f"[INFO] No music URL for {category} - using virtual silent track")
+        return None
     
     # Download the music
     try:
@@ -84,62 +64,8 @@ def download_music_for_category(category, force_download=False):
         return str(music_path)
     except Exception as e:
         print(f"[ERROR] Failed to download music: {e}")
-        print("[INFO] Creating silent audio as fallback...")
-        return create_silent_audio(music_path)
-
-
-def create_silent_audio(music_path, duration=300):
-    """
-    Create a silent audio file as fallback
-    """
-    try:
-        # Method 1: Using pydub (easiest)
-        if HAS_PYDUB:
-            print("[INFO] Using pydub to create silent audio...")
-            silent = AudioSegment.silent(duration=duration*1000)  # duration in milliseconds
-            silent.export(music_path, format="mp3")
-            print(f"[INFO] Created silent audio at {music_path}")
-            return str(music_path)
-        
-        # Method 2: Using scipy + numpy
-        elif HAS_NUMPY and HAS_SCIPY:
-            print("[INFO] Using numpy+scipy to create silent audio...")
-            sample_rate = 44100
-            silent_array = np.zeros(sample_rate * duration, dtype=np.int16)
-            
-            # Save as WAV first
-            wav_path = music_path.with_suffix('.wav')
-            wavfile.write(wav_path, sample_rate, silent_array)
-            
-            # Try to convert to MP3 (requires ffmpeg)
-            try:
-                import subprocess
-                subprocess.run(['ffmpeg', '-i', str(wav_path), '-y', str(music_path)], 
-                             capture_output=True, check=True)
-                wav_path.unlink()  # Remove WAV file
-                print(f"[INFO] Created silent audio at {music_path}")
-                return str(music_path)
-            except:
-                # If ffmpeg fails, just return the WAV path
-                print(f"[INFO] Created silent WAV at {wav_path}")
-                return str(wav_path)
-        
-        # Method 3: Create an empty file (not ideal but better than nothing)
-        else:
-            print("[WARN] No audio libraries available. Creating empty placeholder.")
-            with open(music_path, 'wb') as f:
-                f.write(b'')  # Empty file
-            return str(music_path)
-            
-    except Exception as e:
-        print(f"[ERROR] Could not create silent audio: {e}")
-        # Create an empty file as last resort
-        try:
-            with open(music_path, 'wb') as f:
-                f.write(b'')
-            return str(music_path)
-        except:
-            return None
+        print("[INFO] Falling back to virtual silent track")
+        return None
 
 
 def ensure_music_exists(news_type, force_download=False):
@@ -12,6 +12,7 @@ class Metadata(BaseModel):
     tags: List[str]
     search_key: str
     aspect_ratio: str = Field(default="9:16_FILL")
+    renditions: Optional[List[str]] = None   # Extra outputs, e.g. ["9:16_FILL@720", "1:1_FILL"]
 
     # New SEO fields (optional)
     youtube_title_options: Optional[List[str]] = None
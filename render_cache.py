@@ -0,0 +1,230 @@
+"""Render-result cache
+Output names carry a timestamp, so rendering the same data.json twice would
+encode every scene again. render_plan() first fingerprints the render plan:
+
+    - scene content and subtitle timings, layer windows and encode profile (the plan)
+    - SHA-1 of every slideshow image and of the mixed soundtrack
+    - the config sections that change pixels (CONFIG_SECTIONS, RENDER_KEYS)
+      and the layout template file, if any
+    - the ffmpeg build and MoviePy version
+
+A hit hard-links (or copies) the cached MP4s to this run's output paths
+instead of rendering; a miss stores the finished MP4s after encoding.
+
+Planning itself (translation, TTS, image search, music mix, alignment) costs
+far more than the lookup, and re-fetched images rarely hash the same. So each
+render is also remembered under scene_key(): the scene JSON, the config that
+shapes the script, voice, images and frames, the background music files and
+the encoder. recall() maps it to the fingerprint and plan of the earlier
+render before any of that work runs.
+
+    RENDER_CACHE["dir"]/<fingerprint>/entry.json + video_0.mp4, video_1.mp4, ...
+    RENDER_CACHE["dir"]/scenes/<scene key>.json  -> {"key": <fingerprint>, "plan": {...}}
+
+gc() drops entries unused for RENDER_CACHE["max_age_days"], then the least
+recently used ones until the cache fits in RENDER_CACHE["max_mb"].
+
+    python render_cache.py stats | gc
+"""
+
+from pathlib import Path
+import hashlib
+import json
+import os
+import shutil
+import time
+import config
+
+CACHE_VERSION = 1
+
+CONFIG_SECTIONS = ("VIDEO_WIDTH", "VIDEO_HEIGHT", "FPS", "HEADER_HEIGHT", "OUTPUT", "LAYOUT",
+                   "SUBTITLE", "HEADER", "HOOK", "END_SCREEN", "PROGRESS_BAR")
+RENDER_KEYS = ("raw_writer", "pipe_format", "split_chunks")   # split encodes pin the GOP
+# Also read before a plan exists: script, voice, music and image selection
+SCENE_SECTIONS = ("TRANSLATION", "TTS", "AUDIO", "ALIGNMENT", "IMAGE_DEDUP", "IMAGE_RANKING")
+MUSIC_DIR = "background_music"
+
+ENTRY = "entry.json"
+SCENES = "scenes"
+
+
+def encoder_version() -> str:
+    import moviepy
+    from ffmpeg_tools import ffmpeg_version
+    return f"{ffmpeg_version()} / moviepy {moviepy.__version__}"
+
+
+def fingerprint(plan: dict) -> str:
+    """Cache key of a plan from video_compose.plan_video (asset paths must be readable)"""
+    from scene_plan import file_sha1
+    spec = plan["spec"]
+    template = config.LAYOUT.get("template")
+    key = {
+        "version": CACHE_VERSION,
+        "spec": {k: v for k, v in spec.items() if k != "images"},
+        "layout": plan["layout"],
+        "encode": plan["encode"],
+        "images": [file_sha1(p) for p in spec["images"]],
+        "audio": file_sha1(plan["audio"]),
+        "config": {name: getattr(config, name) for name in CONFIG_SECTIONS},
+        "render": {k: config.RENDER[k] for k in RENDER_KEYS},
+        "template": file_sha1(template) if template else None,
+        "encoder": encoder_version()
+    }
+    blob = json.dumps(key, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+
+def scene_key(scene: dict, preview: bool = False) -> str:
+    """Pre-plan cache key of a scene from data.json: no network, TTS or asset hashing"""
+    from scene_plan import file_sha1
+    template = config.LAYOUT.get("template")
+    music = sorted((p.name, p.stat().st_size, p.stat().st_mtime_ns)
+                   for p in Path(MUSIC_DIR).glob("*") if p.is_file())
+    key = {
+        "version": CACHE_VERSION,
+        "scene": scene,
+        "preview": preview,
+        "config": {name: getattr(config, name) for name in CONFIG_SECTIONS + SCENE_SECTIONS},
+        "render": {k: config.RENDER[k] for k in RENDER_KEYS},
+        "template": file_sha1(template) if template else None,
+        "music": music,
+        "encoder": encoder_version()
+    }
+    blob = json.dumps(key, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+
+def _place(src: Path, dst: Path):
+    """dst becomes src's content: hard link if allowed and possible, else copy"""
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    if dst.exists() and os.path.samefile(src, dst):
+        return
+    tmp = dst.with_name(dst.name + ".part")
+    tmp.unlink(missing_ok=True)
+    try:
+        if not config.RENDER_CACHE["link"]:
+            raise OSError("linking disabled")
+        os.link(src, tmp)
+    except OSError:
+        shutil.copyfile(src, tmp)
+    os.replace(tmp, dst)
+
+
+def _cache_dir() -> Path:
+    return Path(config.RENDER_CACHE["dir"])
+
+
+def restore(key: str, paths: list[str | Path]) -> bool:
+    """Place a cached render at `paths` (one per rendition, in plan_outputs order); False on a miss"""
+    entry_dir = _cache_dir() / key
+    try:
+        with open(entry_dir / ENTRY, "r", encoding="utf-8") as f:
+            files = json.load(f)["files"]
+    except (OSError, ValueError, KeyError):
+        return False
+    if len(files) != len(paths) or not all((entry_dir / name).exists() for name in files):
+        return False
+    for name, path in zip(files, paths):
+        _place(entry_dir / name, Path(path))
+    os.utime(entry_dir / ENTRY)   # last used, for gc()
+    return True
+
+
+def remember(scene: str, key: str, plan: dict):
+    """Point a scene_key() at the fingerprint() of its render and the plan it came from"""
+    path = _cache_dir() / SCENES / f"{scene}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.tmp{os.getpid()}")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"key": key, "plan": plan}, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def recall(scene: str) -> dict | None:
+    """{"key", "plan"} remembered for a scene_key(), if that render is still cached"""
+    try:
+        with open(_cache_dir() / SCENES / f"{scene}.json", "r", encoding="utf-8") as f:
+            link = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return link if (_cache_dir() / link.get("key", "") / ENTRY).exists() else None
+
+
+def release(paths: list[str | Path]):
+    """
+    Unlink existing files at paths about to be rendered: ffmpeg overwrites in
+    place, which would also change a cached file hard-linked there
+    """
+    for path in paths:
+        Path(path).unlink(missing_ok=True)
+
+
+def store(key: str, paths: list[str | Path]):
+    """Add a finished render (one file per rendition) under `key`, then gc()"""
+    final = _cache_dir() / key
+    if (final / ENTRY).exists():
+        return
+    work = final.with_name(f"{key}.tmp{os.getpid()}")
+    shutil.rmtree(work, ignore_errors=True)
+    work.mkdir(parents=True)
+    files = []
+    for i, path in enumerate(paths):
+        name = f"video_{i}{Path(path).suffix}"
+        _place(Path(path), work / name)
+        files.append(name)
+    with open(work / ENTRY, "w", encoding="utf-8") as f:
+        json.dump({"created": time.time(), "files": files}, f)
+    try:
+        os.replace(work, final)
+    except OSError:   # another worker stored the same render first
+        shutil.rmtree(work, ignore_errors=True)
+    gc()
+
+
+def entries() -> list[dict]:
+    """Cached renders, least recently used first"""
+    found = []
+    root = _cache_dir()
+    if not root.exists():
+        return found
+    for entry_dir in root.iterdir():
+        entry = entry_dir / ENTRY
+        if not entry.exists():
+            continue
+        size = sum(f.stat().st_size for f in entry_dir.iterdir() if f.is_file())
+        found.append({"key": entry_dir.name, "path": entry_dir, "used": entry.stat().st_mtime, "bytes": size})
+    return sorted(found, key=lambda e: e["used"])
+
+
+def gc(max_age_days: float = None, max_mb: float = None) -> tuple[int, int]:
+    """Remove stale entries; returns (entries removed, bytes freed)"""
+    max_age_days = config.RENDER_CACHE["max_age_days"] if max_age_days is None else max_age_days
+    max_mb = config.RENDER_CACHE["max_mb"] if max_mb is None else max_mb
+    cached = entries()
+    total = sum(e["bytes"] for e in cached)
+    cutoff = time.time() - max_age_days * 86400
+    removed = freed = 0
+    for e in cached:
+        if e["used"] >= cutoff and total - freed <= max_mb * 1024 * 1024:
+            continue
+        shutil.rmtree(e["path"], ignore_errors=True)
+        removed += 1
+        freed += e["bytes"]
+    if removed:
+        # Scene keys pointing at removed renders go too
+        for link in (_cache_dir() / SCENES).glob("*.json"):
+            if recall(link.stem) is None:
+                link.unlink(missing_ok=True)
+        print(f"[CACHE] Removed {removed} cached renders ({freed / 1024 / 1024:.1f} MB)")
+    return removed, freed
+
+
+if __name__ == "__main__":
+    import sys
+    command = sys.argv[1] if len(sys.argv) > 1 else "stats"
+    if command == "gc":
+        gc()
+    cached = entries()
+    print(f"[CACHE] {len(cached)} renders, {sum(e['bytes'] for e in cached) / 1024 / 1024:.1f} MB "
+          f"in {_cache_dir()}")
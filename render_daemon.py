@@ -0,0 +1,294 @@
+# render_daemon.py
+"""Long-running local render daemon
+Keeps MoviePy / NumPy / Pillow imported, ImageMagick and ffmpeg probed, text
+sprites cached and HTTP connections open between jobs, so each video only
+pays for its own work.
+
+    python render_daemon.py serve                      # start on config.DAEMON host/port
+    python render_daemon.py submit data.json --follow  # queue scenes, stream progress
+
+API (localhost HTTP, JSON):
+    POST /jobs               body: one scene object or a list of scenes -> {"jobs": [ids]}
+    GET  /jobs               all jobs
+    GET  /jobs/<id>          status, events, output
+    GET  /jobs/<id>/events   progress as newline-delimited JSON until the job ends
+    GET  /health
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import argparse
+import datetime
+import itertools
+import json
+import queue
+import sys
+import threading
+import time
+import urllib.request
+import config
+
+
+class RenderDaemon:
+    """Job queue + a single warm render worker"""
+
+    def __init__(self):
+        self.jobs = {}
+        self.queue = queue.Queue()
+        self.changed = threading.Condition()
+        self._ids = itertools.count(1)
+        self.started = time.time()
+        self.warm = False
+
+    # ───────────────────────────────────────────────
+    # Warm-up: pay every one-time cost before the first job
+    # ───────────────────────────────────────────────
+    def warm_up(self):
+        start = time.time()
+        print("[DAEMON] Warming up render engine...")
+        from moviepy_config import configure_imagemagick
+        configure_imagemagick()
+        import video_compose  # noqa: F401  (MoviePy, NumPy, ffmpeg probe)
+        import image_fetch    # noqa: F401  (Pillow, requests)
+        from main import process_single_scene  # noqa: F401
+        self.warm = True
+        print(f"[DAEMON] Warm in {time.time() - start:.1f}s")
+
+    # ───────────────────────────────────────────────
+    # Jobs
+    # ───────────────────────────────────────────────
+    def submit(self, scene: dict) -> str:
+        job_id = str(next(self._ids))
+        with self.changed:
+            self.jobs[job_id] = {
+                "id": job_id,
+                "headline": scene.get("headline", ""),
+                "status": "queued",
+                "events": [],
+                "output": None,
+                "thumbnail": None,
+                "error": None,
+                "peak_rss_mb": None,
+                "submitted": datetime.datetime.now().isoformat(timespec="seconds")
+            }
+        self.queue.put((job_id, scene))
+        return job_id
+
+    def _event(self, job_id, stage, message):
+        with self.changed:
+            self.jobs[job_id]["events"].append({
+                "t": round(time.time(), 3), "stage": stage, "message": message
+            })
+            self.changed.notify_all()
+
+    def _set(self, job_id, **fields):
+        with self.changed:
+            self.jobs[job_id].update(fields)
+            self.changed.notify_all()
+
+    def _finish(self, job_id, start, **fields):
+        """Record the outcome and the final event together, so streams never miss it"""
+        with self.changed:
+            job = self.jobs[job_id]
+            job.update(fields)
+            job["events"].append({
+                "t": round(time.time(), 3),
+                "stage": "end",
+                "message": f"{job['status']} in {time.time() - start:.1f}s"
+            })
+            self.changed.notify_all()
+
+    def warm_connections(self):
+        """Open keep-alive connections in the calling thread's session (sessions are per thread)"""
+        from http_session import get_session
+        session = get_session()
+        for url in config.DAEMON["warm_hosts"]:
+            try:
+                session.head(url, timeout=5)
+            except Exception as e:
+                print(f"[DAEMON] Could not pre-connect to {url}: {e}")
+
+    def worker(self):
+        from main import process_single_scene
+        from thumbnail_gen import generate_thumbnails
+        from memory_guard import PeakRSS
+
+        self.warm_connections()   # here, so the render thread's own session is the warm one
+        while True:
+            job_id, scene = self.queue.get()
+            self._set(job_id, status="running")
+            start = time.time()
+            report, thumbnail_jobs = {}, []
+            timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S") + f"_{job_id}"
+            mem = PeakRSS()
+            try:
+                with mem:
+                    video_path = process_single_scene(
+                        scene_data=scene,
+                        scene_index=0,
+                        total_scenes=1,
+                        timestamp=timestamp,
+                        thumbnail_jobs=thumbnail_jobs if config.THUMBNAIL["enabled"] else None,
+                        report=report,
+                        on_progress=lambda stage, msg: self._event(job_id, stage, msg)
+                    )
+                thumbnail = generate_thumbnails(thumbnail_jobs)[0] if thumbnail_jobs else None
+                if video_path:
+                    self._finish(job_id, start, status="done", output=video_path, thumbnail=thumbnail,
+                                 peak_rss_mb=mem.peak_mb)
+                else:
+                    self._finish(job_id, start, status="failed", peak_rss_mb=mem.peak_mb,
+                                 error=f"{report.get('stage')}: {report.get('error')}")
+            except Exception as e:
+                self._finish(job_id, start, status="failed", error=str(e))
+            self.queue.task_done()
+
+    def snapshot(self, job_id=None):
+        """Copy of one job (or all jobs), safe to serialize while the worker runs"""
+        with self.changed:
+            if job_id is not None:
+                return json.loads(json.dumps(self.jobs[job_id]))
+            return json.loads(json.dumps(list(self.jobs.values())))
+
+    def wait_events(self, job_id, seen: int, timeout: float = 15.0):
+        """Block until the job has more than `seen` events or has finished"""
+        with self.changed:
+            self.changed.wait_for(
+                lambda: len(self.jobs[job_id]["events"]) > seen
+                or self.jobs[job_id]["status"] in ("done", "failed"),
+                timeout=timeout
+            )
+            job = self.jobs[job_id]
+            return job["events"][seen:], job["status"]
+
+
+def make_handler(daemon: RenderDaemon):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, fmt, *args):
+            pass
+
+        def _json(self, code, payload):
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            parts = [p for p in self.path.split("?")[0].split("/") if p]
+            if parts == ["health"]:
+                return self._json(200, {
+                    "status": "ok",
+                    "warm": daemon.warm,
+                    "queued": daemon.queue.qsize(),
+                    "uptime": round(time.time() - daemon.started, 1)
+                })
+            if parts == ["jobs"]:
+                return self._json(200, daemon.snapshot())
+            if len(parts) >= 2 and parts[0] == "jobs" and parts[1] in daemon.jobs:
+                if len(parts) == 2:
+                    return self._json(200, daemon.snapshot(parts[1]))
+                if parts[2:] == ["events"]:
+                    return self._stream(parts[1])
+            self._json(404, {"error": "not found"})
+
+        def _stream(self, job_id):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            seen = 0
+            while True:
+                events, status = daemon.wait_events(job_id, seen)
+                for ev in events:
+                    self.wfile.write((json.dumps(ev, ensure_ascii=False) + "\n").encode("utf-8"))
+                seen += len(events)
+                self.wfile.flush()
+                if status in ("done", "failed") and not events:
+                    break
+
+        def do_POST(self):
+            if self.path.rstrip("/") != "/jobs":
+                return self._json(404, {"error": "not found"})
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length))
+            except Exception as e:
+                return self._json(400, {"error": f"invalid JSON: {e}"})
+            scenes = payload if isinstance(payload, list) else [payload]
+            required = ["headline", "hook_text", "details", "subscribe_hook"]
+            for i, scene in enumerate(scenes):
+                if not isinstance(scene, dict):
+                    return self._json(400, {"error": f"scene {i + 1} is not a JSON object"})
+                missing = [f for f in required if f not in scene]
+                if missing:
+                    return self._json(400, {"error": f"scene {i + 1} missing fields: {missing}"})
+            self._json(202, {"jobs": [daemon.submit(scene) for scene in scenes]})
+
+    return Handler
+
+
+def serve(host: str, port: int):
+    daemon = RenderDaemon()
+    daemon.warm_up()
+    threading.Thread(target=daemon.worker, daemon=True).start()
+    server = ThreadingHTTPServer((host, port), make_handler(daemon))
+    print(f"[DAEMON] Listening on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n[DAEMON] Shutting down")
+    finally:
+        server.server_close()
+
+
+def submit(json_path: str, url: str, follow: bool) -> int:
+    with open(json_path, "r", encoding="utf-8") as f:
+        payload = f.read().encode("utf-8")
+    req = urllib.request.Request(f"{url}/jobs", data=payload,
+                                 headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req) as r:
+        job_ids = json.load(r)["jobs"]
+    print(f"[SUBMIT] Queued jobs: {', '.join(job_ids)}")
+    if not follow:
+        return 0
+
+    failed = 0
+    for job_id in job_ids:
+        with urllib.request.urlopen(f"{url}/jobs/{job_id}/events") as r:
+            for line in r:
+                ev = json.loads(line)
+                print(f"  [job {job_id}] {ev['stage']}: {ev['message']}")
+        with urllib.request.urlopen(f"{url}/jobs/{job_id}") as r:
+            job = json.load(r)
+        if job["status"] != "done":
+            failed += 1
+            print(f"  [job {job_id}] FAILED: {job['error']}")
+    return 3 if failed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Warm render daemon for YouTube Shorts")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("serve", help="Run the daemon")
+    p.add_argument("--host", default=config.DAEMON["host"])
+    p.add_argument("--port", type=int, default=config.DAEMON["port"])
+
+    p = sub.add_parser("submit", help="Queue scenes from a JSON file")
+    p.add_argument("json")
+    p.add_argument("--url", default=f"http://{config.DAEMON['host']}:{config.DAEMON['port']}")
+    p.add_argument("--follow", action="store_true", help="Stream progress until all jobs finish")
+
+    args = parser.parse_args()
+    if args.cmd == "serve":
+        Path("output").mkdir(exist_ok=True)
+        Path("temp").mkdir(exist_ok=True)
+        serve(args.host, args.port)
+    else:
+        sys.exit(submit(args.json, args.url, args.follow))
+
+
+if __name__ == "__main__":
+    main()
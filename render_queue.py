@@ -0,0 +1,256 @@
+"""Render job queue shared by several machines
+A single SQLite file on shared storage (QUEUE["path"]) holds the jobs; no
+broker process is needed.
+
+    python main.py --enqueue --json data.json     # coordinator: queue scenes, wait, upload
+    python main.py --worker                       # on every render box / container
+
+A worker claims the oldest queued job with a lease (lease_until = now +
+QUEUE["lease_s"]) inside one write transaction, so two workers never get
+the same job. While rendering, a background thread extends the lease every
+QUEUE["heartbeat_s"]. A job whose lease expires (worker crashed, machine
+lost) goes back to the queue on the next claim or coordinator poll, until
+QUEUE["max_attempts"] claims have been used up. Results from a worker that
+has lost its lease are ignored.
+
+Workers render into output/ and temp/ relative to their working directory,
+so run them from the same shared project directory as the coordinator.
+The database uses SQLite's default rollback journal (WAL needs shared memory
+and does not work over network filesystems); worker clocks should agree to
+well within the lease time.
+"""
+
+from pathlib import Path
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import config
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',   -- queued | leased | done | failed
+    worker TEXT,
+    lease_until REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    output TEXT,
+    result TEXT,
+    error TEXT,
+    created REAL NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id);
+"""
+
+
+def worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class RenderQueue:
+    """
+    queue = RenderQueue("output/render_queue.sqlite")
+    ids = queue.enqueue([payload, ...])
+    job = queue.claim(worker_id())      -> {"id", "payload", "attempts"} or None
+    queue.heartbeat(job["id"], worker)  -> False once the lease was lost
+    queue.complete(job["id"], worker, output, result) / queue.fail(...)
+    """
+
+    def __init__(self, path: str | Path = None, lease_s: float = None, max_attempts: int = None):
+        self.path = Path(path or config.QUEUE["path"])
+        self.lease_s = lease_s or config.QUEUE["lease_s"]
+        self.max_attempts = max_attempts or config.QUEUE["max_attempts"]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as db:
+            db.executescript(SCHEMA)
+
+    def _connect(self):
+        db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        db.row_factory = sqlite3.Row
+        return _Transaction(db)
+
+    def enqueue(self, payloads: list[dict]) -> list[int]:
+        now = time.time()
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            return [db.execute("INSERT INTO jobs (payload, created, updated) VALUES (?, ?, ?)",
+                               (json.dumps(p, ensure_ascii=False), now, now)).lastrowid
+                    for p in payloads]
+
+    def _requeue_expired(self, db, now):
+        """Expired leases back to 'queued' (or 'failed' once out of attempts); returns how many"""
+        expired = db.execute("SELECT id, attempts, worker FROM jobs WHERE status = 'leased' AND lease_until < ?",
+                             (now,)).fetchall()
+        for job in expired:
+            if job["attempts"] >= self.max_attempts:
+                db.execute("UPDATE jobs SET status = 'failed', worker = NULL, updated = ?, "
+                           "error = ? WHERE id = ?",
+                           (now, f"lease expired {job['attempts']} times (last worker {job['worker']})", job["id"]))
+            else:
+                db.execute("UPDATE jobs SET status = 'queued', worker = NULL, lease_until = NULL, updated = ? "
+                           "WHERE id = ?", (now, job["id"]))
+            print(f"[QUEUE] Job {job['id']}: lease of {job['worker']} expired")
+        return len(expired)
+
+    def requeue_expired(self) -> int:
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            return self._requeue_expired(db, time.time())
+
+    def claim(self, worker: str) -> dict | None:
+        """Lease the oldest queued job to `worker`"""
+        now = time.time()
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            self._requeue_expired(db, now)
+            job = db.execute("SELECT id, payload, attempts FROM jobs WHERE status = 'queued' "
+                             "ORDER BY id LIMIT 1").fetchone()
+            if job is None:
+                return None
+            db.execute("UPDATE jobs SET status = 'leased', worker = ?, lease_until = ?, attempts = attempts + 1, "
+                       "updated = ? WHERE id = ?", (worker, now + self.lease_s, now, job["id"]))
+            return {"id": job["id"], "payload": json.loads(job["payload"]), "attempts": job["attempts"] + 1}
+
+    def heartbeat(self, job_id: int, worker: str) -> bool:
+        """Extend the lease; False if `worker` no longer holds it"""
+        now = time.time()
+        with self._connect() as db:
+            return db.execute("UPDATE jobs SET lease_until = ?, updated = ? "
+                              "WHERE id = ? AND worker = ? AND status = 'leased'",
+                              (now + self.lease_s, now, job_id, worker)).rowcount == 1
+
+    def complete(self, job_id: int, worker: str, output: str, result: dict = None) -> bool:
+        with self._connect() as db:
+            return db.execute("UPDATE jobs SET status = 'done', output = ?, result = ?, lease_until = NULL, "
+                              "updated = ? WHERE id = ? AND worker = ? AND status = 'leased'",
+                              (output, json.dumps(result or {}, ensure_ascii=False), time.time(),
+                               job_id, worker)).rowcount == 1
+
+    def fail(self, job_id: int, worker: str, error: str, result: dict = None, retry: bool = True) -> bool:
+        """Record a failed render; the job is queued again while it has attempts left"""
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            job = db.execute("SELECT attempts FROM jobs WHERE id = ? AND worker = ? AND status = 'leased'",
+                             (job_id, worker)).fetchone()
+            if job is None:
+                return False
+            status = "queued" if retry and job["attempts"] < self.max_attempts else "failed"
+            db.execute("UPDATE jobs SET status = ?, worker = NULL, lease_until = NULL, error = ?, result = ?, "
+                       "updated = ? WHERE id = ?",
+                       (status, error, json.dumps(result or {}, ensure_ascii=False), time.time(), job_id))
+            return True
+
+    def jobs(self, ids: list[int] = None) -> list[dict]:
+        with self._connect() as db:
+            rows = db.execute("SELECT * FROM jobs ORDER BY id").fetchall()
+        jobs = [dict(row, payload=json.loads(row["payload"]),
+                     result=json.loads(row["result"]) if row["result"] else None) for row in rows]
+        return jobs if ids is None else [job for job in jobs if job["id"] in set(ids)]
+
+    def counts(self) -> dict:
+        with self._connect() as db:
+            return dict(db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+
+    def wait(self, ids: list[int], poll_s: float = None):
+        """Yield each job of `ids` once it is done or failed, requeueing expired leases meanwhile"""
+        poll_s = poll_s or config.QUEUE["poll_s"]
+        pending = set(ids)
+        while pending:
+            self.requeue_expired()
+            for job in self.jobs(sorted(pending)):
+                if job["status"] in ("done", "failed"):
+                    pending.discard(job["id"])
+                    yield job
+            if pending:
+                time.sleep(poll_s)
+
+
+class _Transaction:
+    """Connection context: COMMIT (or ROLLBACK on error) any open transaction, then close"""
+
+    def __init__(self, db):
+        self.db = db
+
+    def __enter__(self):
+        return self.db
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.db.in_transaction:
+            self.db.execute("ROLLBACK" if exc_type else "COMMIT")
+        self.db.close()
+
+
+def _heartbeat(queue: RenderQueue, job_id: int, worker: str, stop: threading.Event, interval: float):
+    while not stop.wait(interval):
+        try:
+            if not queue.heartbeat(job_id, worker):
+                print(f"[QUEUE] Lost the lease on job {job_id}; its result will be discarded")
+                return
+        except sqlite3.Error as e:
+            print(f"[WARN] Heartbeat for job {job_id} failed: {e}")
+
+
+def render_job(payload: dict) -> tuple[str | None, dict]:
+    """Default job runner: one scene (or render plan) through main.render_scene"""
+    from main import render_scene
+    plan = None
+    if payload.get("plan"):
+        from scene_plan import load_plan
+        plan = load_plan(payload["plan"])
+    video_path, report, thumbnail_jobs = render_scene(
+        payload["scene"], payload["index"], payload["total"], payload["timestamp"],
+        want_thumbnails=payload.get("thumbnails", False), preview=payload.get("preview", False), plan=plan
+    )
+    report["thumbnail_jobs"] = [dict(job, images=[str(p) for p in job["images"]]) for job in thumbnail_jobs or []]
+    return video_path, report
+
+
+def run_worker(path: str | Path = None, worker: str = None, render=render_job, idle_exit_s: float = None,
+               heartbeat_s: float = None, poll_s: float = None, lease_s: float = None) -> int:
+    """
+    Claim and render jobs until idle for idle_exit_s (default QUEUE["idle_exit_s"],
+    None = forever). render(payload) -> (output path or None, report dict).
+    Returns the number of jobs completed.
+    """
+    queue = RenderQueue(path, lease_s)
+    worker = worker or worker_id()
+    idle_exit_s = config.QUEUE["idle_exit_s"] if idle_exit_s is None else idle_exit_s
+    heartbeat_s = heartbeat_s or config.QUEUE["heartbeat_s"]
+    poll_s = poll_s or config.QUEUE["poll_s"]
+    print(f"[QUEUE] Worker {worker} on {queue.path}")
+
+    done, idle_since = 0, time.time()
+    while True:
+        job = queue.claim(worker)
+        if job is None:
+            if idle_exit_s is not None and time.time() - idle_since >= idle_exit_s:
+                print(f"[QUEUE] Worker {worker}: no work for {idle_exit_s:g}s, exiting ({done} jobs done)")
+                return done
+            time.sleep(poll_s)
+            continue
+
+        print(f"[QUEUE] Worker {worker} claimed job {job['id']} (attempt {job['attempts']})")
+        stop = threading.Event()
+        beat = threading.Thread(target=_heartbeat, args=(queue, job["id"], worker, stop, heartbeat_s), daemon=True)
+        beat.start()
+        try:
+            output, report = render(job["payload"])
+        except Exception as e:
+            output, report = None, {"stage": "worker", "error": str(e)}
+        finally:
+            stop.set()
+            beat.join()
+
+        report["worker"] = worker
+        if output:
+            kept = queue.complete(job["id"], worker, str(output), report)
+            done += kept
+        else:
+            kept = queue.fail(job["id"], worker, f"{report.get('stage')}: {report.get('error')}", report)
+        if not kept:
+            print(f"[QUEUE] Job {job['id']} was requeued while rendering; result discarded")
+        idle_since = time.time()
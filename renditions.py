@@ -0,0 +1,99 @@
+"""Output renditions of one composition
+Spec strings: "<W>:<H>_<FILL|FIT>[@<short edge>]", e.g.
+    "9:16_FILL"        1080x1920, the composition itself
+    "9:16_FILL@720"    720x1280 preview
+    "1:1_FILL@1080"    1080x1080 centre crop
+    "16:9_FIT@1080"    1920x1080, whole frame pillarboxed
+FILL crops to the target aspect, FIT scales the whole frame and pads.
+"""
+
+from pathlib import Path
+import re
+import config
+
+_SPEC = re.compile(r"^\s*(\d+):(\d+)(?:_(FILL|FIT))?(?:@(\d+))?\s*$", re.IGNORECASE)
+
+
+def parse_rendition(spec: str) -> dict:
+    """Spec string -> {"spec", "aspect": (w, h), "mode", "size": (width, height)}"""
+    m = _SPEC.match(spec)
+    if not m:
+        raise ValueError(f"Invalid rendition '{spec}' (expected e.g. 9:16_FILL@1080)")
+    aw, ah = int(m.group(1)), int(m.group(2))
+    mode = (m.group(3) or "FILL").lower()
+    short = int(m.group(4) or min(config.VIDEO_WIDTH, config.VIDEO_HEIGHT))
+
+    def even(x):
+        return max(2, int(round(x / 2)) * 2)
+
+    if aw <= ah:
+        size = (even(short), even(short * ah / aw))
+    else:
+        size = (even(short * aw / ah), even(short))
+    return {"spec": spec.strip(), "aspect": (aw, ah), "mode": mode, "size": size}
+
+
+def rendition_filter(rendition: dict, src_size: tuple[int, int]) -> str:
+    """ffmpeg filter taking the composed frame to this rendition ("null" if identical)"""
+    sw, sh = src_size
+    w, h = rendition["size"]
+    if (w, h) == (sw, sh):
+        return "null"
+    if rendition["mode"] == "fit":
+        return (f"scale={w}:{h}:force_original_aspect_ratio=decrease,"
+                f"pad={w}:{h}:(ow-iw)/2:(oh-ih)/2:color=black,setsar=1")
+    aw, ah = rendition["aspect"]
+    if sw * ah > sh * aw:      # source is wider: crop the sides
+        cw, ch = int(sh * aw / ah) // 2 * 2, sh
+    else:                      # source is taller: crop top and bottom
+        cw, ch = sw, int(sw * ah / aw) // 2 * 2
+    crop = f"crop={cw}:{ch}" if (cw, ch) != (sw, sh) else ""
+    scale = f"scale={w}:{h}" if (cw, ch) != (w, h) else ""
+    return ",".join(f for f in (crop, scale, "setsar=1") if f)
+
+
+def rendition_bitrate(rendition: dict) -> str:
+    """OUTPUT["bitrate_k"] is for 1080x1920; other sizes scale by pixel count"""
+    w, h = rendition["size"]
+    kbps = config.OUTPUT["bitrate_k"] * (w * h) / (config.VIDEO_WIDTH * config.VIDEO_HEIGHT)
+    return f"{max(config.OUTPUT['min_bitrate_k'], int(kbps))}k"
+
+
+def plan_outputs(output_path: str | Path, aspect_ratio: str = None, extra: list[str] = None,
+                 src_size: tuple[int, int] = None) -> list[dict]:
+    """
+    Encoder outputs for one scene: the primary rendition (the story's
+    aspect_ratio) at output_path, then every extra rendition as
+    <stem>_<width>x<height>.mp4 (<stem>_<width>x<height>_fit.mp4 for FIT).
+    Duplicates are dropped; invalid specs are skipped with a warning, and an
+    invalid aspect_ratio falls back to OUTPUT["aspect_ratio"].
+    """
+    src_size = src_size or (config.VIDEO_WIDTH, config.VIDEO_HEIGHT)
+    output_path = Path(output_path)
+    specs = [aspect_ratio or config.OUTPUT["aspect_ratio"]]
+    specs += config.OUTPUT["renditions"] if extra is None else extra
+
+    outputs, seen = [], set()
+    for i, spec in enumerate(specs):
+        try:
+            rendition = parse_rendition(spec)
+        except ValueError as e:
+            if i > 0:
+                print(f"[WARN] {e} - skipping this rendition")
+                continue
+            print(f"[WARN] {e} - using {config.OUTPUT['aspect_ratio']}")
+            rendition = parse_rendition(config.OUTPUT["aspect_ratio"])
+        w, h = rendition["size"]
+        suffix = "_fit" if rendition["mode"] == "fit" else ""
+        path = output_path if i == 0 else output_path.with_name(f"{output_path.stem}_{w}x{h}{suffix}.mp4")
+        key = (rendition["size"], rendition["mode"])
+        if key in seen or str(path) in seen:
+            continue
+        seen.update((key, str(path)))
+        outputs.append({
+            **rendition,
+            "path": str(path),
+            "filter": rendition_filter(rendition, src_size),
+            "bitrate": rendition_bitrate(rendition)
+        })
+    return outputs
@@ -0,0 +1,98 @@
+"""Render plans on disk
+--plan-only does the network-heavy stages (script, translation, TTS, image
+search, music) and writes one compact plan per scene; --render-plan executes
+plans, so planning and rendering can run on different machines.
+
+    plans/
+        <output stem>.plan.json
+        assets/<sha1><ext>        images and the mixed soundtrack, by content hash
+
+A plan (see video_compose.plan_video) holds the sentence / word timings,
+the encode profile and the scene itself (for thumbnails, upload metadata
+and reports). Asset paths are stored relative to the plan file; load_plan()
+resolves them and checks each file against its hash.
+
+Layer geometry is not in the plan: the render machine compiles the layout
+from its own config (LAYOUT["template"], the text styles) at the plan's
+spec["scale"]. "layout" is the name it was planned with, for reference only.
+"""
+
+from pathlib import Path
+import hashlib
+import json
+import os
+import shutil
+
+PLAN_VERSION = 1
+PLAN_SUFFIX = ".plan.json"
+
+
+def file_sha1(path: str | Path) -> str:
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def store_asset(path: str | Path, plan_dir: str | Path) -> str:
+    """Copy (or hard-link) a file into plan_dir/assets by hash; returns its path relative to plan_dir"""
+    path = Path(path)
+    rel = Path("assets") / f"{file_sha1(path)}{path.suffix.lower()}"
+    target = Path(plan_dir) / rel
+    if not target.exists():
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(path, target)
+        except OSError:
+            shutil.copyfile(path, target)
+    return rel.as_posix()
+
+
+def write_plan(plan: dict, scene: dict, plan_dir: str | Path) -> Path:
+    """Write a plan from plan_video() with its assets; returns the plan file"""
+    plan_dir = Path(plan_dir)
+    plan = dict(plan, version=PLAN_VERSION, scene=scene)
+    plan["spec"] = dict(plan["spec"], images=[store_asset(p, plan_dir) for p in plan["spec"]["images"]])
+    plan["audio"] = store_asset(plan["audio"], plan_dir)
+    plan["output"] = Path(plan["output"]).name
+
+    path = plan_dir / (Path(plan["output"]).stem + PLAN_SUFFIX)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(plan, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+    return path
+
+
+def load_plan(path: str | Path, verify: bool = True) -> dict:
+    """
+    Read a plan with absolute asset paths (its own file as "path"); raises
+    ValueError if it is stale or an asset is missing
+    """
+    path = Path(path)
+    with open(path, "r", encoding="utf-8") as f:
+        plan = json.load(f)
+    if plan.get("version") != PLAN_VERSION:
+        raise ValueError(f"{path.name}: plan version {plan.get('version')} (expected {PLAN_VERSION})")
+
+    def resolve(rel):
+        asset = path.parent / rel
+        if not asset.exists():
+            raise ValueError(f"{path.name}: missing asset {rel}")
+        if verify and file_sha1(asset) != Path(rel).stem:
+            raise ValueError(f"{path.name}: asset {rel} does not match its hash")
+        return str(asset)
+
+    plan["spec"]["images"] = [resolve(rel) for rel in plan["spec"]["images"]]
+    plan["audio"] = resolve(plan["audio"])
+    plan["path"] = str(path.resolve())
+    return plan
+
+
+def find_plans(paths: list[str | Path]) -> list[Path]:
+    """Plan files named on the command line; directories are searched for *.plan.json"""
+    found = []
+    for path in map(Path, paths):
+        found += sorted(path.glob("*" + PLAN_SUFFIX)) if path.is_dir() else [path]
+    return found
@@ -1,7 +1,18 @@
-"""English script generation + Hindi translation"""
+"""English script generation + Hindi translation
+Translation backends, tried in the order of config.TRANSLATION["backends"]:
+    google      deep_translator, then googletrans (network)
+    argos       Argos Translate with an installed en->hi model (offline)
+    phrasebook  JSON phrasebook, longest-phrase match (offline, always available)
+translate_many() translates a whole batch of scripts per backend call.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+import json
+import re
+import config
 
-from googletrans import Translator   # ← This line is correct
-from typing import Tuple
 
 def build_english_script(data: dict) -> str:
     parts = [
@@ -11,17 +22,160 @@ def build_english_script(data: dict) -> str:
     ]
     return "\n".join(filter(None, parts)).strip()
 
-from deep_translator import GoogleTranslator
 
-def translate_to_hindi(text: str) -> str:
-    try:
-        translator = GoogleTranslator(source='auto', target='hi')
-        return translator.translate(text)
-    except Exception as e:
-        print(f"Deep-translator failed: {e}")
-        # Fallback to original googletrans
-        from googletrans import Translator
+class TranslationBackend:
+    """Interface: translate_batch(texts) -> one str or Exception per text"""
+
+    name = "base"
+
+    def available(self) -> bool:
+        return True
+
+    def translate_batch(self, texts: list[str]) -> list:
+        raise NotImplementedError
+
+
+class GoogleBackend(TranslationBackend):
+    name = "google"
+
+    def translate_one(self, text):
+        # Translators are imported on first use; they are slow to import
         try:
+            from deep_translator import GoogleTranslator
+            return GoogleTranslator(source='auto', target='hi').translate(text)
+        except Exception as e:
+            print(f"Deep-translator failed: {e}")
+            # Fallback to original googletrans
+            from googletrans import Translator
             return Translator().translate(text, dest="hi").text
-        except:
-            return text
\ No newline at end of file
+
+    def translate_batch(self, texts):
+        def run(text):
+            try:
+                return self.translate_one(text)
+            except Exception as e:
+                return e
+
+        # Network-bound: overlap the round trips instead of paying them one by one
+        workers = max(1, min(config.TRANSLATION["google_workers"], len(texts)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(run, texts))
+
+
+class ArgosBackend(TranslationBackend):
+    name = "argos"
+
+    def available(self):
+        try:
+            from argostranslate import translate
+        except ImportError:
+            return False
+        codes = {lang.code for lang in translate.get_installed_languages()}
+        return {"en", "hi"} <= codes
+
+    def translate_batch(self, texts):
+        from argostranslate import translate
+        results = []
+        for text in texts:   # model is loaded once, then reused for every text
+            try:
+                results.append(translate.translate(text, "en", "hi"))
+            except Exception as e:
+                results.append(e)
+        return results
+
+
+class PhrasebookBackend(TranslationBackend):
+    """Greedy longest-phrase lookup. Words that are not in the book stay English."""
+
+    name = "phrasebook"
+
+    def available(self):
+        return Path(config.TRANSLATION["phrasebook"]).exists()
+
+    def translate_batch(self, texts):
+        book, longest = load_phrasebook(config.TRANSLATION["phrasebook"])
+        results = []
+        for text in texts:
+            lines, known, total = [], 0, 0
+            for line in text.split("\n"):
+                out, k, n = self._translate_line(line, book, longest)
+                lines.append(out)
+                known, total = known + k, total + n
+            coverage = known / total if total else 1.0
+            if coverage < config.TRANSLATION["phrasebook_min_coverage"]:
+                results.append(ValueError(f"phrasebook covers only {coverage:.0%} of the words"))
+            else:
+                results.append("\n".join(lines))
+        return results
+
+    @staticmethod
+    def _translate_line(line, book, longest):
+        out, known, total = [], 0, 0
+        for sentence in re.split(r"(?<=[.!?])\s+", line.strip()):
+            tokens = re.findall(r"[\w'’-]+|[^\w\s]", sentence)
+            words = [t.lower() for t in tokens]
+            i = 0
+            while i < len(tokens):
+                if not re.match(r"\w", tokens[i]):
+                    out.append("।" if tokens[i] == "." else tokens[i])
+                    i += 1
+                    continue
+                for n in range(min(longest, len(tokens) - i), 0, -1):
+                    phrase = " ".join(words[i:i + n])
+                    if phrase in book:
+                        if book[phrase]:
+                            out.append(book[phrase])
+                        known, total, i = known + n, total + n, i + n
+                        break
+                else:
+                    out.append(tokens[i])
+                    total, i = total + 1, i + 1
+        text = re.sub(r"\s+([।,!?])", r"\1", " ".join(out))
+        return re.sub(r"।+", "।", text), known, total
+
+
+@lru_cache(maxsize=4)
+def load_phrasebook(path: str):
+    """{english phrase (lowercase): hindi}, plus the longest phrase length in words"""
+    with open(path, "r", encoding="utf-8") as f:
+        book = {k.lower(): v for k, v in json.load(f).items()}
+    return book, max((len(k.split()) for k in book), default=1)
+
+
+BACKENDS = {cls.name: cls for cls in (GoogleBackend, ArgosBackend, PhrasebookBackend)}
+
+
+def translate_many(texts: list[str], backends: list[str] = None) -> list[str]:
+    """
+    Translate a batch of scripts to Hindi.
+    Each backend gets every text the previous ones could not translate.
+    Texts no backend could handle stay English (with a warning per text).
+    """
+    results = [None] * len(texts)
+    pending = list(range(len(texts)))
+
+    for name in backends or config.TRANSLATION["backends"]:
+        if not pending:
+            break
+        backend = BACKENDS[name]()
+        if not backend.available():
+            continue
+        batch = backend.translate_batch([texts[i] for i in pending])
+        still_pending = []
+        for i, result in zip(pending, batch):
+            if isinstance(result, Exception) or not result:
+                still_pending.append(i)
+            else:
+                results[i] = result
+        if len(still_pending) < len(pending):
+            print(f"[TRANSLATE] {len(pending) - len(still_pending)}/{len(texts)} script(s) via {name}")
+        pending = still_pending
+
+    for i in pending:
+        print(f"[WARN] No translation backend could translate script {i + 1}; using English")
+        results[i] = texts[i]
+    return results
+
+
+def translate_to_hindi(text: str) -> str:
+    return translate_many([text])[0]
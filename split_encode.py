@@ -0,0 +1,112 @@
+"""Split encoding of one video
+The timeline is cut into N chunks on keyframe boundaries (multiples of the
+GOP, OUTPUT["keyframe_s"]). Each chunk is composed and encoded by its own
+process with a fixed GOP and no scene-cut keyframes, so every chunk starts
+on the keyframe the full encode would have put there. The chunks of each
+rendition are then joined by the ffmpeg concat demuxer without re-encoding,
+and the finished audio track is muxed once over the result.
+"""
+
+from pathlib import Path
+import math
+import os
+import shutil
+import time
+import config
+from ffmpeg_tools import concat_videos, encode_video, filter_path
+from frame_parallel import frame_times
+from frame_writer import pipe_format, render_frames
+
+
+def chunk_ranges(total_frames: int, gop: int, chunks: int) -> list[tuple[int, int]]:
+    """[start, end) frame ranges, every start a multiple of gop"""
+    gops = max(1, math.ceil(total_frames / gop))
+    n = max(1, min(chunks, gops))
+    bounds = [min(total_frames, round(k * gops / n) * gop) for k in range(n + 1)]
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if end > start]
+
+
+def _encode_chunk(spec, fps, first, last, outputs, subtitles, preset, gop, threads, assets):
+    import asset_pool
+    asset_pool.attach(assets)
+    from video_compose import compose_scene
+
+    start = time.time()
+    clip, owned, _ = compose_scene(spec)
+    pre_filter = None
+    if subtitles:
+        # libass needs the chunk's frames at their real timestamps
+        offset = first / fps
+        pre_filter = f"setpts=PTS+{offset:.6f}/TB,subtitles={filter_path(subtitles)},setpts=PTS-STARTPTS"
+    try:
+        encode_video(
+            render_frames(clip, frame_times(spec["duration"], fps)[first:last]),
+            clip.size, fps, outputs, pre_filter=pre_filter, preset=preset, gop=gop, threads=threads,
+            pix_fmt=pipe_format()
+        )
+    finally:
+        for c in reversed(owned):
+            c.close()
+    return time.time() - start
+
+
+def _encode_whole(spec, fps, outputs, audio_path, subtitles, preset):
+    from video_compose import compose_scene
+    clip, owned, _ = compose_scene(spec)
+    try:
+        encode_video(
+            render_frames(clip, frame_times(spec["duration"], fps)),
+            clip.size, fps, outputs, audio_path=audio_path,
+            pre_filter=f"subtitles={filter_path(subtitles)}" if subtitles else None, preset=preset,
+            pix_fmt=pipe_format()
+        )
+    finally:
+        for c in reversed(owned):
+            c.close()
+    return [out["path"] for out in outputs]
+
+
+def split_encode(spec: dict, fps: float, outputs: list[dict], audio_path: str | Path = None,
+                 chunks: int = 2, subtitles: str | Path = None, preset: str = "medium") -> list[str]:
+    """
+    Render compose_scene(spec) to every output ({"path", "filter", "bitrate"},
+    see renditions.plan_outputs) in `chunks` parallel processes. subtitles is
+    an ASS file to burn in with libass.
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    from asset_pool import get_pool
+    from layout import get_plan
+
+    get_plan(spec["scale"])   # publish the plan bitmaps before the workers attach
+    gop = max(1, round(fps * config.OUTPUT["keyframe_s"]))
+    ranges = chunk_ranges(len(frame_times(spec["duration"], fps)), gop, chunks)
+    if len(ranges) <= 1:
+        # One GOP or less: nothing to split, compose and encode here
+        return _encode_whole(spec, fps, outputs, audio_path, subtitles, preset)
+    threads = max(1, (os.cpu_count() or 1) // len(ranges))
+    work_dir = Path(outputs[0]["path"]).with_suffix(".chunks")
+    work_dir.mkdir(parents=True, exist_ok=True)
+
+    chunk_outputs = [
+        [{**out, "path": str(work_dir / f"chunk_{c:03d}_{r}.mp4")} for r, out in enumerate(outputs)]
+        for c in range(len(ranges))
+    ]
+    print(f"[SPLIT] {len(ranges)} chunks of {', '.join(str(end - start) for start, end in ranges)} frames (GOP {gop})")
+
+    try:
+        with ProcessPoolExecutor(max_workers=len(ranges), max_tasks_per_child=1,
+                                 mp_context=multiprocessing.get_context("spawn")) as pool:
+            futures = [
+                pool.submit(_encode_chunk, spec, fps, first, last, chunk_outputs[c], subtitles and str(subtitles),
+                            preset, gop, threads, get_pool().handle())
+                for c, (first, last) in enumerate(ranges)
+            ]
+            for c, future in enumerate(futures):
+                print(f"[SPLIT] Chunk {c + 1}/{len(ranges)} encoded in {future.result():.1f}s")
+
+        for r, out in enumerate(outputs):
+            concat_videos([parts[r]["path"] for parts in chunk_outputs], out["path"], audio_path)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return [out["path"] for out in outputs]
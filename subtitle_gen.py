@@ -1,32 +1,115 @@
-# Subtitle generator 
-"""Very basic subtitle generator — equal duration splits"""
+# Subtitle generator
+"""Subtitle files from the aligned timings (alignment.get_timings)
+- SRT: one cue per sentence (YouTube caption track)
+- ASS: one line per sentence with {\\k} karaoke word highlighting, styled from
+  config.SUBTITLE, for burning in with ffmpeg's libass `subtitles` filter
+"""
 
 from pathlib import Path
+import config
+
+
+def _srt_time(t: float) -> str:
+    ms = int(round(t * 1000))   # round once, so 1.9996 carries into the seconds
+    return f"{ms // 3600000:02d}:{ms // 60000 % 60:02d}:{ms // 1000 % 60:02d},{ms % 1000:03d}"
+
+
+def _ass_time(t: float) -> str:
+    cs = int(round(t * 100))
+    return f"{cs // 360000}:{cs // 6000 % 60:02d}:{cs // 100 % 60:02d}.{cs % 100:02d}"
+
+
+def _ass_color(color, opacity: float = 1.0) -> str:
+    """Color name / (r, g, b) -> ASS &HAABBGGRR (alpha 00 = opaque)"""
+    if isinstance(color, str):
+        from PIL import ImageColor
+        color = ImageColor.getrgb(color)
+    r, g, b = color[:3]
+    alpha = int(round((1 - opacity) * 255))
+    return f"&H{alpha:02X}{b:02X}{g:02X}{r:02X}"
+
+
+def _ass_text(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("{", "(").replace("}", ")").replace("\n", " ")
+
+
+def write_srt(timings: dict, out_path: str | Path) -> str:
+    """Sentence cues from timings["sentences"]"""
+    path = Path(out_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for i, (start, end, text) in enumerate(timings["sentences"], 1):
+            f.write(f"{i}\n{_srt_time(start)} --> {_srt_time(end)}\n{text.strip()}\n\n")
+    return str(path)
+
+
+def write_ass(timings: dict, out_path: str | Path, width: int = None, height: int = None) -> str:
+    """
+    Karaoke ASS: each sentence is one event, each word a {\\k} syllable, so
+    libass switches the word to highlight_color exactly when it is spoken.
+    """
+    width = width or config.VIDEO_WIDTH
+    height = height or config.VIDEO_HEIGHT
+    style = config.SUBTITLE
+    scale = height / config.VIDEO_HEIGHT
+
+    font = style["font"]
+    bold = -1 if font.lower().endswith("-bold") else 0
+    font = font[:-5] if bold else font
+    boxed = style["background_opacity"] > 0
+    margin_top = round((config.VIDEO_HEIGHT - style["position_y_offset"]) * scale)
+
+    lines = [
+        "[Script Info]",
+        "ScriptType: v4.00+",
+        f"PlayResX: {width}",
+        f"PlayResY: {height}",
+        "WrapStyle: 0",
+        "ScaledBorderAndShadow: yes",
+        "",
+        "[V4+ Styles]",
+        "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, "
+        "Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, "
+        "Shadow, Alignment, MarginL, MarginR, MarginV, Encoding",
+        # Primary = already spoken (highlight), Secondary = not yet spoken
+        f"Style: Karaoke,{font},{round(style['fontsize'] * scale)},"
+        f"{_ass_color(style['highlight_color'])},{_ass_color(style['color'])},"
+        f"{_ass_color(style['stroke_color'])},"
+        f"{_ass_color(style['background_color'], style['background_opacity'] if boxed else 0)},"
+        f"{bold},0,0,0,100,100,0,0,{3 if boxed else 1},{style['stroke_width'] * scale:g},0,8,"
+        f"{round(50 * scale)},{round(50 * scale)},{margin_top},1",
+        "",
+        "[Events]",
+        "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text",
+    ]
+
+    words = timings["words"]
+    w = 0
+    for start, end, sentence in timings["sentences"]:
+        parts, cursor = [], start
+        while w < len(words) and words[w][0] < end:
+            w_start, w_end, word = words[w]
+            if w_start > cursor:
+                parts.append(f"{{\\k{round((w_start - cursor) * 100)}}}")
+            w_end = min(w_end, end)
+            parts.append(f"{{\\k{max(1, round((w_end - max(w_start, cursor)) * 100))}}}{_ass_text(word)} ")
+            cursor = max(cursor, w_end)
+            w += 1
+        text = "".join(parts).rstrip() or _ass_text(sentence)
+        lines.append(f"Dialogue: 0,{_ass_time(start)},{_ass_time(end)},Karaoke,,0,0,0,,{text}")
+
+    path = Path(out_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
 
 def create_simple_srt(text: str, duration_sec: float, out_path: str = "temp/subtitles.srt") -> str:
+    """Equal-duration line cues, for when no audio timings are available"""
     lines = [l.strip() for l in text.split("\n") if l.strip()]
     if not lines:
         return ""
 
-    path = Path(out_path)
-    path.parent.mkdir(parents=True, exist_ok=True)
-
     time_per_line = duration_sec / max(1, len(lines))
-
-    with open(path, "w", encoding="utf-8") as f:
-        for i, line in enumerate(lines, 1):
-            start_sec = (i-1) * time_per_line
-            end_sec   = i * time_per_line
-
-            def fmt(t):
-                h = int(t // 3600)
-                m = int((t % 3600) // 60)
-                s = int(t % 60)
-                ms = int((t % 1) * 1000)
-                return f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
-
-            f.write(f"{i}\n")
-            f.write(f"{fmt(start_sec)} --> {fmt(end_sec)}\n")
-            f.write(f"{line}\n\n")
-
-    return str(path)
\ No newline at end of file
+    sentences = [[(i - 1) * time_per_line, i * time_per_line, line] for i, line in enumerate(lines, 1)]
+    return write_srt({"sentences": sentences, "words": []}, out_path)
@@ -0,0 +1,82 @@
+# test_alignment.py
+# Tests audio-driven subtitle timing on synthetic speech: tone bursts separated by silences
+# Run alone (python test_alignment.py) or with pytest - no TTS, the "voice" is generated
+
+import numpy as np
+from alignment import align, speech_mask
+
+RATE = 16000
+
+
+def _voice(bursts, duration):
+    """Tone bursts at (start, end) seconds over faint noise"""
+    t = np.arange(int(duration * RATE)) / RATE
+    voice = np.random.default_rng(0).normal(0, 0.002, t.size).astype(np.float32)
+    for start, end in bursts:
+        on = (t >= start) & (t < end)
+        voice[on] += 0.5 * np.sin(2 * np.pi * 220 * t[on])
+    return voice
+
+
+# Sentence 1 has a 50 ms gap (too short to be a pause), sentence 3 a 200 ms one
+BURSTS = [(0.2, 0.6), (0.65, 1.0), (1.6, 2.4), (2.9, 3.5), (3.7, 4.0)]
+TEXT = "One two three. Hi elephant. Six seven eight."
+
+
+def _check_order(timings):
+    words = timings["words"]
+    assert all(a[0] <= a[1] <= b[0] + 1e-6 for a, b in zip(words, words[1:]))
+    for start, end, _ in timings["sentences"]:
+        assert start < end
+
+
+def test_short_gaps_are_closed():
+    voiced, hop = speech_mask(_voice(BURSTS, 4.3), RATE)
+    frame_s = hop / RATE
+    assert voiced[int(0.62 / frame_s)]          # 50 ms gap bridged
+    assert not voiced[int(1.3 / frame_s)]       # 600 ms pause kept
+
+
+def test_longest_pauses_become_sentence_boundaries():
+    timings = align(_voice(BURSTS, 4.3), RATE, TEXT)
+    spans = [(s, e) for s, e, _ in timings["sentences"]]
+    expected = [(0.2, 1.0), (1.6, 2.4), (2.9, 4.0)]
+    assert len(spans) == 3
+    for (s, e), (es, ee) in zip(spans, expected):
+        assert abs(s - es) < 0.08 and abs(e - ee) < 0.08, spans
+    assert [w for _, _, w in timings["words"]] == TEXT.split()
+    _check_order(timings)
+
+    # Each word lies inside its sentence; more syllables take longer
+    words = iter(timings["words"])
+    for s, e, sentence in timings["sentences"]:
+        for _ in sentence.split():
+            ws, we, _ = next(words)
+            assert s - 1e-6 <= ws and we <= e + 1e-6
+    hi, elephant = timings["words"][3], timings["words"][4]
+    assert elephant[1] - elephant[0] > 2 * (hi[1] - hi[0])
+
+
+def test_fewer_pauses_than_sentences_splits_spans():
+    text = "One. Two. Three. Four."
+    timings = align(_voice([(0.2, 1.2), (1.8, 3.0)], 3.3), RATE, text)
+    assert [t for _, _, t in timings["sentences"]] == ["One.", "Two.", "Three.", "Four."]
+    _check_order(timings)
+    ends = [e for _, e, _ in timings["sentences"]]
+    assert ends == sorted(ends) and abs(ends[-1] - 3.0) < 0.08
+
+
+def test_silence_is_rejected():
+    try:
+        align(np.zeros(RATE, dtype=np.float32), RATE, TEXT)
+        raise AssertionError("silence should not align")
+    except ValueError:
+        pass
+
+
+if __name__ == "__main__":
+    test_short_gaps_are_closed()
+    test_longest_pauses_become_sentence_boundaries()
+    test_fewer_pauses_than_sentences_splits_spans()
+    test_silence_is_rejected()
+    print("[PASS] alignment")
@@ -0,0 +1,64 @@
+# test_asset_pool.py
+# Tests asset-pool lookups: hit / miss counts, read-only shared arrays and builds that do not block other keys
+# Run alone (python test_asset_pool.py) or with pytest - uses a private pool, not the process-wide one
+
+import threading
+import time
+import numpy as np
+from asset_pool import AssetPool, merge_stats
+
+
+def test_hits_misses_and_shared_arrays():
+    pool = AssetPool()
+    try:
+        assert pool.get("plan", 1, lambda: {"a": 1}) is pool.get("plan", 1, lambda: None)
+        arr = pool.array("solid", (2, 3), lambda: np.ones((2, 3), dtype=np.uint8))
+        assert not arr.flags.writeable and pool.handle()
+
+        worker = AssetPool(pool.handle())
+        shared = worker.array("solid", (2, 3), lambda: None)
+        assert (shared == 1).all()
+        worker.close()
+
+        stats = merge_stats(pool.snapshot())
+        assert stats["plan"]["hits"] == 1 and stats["plan"]["misses"] == 1
+        assert worker.stats["solid"]["shared"] == 1
+    finally:
+        pool.close()
+
+
+def test_slow_build_blocks_only_its_own_key():
+    pool = AssetPool()
+    pool.get("music", "cached", lambda: "track")
+    started, release, builds = threading.Event(), threading.Event(), []
+
+    def slow_build():
+        builds.append(1)
+        started.set()
+        release.wait(5)
+        return "plan"
+
+    waiters = [threading.Thread(target=pool.get, args=("plan", "slow", slow_build)) for _ in range(3)]
+    waiters[0].start()
+    assert started.wait(5)
+    for t in waiters[1:]:
+        t.start()
+    try:
+        # Hits and other builds go through while "slow" is still building
+        start = time.perf_counter()
+        assert pool.get("music", "cached", lambda: None) == "track"
+        assert pool.get("music", "other", lambda: "other track") == "other track"
+        assert time.perf_counter() - start < 1
+    finally:
+        release.set()
+        for t in waiters:
+            t.join(5)
+    # Threads that asked for the same key waited for the one build
+    assert builds == [1] and pool.get("plan", "slow", lambda: None) == "plan"
+    assert pool.stats["plan"] == {"hits": 3, "misses": 1, "shared": 0}
+
+
+if __name__ == "__main__":
+    test_hits_misses_and_shared_arrays()
+    test_slow_build_blocks_only_its_own_key()
+    print("[PASS] asset pool")
@@ -0,0 +1,65 @@
+# test_audio_mix.py
+# Tests the WSOLA speed-up and the music ducking gain on synthetic signals
+# Run alone (python test_audio_mix.py) or with pytest - nothing is decoded or encoded
+
+import numpy as np
+import config
+from audio_mix import duck_gain, time_stretch
+
+RATE = 16000
+
+
+def _sine(freq, seconds):
+    return np.sin(2 * np.pi * freq * np.arange(int(seconds * RATE)) / RATE).astype(np.float32)
+
+
+def _peak_hz(x):
+    spectrum = np.abs(np.fft.rfft(x * np.hanning(len(x))))
+    return np.argmax(spectrum) * RATE / len(x)
+
+
+def test_stretch_changes_length_not_pitch():
+    x = _sine(440, 2.0)
+    for speed in (1.2, 0.8, 1.5):
+        y = time_stretch(x, speed, RATE)
+        assert len(y) == round(len(x) / speed)
+        assert abs(_peak_hz(y) - 440) < 5, speed
+        # WSOLA keeps the waveform continuous: no dropouts in the steady tone
+        mid = y[len(y) // 4:3 * len(y) // 4]
+        assert abs(np.sqrt(np.mean(mid ** 2)) - np.sqrt(0.5)) < 0.05
+    assert np.array_equal(time_stretch(x, 1.0, RATE), x)
+
+
+def _reference_duck(voice, n):
+    """The per-frame loop duck_gain replaced"""
+    cfg = config.AUDIO
+    hop = int(RATE * 0.02)
+    frames = voice[:len(voice) // hop * hop].reshape(-1, hop)
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    threshold = max(1e-4, float(np.percentile(rms, 95)) * 0.1)
+    target = np.where(rms > threshold, 10 ** (cfg["duck_db"] / 20), 1.0)
+    attack = 1 - np.exp(-0.02 / (cfg["duck_attack_ms"] / 1000))
+    release = 1 - np.exp(-0.02 / (cfg["duck_release_ms"] / 1000))
+    gain, g = np.empty_like(target), 1.0
+    for i, t in enumerate(target):
+        g += (t - g) * (attack if t < g else release)
+        gain[i] = g
+    return np.interp(np.arange(n), (np.arange(len(gain)) + 0.5) * hop, gain)
+
+
+def test_duck_gain_drops_under_speech():
+    voice = np.concatenate([np.zeros(RATE), 0.5 * _sine(200, 1.5), np.zeros(RATE), 0.5 * _sine(200, 0.3),
+                            np.zeros(RATE)])
+    gain = duck_gain(voice, RATE, len(voice))
+    duck = 10 ** (config.AUDIO["duck_db"] / 20)
+    assert len(gain) == len(voice)
+    assert abs(gain[int(0.5 * RATE)] - 1.0) < 1e-3            # before speech
+    assert abs(gain[int(2.0 * RATE)] - duck) < 0.01            # well into speech
+    assert gain[int(3.4 * RATE)] > 0.95                        # released during the pause
+    assert np.allclose(gain, _reference_duck(voice, len(voice)), atol=1e-5)
+
+
+if __name__ == "__main__":
+    test_stretch_changes_length_not_pitch()
+    test_duck_gain_drops_under_speech()
+    print("[PASS] audio mix")
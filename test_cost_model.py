@@ -0,0 +1,43 @@
+# test_cost_model.py
+# Tests the render-time cost model fit and longest-first scheduling
+# Run alone (python test_cost_model.py) or with pytest - no rendering needed
+
+import random
+import config
+from cost_model import FEATURES, CostModel, lpt_schedule, makespan
+
+
+def test_fit_recovers_weights():
+    true = {"intercept": 3.0, "words": 0.2, "megapixels": 0.04, "encoded_mp": 0.01, "images": 0.5}
+    rng = random.Random(1)
+    history = []
+    for _ in range(40):
+        features = {"words": rng.randint(20, 200), "megapixels": rng.uniform(50, 1500),
+                    "encoded_mp": rng.uniform(50, 3000), "images": rng.randint(1, 8)}
+        seconds = true["intercept"] + sum(true[f] * features[f] for f in FEATURES)
+        history.append({"features": features, "seconds": seconds})
+
+    model = CostModel.fit(history)
+    assert model.records == 40
+    for name, weight in true.items():
+        assert abs(model.weights[name] - weight) < 1e-3, name
+
+
+def test_short_history_uses_defaults():
+    history = [{"features": {"words": 10}, "seconds": 5.0}] * (config.COST_MODEL["min_records"] - 1)
+    assert CostModel.fit(history).records == 0
+
+
+def test_longest_first_avoids_straggler():
+    costs = [2, 2, 2, 2, 2, 2, 12]   # the long scene comes last in the batch
+    order, predicted = lpt_schedule(costs, workers=2)
+    assert order[0] == 6
+    assert predicted == 12
+    assert makespan(costs, 2) == 18
+
+
+if __name__ == "__main__":
+    test_fit_recovers_weights()
+    test_short_history_uses_defaults()
+    test_longest_first_avoids_straggler()
+    print("[PASS] cost model")
@@ -0,0 +1,56 @@
+# test_frame_writer.py
+# Tests the NumPy rgb24 -> yuv420p pipe conversion against ffmpeg's own
+# Run alone (python test_frame_writer.py) or with pytest - needs MoviePy's ffmpeg binary
+
+import subprocess
+import numpy as np
+from moviepy.editor import CompositeVideoClip, ImageClip
+from ffmpeg_tools import ffmpeg_binary
+from frame_writer import RawFrameWriter
+
+W, H = 64, 48
+
+
+def _ffmpeg_yuv(rgb, sws_flags=None):
+    cmd = [ffmpeg_binary(), "-v", "error", "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{W}x{H}", "-i", "-"]
+    if sws_flags:
+        cmd += ["-sws_flags", sws_flags]
+    cmd += ["-f", "rawvideo", "-pix_fmt", "yuv420p", "-"]
+    out = subprocess.run(cmd, input=rgb.tobytes(), capture_output=True, check=True).stdout
+    return np.frombuffer(out, dtype=np.uint8).astype(np.int16)
+
+
+def _our_yuv(rgb):
+    clip = CompositeVideoClip([ImageClip(rgb).set_duration(1)], size=(W, H))
+    return RawFrameWriter(clip, "yuv420p").render(0).astype(np.int16)
+
+
+def _images():
+    y, x = np.mgrid[0:H, 0:W]
+    smooth = np.stack([x * 255 / W, y * 255 / H, (x + y) * 255 / (W + H)], -1).astype(np.uint8)
+    noise = np.random.default_rng(0).integers(0, 256, (H, W, 3), dtype=np.uint8)
+    return smooth, noise
+
+
+def test_matches_ffmpeg_area_conversion():
+    # Same matrix (BT.601 limited range), same 2x2 box chroma: at most 1 level of rounding apart
+    for rgb in _images():
+        ours, ref = _our_yuv(rgb), _ffmpeg_yuv(rgb, "area+accurate_rnd")
+        assert np.abs(ours - ref).max() <= 1
+
+
+def test_close_to_ffmpeg_default_conversion():
+    luma = W * H
+    smooth, noise = _images()
+    ours, ref = _our_yuv(smooth), _ffmpeg_yuv(smooth)
+    assert np.abs(ours - ref).max() <= 2
+    # Fine colour detail: only the chroma filter differs, luma does not
+    ours, ref = _our_yuv(noise), _ffmpeg_yuv(noise)
+    assert np.abs(ours[:luma] - ref[:luma]).max() <= 1
+    assert np.abs(ours[luma:] - ref[luma:]).mean() < 8
+
+
+if __name__ == "__main__":
+    test_matches_ffmpeg_area_conversion()
+    test_close_to_ffmpeg_default_conversion()
+    print("[PASS] frame writer")
@@ -0,0 +1,50 @@
+# test_image_hash.py
+# Tests near-duplicate detection and the persistent hash store across runs
+# Run alone (python test_image_hash.py) or with pytest - images are generated, nothing is downloaded
+
+from io import BytesIO
+from pathlib import Path
+import tempfile
+import numpy as np
+from PIL import Image
+from image_hash import PerceptualHashIndex
+
+
+def _jpeg(seed: int, size=(640, 480)) -> bytes:
+    """Smooth random 'photo', the same content at any size"""
+    pixels = np.random.default_rng(seed).integers(0, 256, (12, 16, 3), dtype=np.uint8)
+    buf = BytesIO()
+    Image.fromarray(pixels).resize(size, Image.BICUBIC).save(buf, "JPEG", quality=85)
+    return buf.getvalue()
+
+
+def test_near_duplicates_from_other_sources():
+    index = PerceptualHashIndex()
+    assert not index.check_and_add(_jpeg(1), "https://a/1.jpg")
+    assert index.check_and_add(_jpeg(1, (320, 240)), "https://b/1-large.jpg")   # same photo, other URL
+    assert not index.check_and_add(_jpeg(2), "https://a/2.jpg")
+    assert len(index) == 2
+
+
+def test_persistent_store_keeps_own_images():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = Path(tmp) / "hashes.npy"
+        first = PerceptualHashIndex(store_path=store)
+        assert not first.check_and_add(_jpeg(1), "https://a/1.jpg")
+        first.save()
+
+        # Re-running the scene fetches the same URL again: not a duplicate of itself
+        rerun = PerceptualHashIndex(store_path=store)
+        assert not rerun.check_and_add(_jpeg(1), "https://a/1.jpg")
+        assert rerun.check_and_add(_jpeg(1), "https://mirror/1.jpg")
+        assert len(rerun) == 1
+
+        # Stores written before sources were recorded still load
+        np.save(store, np.array([rerun._hashes[0]], dtype=np.uint64))
+        assert PerceptualHashIndex(store_path=store).check_and_add(_jpeg(1), "https://a/1.jpg")
+
+
+if __name__ == "__main__":
+    test_near_duplicates_from_other_sources()
+    test_persistent_store_keeps_own_images()
+    print("[PASS] image hash")
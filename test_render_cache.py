@@ -0,0 +1,107 @@
+# test_render_cache.py
+# Tests render-cache fingerprints, scene keys, restore by hard link / copy and garbage collection
+# Run alone (python test_render_cache.py) or with pytest - nothing is rendered
+
+from pathlib import Path
+import os
+import tempfile
+import time
+import config
+import render_cache
+
+
+def _plan(tmp):
+    image, audio = Path(tmp) / "a.jpg", Path(tmp) / "mix.m4a"
+    image.write_bytes(b"image")
+    audio.write_bytes(b"audio")
+    return {
+        "spec": {"images": [str(image)], "duration": 3.0, "timings": [], "scale": 1.0, "burn_in": False,
+                 "content": {"headline": "H", "hook": "K", "subscribe_hook": "S"}},
+        "layout": "default", "encode": {"fps": 30}, "audio": str(audio)
+    }
+
+
+def test_fingerprint_follows_assets_and_config():
+    with tempfile.TemporaryDirectory() as tmp:
+        plan = _plan(tmp)
+        key = render_cache.fingerprint(plan)
+        assert render_cache.fingerprint(plan) == key
+
+        Path(plan["spec"]["images"][0]).write_bytes(b"other image")
+        changed_asset = render_cache.fingerprint(plan)
+        assert changed_asset != key
+
+        old = config.SUBTITLE["fontsize"]
+        config.SUBTITLE["fontsize"] = old + 1
+        try:
+            assert render_cache.fingerprint(plan) != changed_asset
+        finally:
+            config.SUBTITLE["fontsize"] = old
+
+
+def test_store_restore_and_gc():
+    old = dict(config.RENDER_CACHE)
+    with tempfile.TemporaryDirectory() as tmp:
+        config.RENDER_CACHE["dir"] = str(Path(tmp) / "cache")
+        try:
+            video = Path(tmp) / "scene_run1.mp4"
+            video.write_bytes(b"x" * 1000)
+            assert not render_cache.restore("k1", [Path(tmp) / "scene_run2.mp4"])
+            render_cache.store("k1", [video])
+
+            for link in (True, False):
+                config.RENDER_CACHE["link"] = link
+                target = Path(tmp) / f"scene_link_{link}.mp4"
+                assert render_cache.restore("k1", [target])
+                assert target.read_bytes() == video.read_bytes()
+            assert not list(Path(tmp).glob("*.part"))
+
+            # A re-render to a linked output must not write through to the cache
+            render_cache.release([video])
+            video.write_bytes(b"new")
+            assert render_cache.restore("k1", [Path(tmp) / "check.mp4"])
+            assert (Path(tmp) / "check.mp4").read_bytes() == b"x" * 1000
+
+            render_cache.store("k2", [video])
+            stale = time.time() - 40 * 86400
+            os.utime(Path(config.RENDER_CACHE["dir"]) / "k1" / render_cache.ENTRY, (stale, stale))
+            assert render_cache.gc(max_age_days=30, max_mb=100)[0] == 1
+            assert [e["key"] for e in render_cache.entries()] == ["k2"]
+            assert render_cache.gc(max_age_days=30, max_mb=0)[0] == 1
+            assert render_cache.entries() == []
+        finally:
+            config.RENDER_CACHE.clear()
+            config.RENDER_CACHE.update(old)
+
+
+def test_scene_key_recalls_the_render():
+    old = dict(config.RENDER_CACHE)
+    with tempfile.TemporaryDirectory() as tmp:
+        config.RENDER_CACHE["dir"] = str(Path(tmp) / "cache")
+        try:
+            scene = {"headline": "H", "hook_text": "K", "subscribe_hook": "S"}
+            key = render_cache.scene_key(scene)
+            assert render_cache.scene_key(dict(scene)) == key
+            assert render_cache.scene_key(dict(scene, headline="Other")) != key
+            assert render_cache.recall(key) is None
+
+            video = Path(tmp) / "scene.mp4"
+            video.write_bytes(b"x" * 100)
+            render_cache.store("f1", [video])
+            render_cache.remember(key, "f1", {"encode": {"fps": 30}})
+            assert render_cache.recall(key) == {"key": "f1", "plan": {"encode": {"fps": 30}}}
+
+            # Once the render itself is collected, the scene key no longer resolves
+            assert render_cache.gc(max_age_days=30, max_mb=0)[0] == 1
+            assert render_cache.recall(key) is None
+            assert not list((Path(tmp) / "cache" / render_cache.SCENES).glob("*.json"))
+        finally:
+            config.RENDER_CACHE.clear()
+            config.RENDER_CACHE.update(old)
+
+
+if __name__ == "__main__":
+    test_fingerprint_follows_assets_and_config()
+    test_store_restore_and_gc()
+    test_scene_key_recalls_the_render()
+    print("[PASS] render cache")
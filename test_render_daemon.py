@@ -0,0 +1,88 @@
+# test_render_daemon.py
+# Tests the render daemon's HTTP API: submit, validation, job snapshots and event streams
+# Run alone (python test_render_daemon.py) or with pytest - process_single_scene is stubbed, nothing is rendered
+
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+import config
+import main
+import render_daemon
+
+SCENE = {"headline": "ok", "hook_text": "h", "details": "d", "subscribe_hook": "s"}
+
+
+def fake_process_single_scene(scene_data, on_progress=None, report=None, **kwargs):
+    for stage in ("script", "audio", "images", "video"):
+        on_progress(stage, stage)
+        time.sleep(0.01)
+    if scene_data["headline"] == "fail":
+        report.update(stage="video", error="boom")
+        return None
+    on_progress("done", "x.mp4")
+    return "x.mp4"
+
+
+def _start():
+    daemon = render_daemon.RenderDaemon()
+    threading.Thread(target=daemon.worker, daemon=True).start()
+    server = render_daemon.ThreadingHTTPServer(("127.0.0.1", 0), render_daemon.make_handler(daemon))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def _post(url, body):
+    req = urllib.request.Request(f"{url}/jobs", data=body.encode("utf-8"),
+                                 headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(req) as r:
+            return r.status, json.load(r)
+    except urllib.error.HTTPError as e:
+        return e.code, json.load(e)
+
+
+def _get(url, path):
+    with urllib.request.urlopen(url + path) as r:
+        return r.read()
+
+
+def test_submit_validation_and_snapshots():
+    old_process, old_thumbs, old_hosts = (main.process_single_scene, config.THUMBNAIL["enabled"],
+                                          config.DAEMON["warm_hosts"])
+    main.process_single_scene = fake_process_single_scene
+    config.THUMBNAIL["enabled"] = False
+    config.DAEMON["warm_hosts"] = []
+    server, url = _start()
+    try:
+        # Malformed bodies are rejected with a 400, nothing is queued
+        assert _post(url, "{not json")[0] == 400
+        assert _post(url, "[1]") == (400, {"error": "scene 1 is not a JSON object"})
+        status, body = _post(url, json.dumps([SCENE, {"headline": "x"}]))
+        assert status == 400 and "scene 2 missing fields" in body["error"]
+        assert json.loads(_get(url, "/jobs")) == []
+
+        status, body = _post(url, json.dumps([SCENE, dict(SCENE, headline="fail")]))
+        assert status == 202 and body == {"jobs": ["1", "2"]}
+
+        # Each event stream ends with the job's outcome
+        events = [json.loads(line) for line in _get(url, "/jobs/1/events").splitlines()]
+        assert [e["stage"] for e in events] == ["script", "audio", "images", "video", "done", "end"]
+        assert json.loads(_get(url, "/jobs/2/events").splitlines()[-1])["message"].startswith("failed")
+
+        done, failed = json.loads(_get(url, "/jobs/1")), json.loads(_get(url, "/jobs/2"))
+        assert done["status"] == "done" and done["output"] == "x.mp4"
+        assert failed["status"] == "failed" and failed["error"] == "video: boom"
+        assert [j["id"] for j in json.loads(_get(url, "/jobs"))] == ["1", "2"]
+        assert json.loads(_get(url, "/health"))["queued"] == 0
+    finally:
+        server.shutdown()
+        main.process_single_scene = old_process
+        config.THUMBNAIL["enabled"] = old_thumbs
+        config.DAEMON["warm_hosts"] = old_hosts
+
+
+if __name__ == "__main__":
+    test_submit_validation_and_snapshots()
+    print("[PASS] render daemon")
@@ -0,0 +1,79 @@
+# test_render_queue.py
+# Tests the SQLite render queue: several local worker processes, lease expiry and retries
+# Run alone (python test_render_queue.py) or with pytest - jobs are fake, nothing is rendered
+
+from pathlib import Path
+import multiprocessing
+import tempfile
+import time
+from render_queue import RenderQueue, run_worker
+
+
+def fake_render(payload):
+    """Stands in for render_job: writes the 'video' after a short render time"""
+    time.sleep(0.05)
+    out = Path(payload["out_dir"]) / f"scene_{payload['index']}.mp4"
+    out.write_text(str(payload["index"]))
+    return str(out), {"seconds": 0.05}
+
+
+def _worker(db, name):
+    run_worker(db, worker=name, render=fake_render, idle_exit_s=0.5, poll_s=0.05)
+
+
+def test_local_workers_render_each_job_once():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Path(tmp) / "queue.sqlite"
+        queue = RenderQueue(db)
+        ids = queue.enqueue([{"index": i, "out_dir": tmp} for i in range(12)])
+
+        ctx = multiprocessing.get_context("spawn")
+        procs = [ctx.Process(target=_worker, args=(db, f"w{n}")) for n in range(3)]
+        for proc in procs:
+            proc.start()
+        finished = list(queue.wait(ids, poll_s=0.05))
+        for proc in procs:
+            proc.join(30)
+            assert proc.exitcode == 0
+
+        assert sorted(job["id"] for job in finished) == ids
+        assert all(job["status"] == "done" and job["attempts"] == 1 for job in finished)
+        assert sorted(Path(job["output"]).read_text() for job in finished) == sorted(str(i) for i in range(12))
+        assert queue.counts() == {"done": 12}
+
+
+def test_expired_lease_is_requeued():
+    with tempfile.TemporaryDirectory() as tmp:
+        queue = RenderQueue(Path(tmp) / "queue.sqlite", lease_s=0.2)
+        [job_id] = queue.enqueue([{"index": 0}])
+
+        assert queue.claim("crashed")["id"] == job_id
+        assert queue.claim("other") is None        # still leased
+        time.sleep(0.3)                              # no heartbeat: the lease runs out
+        job = queue.claim("other")
+        assert job["id"] == job_id and job["attempts"] == 2
+
+        assert not queue.heartbeat(job_id, "crashed")
+        assert not queue.complete(job_id, "crashed", "stale.mp4")
+        assert queue.heartbeat(job_id, "other")
+        assert queue.complete(job_id, "other", "scene_0.mp4")
+        assert queue.jobs([job_id])[0]["output"] == "scene_0.mp4"
+
+
+def test_failures_retry_until_max_attempts():
+    with tempfile.TemporaryDirectory() as tmp:
+        queue = RenderQueue(Path(tmp) / "queue.sqlite", max_attempts=2)
+        [job_id] = queue.enqueue([{"index": 0}])
+        for _ in range(2):
+            assert queue.claim("w")["id"] == job_id
+            assert queue.fail(job_id, "w", "video: boom")
+        assert queue.claim("w") is None
+        job = queue.jobs([job_id])[0]
+        assert job["status"] == "failed" and job["attempts"] == 2 and job["error"] == "video: boom"
+
+
+if __name__ == "__main__":
+    test_local_workers_render_each_job_once()
+    test_expired_lease_is_requeued()
+    test_failures_retry_until_max_attempts()
+    print("[PASS] render queue")
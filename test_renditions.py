@@ -0,0 +1,62 @@
+# test_renditions.py
+# Tests rendition spec parsing, output naming and the ffmpeg crop / scale / pad filters
+# Run alone (python test_renditions.py) or with pytest - nothing is encoded
+
+import config
+from renditions import parse_rendition, plan_outputs, rendition_filter
+
+SRC = (1080, 1920)
+
+
+def test_parse_valid_specs():
+    assert parse_rendition("9:16_FILL@1080")["size"] == (1080, 1920)
+    assert parse_rendition("9:16_fill@720") == {"spec": "9:16_fill@720", "aspect": (9, 16), "mode": "fill",
+                                                "size": (720, 1280)}
+    assert parse_rendition(" 1:1@1080 ")["size"] == (1080, 1080)          # mode defaults to FILL
+    assert parse_rendition("16:9_FIT@1080")["size"] == (1920, 1080)
+    assert all(d % 2 == 0 for d in parse_rendition("4:5_FILL@721")["size"])   # yuv420p needs even sizes
+    short = min(config.VIDEO_WIDTH, config.VIDEO_HEIGHT)
+    assert min(parse_rendition("9:16")["size"]) == short
+
+
+def test_parse_invalid_specs():
+    for spec in ("", "9x16", "9:16_CROP", "9:16@", "wide", "9:16_FILL@1080p"):
+        try:
+            parse_rendition(spec)
+            raise AssertionError(f"{spec!r} should be rejected")
+        except ValueError:
+            pass
+
+
+def test_filters():
+    fill = parse_rendition
+    assert rendition_filter(fill("9:16_FILL@1080"), SRC) == "null"
+    assert rendition_filter(fill("9:16_FILL@720"), SRC) == "scale=720:1280,setsar=1"
+    assert rendition_filter(fill("1:1_FILL@1080"), SRC) == "crop=1080:1080,setsar=1"
+    assert rendition_filter(fill("1:1_FILL@720"), SRC) == "crop=1080:1080,scale=720:720,setsar=1"
+    assert rendition_filter(fill("16:9_FILL@1080"), SRC) == "crop=1080:606,scale=1920:1080,setsar=1"
+    assert rendition_filter(fill("9:16_FILL@1080"), (1920, 1080)) == "crop=606:1080,scale=1080:1920,setsar=1"
+    assert rendition_filter(fill("16:9_FIT@1080"), SRC) == (
+        "scale=1920:1080:force_original_aspect_ratio=decrease,pad=1920:1080:(ow-iw)/2:(oh-ih)/2:color=black,setsar=1")
+
+
+def test_output_paths_and_fallbacks():
+    outputs = plan_outputs("out/a.mp4", "9:16_FILL@1080",
+                           ["1:1_FILL@1080", "1:1_FIT@1080", "1:1_FILL@1080", "9:16_FILL@1080", "bad"], SRC)
+    assert [o["path"].replace("\\", "/") for o in outputs] == [
+        "out/a.mp4", "out/a_1080x1080.mp4", "out/a_1080x1080_fit.mp4"]
+    assert [o["mode"] for o in outputs] == ["fill", "fill", "fit"]
+    assert all(o["bitrate"].endswith("k") for o in outputs)
+
+    # An unknown primary aspect ratio falls back to the configured one
+    fallback = plan_outputs("out/a.mp4", "portrait", [], SRC)
+    assert len(fallback) == 1 and fallback[0]["path"].replace("\\", "/") == "out/a.mp4"
+    assert fallback[0]["size"] == parse_rendition(config.OUTPUT["aspect_ratio"])["size"]
+
+
+if __name__ == "__main__":
+    test_parse_valid_specs()
+    test_parse_invalid_specs()
+    test_filters()
+    test_output_paths_and_fallbacks()
+    print("[PASS] renditions")
@@ -0,0 +1,108 @@
+# test_scene_plan.py
+# Tests render plans on disk: write / load round trip, asset hash checks and layout recompiling on load
+# Run alone (python test_scene_plan.py) or with pytest - composes one frame, nothing is encoded
+
+from pathlib import Path
+import json
+import tempfile
+from PIL import Image
+import config
+from scene_plan import find_plans, load_plan, write_plan
+
+SCENE = {"headline": "H", "hook_text": "K", "details": "D", "subscribe_hook": "S"}
+
+
+def _plan(tmp):
+    image, audio = Path(tmp) / "a.JPG", Path(tmp) / "mix.m4a"
+    Image.new("RGB", (32, 48), (200, 30, 30)).save(image, "JPEG")
+    audio.write_bytes(b"audio")
+    return {
+        "output": str(Path(tmp) / "out" / "scene_1.mp4"),
+        "preview": False,
+        "audio": str(audio),
+        "spec": {"images": [str(image)], "duration": 2.0, "timings": {"sentences": [], "words": []},
+                 "content": {"headline": "H", "hook": "K", "subscribe_hook": "S"},
+                 "scale": 0.1, "burn_in": False},
+        "layout": "default",
+        "encode": {"size": [108, 192], "fps": 30, "renditions": ["9:16"], "preset": "veryfast",
+                   "subtitles": "python", "export_subtitles": False}
+    }
+
+
+def test_round_trip():
+    with tempfile.TemporaryDirectory() as tmp:
+        plan = _plan(tmp)
+        plan_dir = Path(tmp) / "plans"
+        path = write_plan(plan, SCENE, plan_dir)
+        assert path.name == "scene_1.plan.json" and find_plans([plan_dir]) == [path]
+
+        # Assets are stored by content hash, relative to the plan file
+        stored = json.loads(path.read_text(encoding="utf-8"))
+        assert stored["spec"]["images"][0].startswith("assets/") and stored["spec"]["images"][0].endswith(".jpg")
+        assert stored["output"] == "scene_1.mp4" and stored["scene"] == SCENE
+
+        loaded = load_plan(path)
+        assert Path(loaded["spec"]["images"][0]).read_bytes() == Path(plan["spec"]["images"][0]).read_bytes()
+        assert Path(loaded["audio"]).read_bytes() == b"audio"
+        assert loaded["path"] == str(path.resolve())
+        for key in ("preview", "layout", "encode"):
+            assert loaded[key] == plan[key]
+        assert {k: v for k, v in loaded["spec"].items() if k != "images"} == \
+               {k: v for k, v in plan["spec"].items() if k != "images"}
+
+
+def test_rejects_tampered_or_missing_assets():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_plan(_plan(tmp), SCENE, Path(tmp) / "plans")
+        audio = path.parent / json.loads(path.read_text(encoding="utf-8"))["audio"]
+        audio.write_bytes(b"edited")
+        for broken in (lambda: load_plan(path), lambda: audio.unlink() or load_plan(path, verify=False)):
+            try:
+                broken()
+            except ValueError as e:
+                assert audio.name in str(e)
+            else:
+                raise AssertionError("broken asset was accepted")
+
+        stored = json.loads(path.read_text(encoding="utf-8"))
+        path.write_text(json.dumps(dict(stored, version=0)), encoding="utf-8")
+        try:
+            load_plan(path)
+        except ValueError as e:
+            assert "plan version 0" in str(e)
+        else:
+            raise AssertionError("stale plan was accepted")
+
+
+def test_layout_is_compiled_on_the_render_machine():
+    from video_compose import compose_scene
+    old_template, old_height = config.LAYOUT["template"], config.HEADER["height"]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_plan(_plan(tmp), SCENE, Path(tmp) / "plans")
+        # The render machine has its own template and header size; the plan does not override them
+        template = Path(tmp) / "banner.json"
+        template.write_text(json.dumps({"name": "banner", "layers": [
+            {"name": "banner", "type": "box", "style": "HEADER", "y": 0, "height": "height", "timing": "full"}
+        ]}), encoding="utf-8")
+        config.LAYOUT["template"], config.HEADER["height"] = str(template), 500
+        try:
+            plan = load_plan(path)
+            video, owned, windows = compose_scene(plan["spec"])
+            try:
+                assert windows == {"banner": (0.0, 2.0)}
+                frame = video.get_frame(1.0).astype(int)
+                assert frame.shape == (192, 108, 3)
+                # 0.7-opaque black header, 50 px at scale 0.1, over the red image
+                assert frame[:48, :, 0].max() < 100 and frame[60:170, 54, 0].min() > 150
+            finally:
+                for clip in owned:
+                    clip.close()
+        finally:
+            config.LAYOUT["template"], config.HEADER["height"] = old_template, old_height
+
+
+if __name__ == "__main__":
+    test_round_trip()
+    test_rejects_tampered_or_missing_assets()
+    test_layout_is_compiled_on_the_render_machine()
+    print("[PASS] scene plan")
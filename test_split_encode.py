@@ -0,0 +1,30 @@
+# test_split_encode.py
+# Tests that split-encode chunks cover every frame exactly once on keyframe (GOP) boundaries
+# Run alone (python test_split_encode.py) or with pytest - only the frame ranges are computed
+
+from split_encode import chunk_ranges
+
+
+def test_chunks_cover_every_frame_once_on_gop_boundaries():
+    for total in (1, 59, 60, 61, 450, 1799, 1800, 2701):
+        for gop in (1, 30, 60):
+            for chunks in (1, 2, 3, 4, 7, 16, 100):
+                ranges = chunk_ranges(total, gop, chunks)
+                case = (total, gop, chunks, ranges)
+                covered = [f for start, end in ranges for f in range(start, end)]
+                assert covered == list(range(total)), case
+                assert all(start % gop == 0 for start, _ in ranges), case
+                assert 1 <= len(ranges) <= min(chunks, -(-total // gop)), case
+                # Balanced: whole GOPs per chunk differ by at most one (the last may be partial)
+                sizes = [-(-(end - start) // gop) for start, end in ranges]
+                assert max(sizes) - min(sizes) <= 1, case
+
+
+def test_empty_timeline_has_no_chunks():
+    assert chunk_ranges(0, 60, 4) == []
+
+
+if __name__ == "__main__":
+    test_chunks_cover_every_frame_once_on_gop_boundaries()
+    test_empty_timeline_has_no_chunks()
+    print("[PASS] split encode")
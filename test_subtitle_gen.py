@@ -0,0 +1,51 @@
+# test_subtitle_gen.py
+# Tests SRT / ASS timestamps, karaoke word timing and text escaping
+# Run alone (python test_subtitle_gen.py) or with pytest - files go to a temp folder
+
+from pathlib import Path
+import re
+import tempfile
+from subtitle_gen import _ass_time, _srt_time, write_ass, write_srt
+
+TIMINGS = {
+    "sentences": [[0.0, 1.5, "Big {news} today."], [1.5, 3.2, "Back\\slash\nline."]],
+    "words": [[0.1, 0.5, "Big"], [0.5, 1.0, "{news}"], [1.0, 1.6, "today."],
+              [1.5, 2.0, "Back\\slash"], [2.4, 3.2, "line."]]
+}
+
+
+def test_timestamps_round_once():
+    assert _srt_time(0) == "00:00:00,000"
+    assert _srt_time(1.9996) == "00:00:02,000"
+    assert _srt_time(59.9999) == "00:01:00,000"
+    assert _srt_time(3661.5) == "01:01:01,500"
+    assert _ass_time(1.996) == "0:00:02.00"
+    assert _ass_time(3599.996) == "1:00:00.00"
+
+
+def test_srt_cues():
+    with tempfile.TemporaryDirectory() as tmp:
+        text = Path(write_srt(TIMINGS, Path(tmp) / "a.srt")).read_text(encoding="utf-8")
+    assert text.startswith("1\n00:00:00,000 --> 00:00:01,500\nBig {news} today.\n\n2\n00:00:01,500 --> 00:00:03,200\n")
+
+
+def test_ass_karaoke_timing_and_escaping():
+    with tempfile.TemporaryDirectory() as tmp:
+        text = Path(write_ass(TIMINGS, Path(tmp) / "a.ass", 1080, 1920)).read_text(encoding="utf-8")
+    events = [line for line in text.splitlines() if line.startswith("Dialogue:")]
+    assert len(events) == 2
+    assert events[0].startswith("Dialogue: 0,0:00:00.00,0:00:01.50,Karaoke,")
+    for event, (start, end, _) in zip(events, TIMINGS["sentences"]):
+        # Leading gap + word syllables fill the sentence (words are clipped to its end)
+        ticks = sum(int(k) for k in re.findall(r"\\k(\d+)", event))
+        assert abs(ticks - round((end - start) * 100)) <= 1, event
+    # Braces would start override blocks and line breaks would end the event
+    assert "(news)" in events[0] and "{news}" not in events[0]
+    assert "\n" not in events[1] and "Back\\\\slash" in events[1]
+
+
+if __name__ == "__main__":
+    test_timestamps_round_once()
+    test_srt_cues()
+    test_ass_karaoke_timing_and_escaping()
+    print("[PASS] subtitle gen")
@@ -0,0 +1,235 @@
+# test_uploader.py
+# Tests the resumable uploader against a local fake of the YouTube upload endpoint
+# Run alone (python test_uploader.py) or with pytest - no network or OAuth needed
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import json
+import tempfile
+import threading
+import time
+import requests
+import config
+import uploader
+
+CHUNK = 256 * 1024
+
+
+class FakeUploadServer:
+    """Minimal resumable-upload endpoint: POST opens a session, PUT appends chunks"""
+
+    def __init__(self, drop_after_chunks=None, delay=0.0):
+        self.sessions = {}          # session id -> {"total": int, "data": bytearray}
+        self.drop_after_chunks = drop_after_chunks
+        self.delay = delay
+        self.chunks_received = 0
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                json.loads(self.rfile.read(length))
+                with fake.lock:
+                    sid = str(len(fake.sessions))
+                    fake.sessions[sid] = {
+                        "total": int(self.headers["X-Upload-Content-Length"]),
+                        "data": bytearray()
+                    }
+                self.send_response(200)
+                self.send_header("Location", f"http://127.0.0.1:{fake.port}/session/{sid}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def do_PUT(self):
+                sess = fake.sessions.get(self.path.rsplit("/", 1)[-1])
+                length = int(self.headers.get("Content-Length", 0))
+                body = self.rfile.read(length) if length else b""
+                if sess is None:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                rng = self.headers["Content-Range"]
+                if not rng.startswith("bytes */"):
+                    with fake.lock:
+                        fake.active += 1
+                        fake.max_active = max(fake.max_active, fake.active)
+                        fake.chunks_received += 1
+                        drop = fake.drop_after_chunks is not None and fake.chunks_received > fake.drop_after_chunks
+                    try:
+                        time.sleep(fake.delay)
+                        if drop:
+                            # Simulate a dropped connection: data never arrives
+                            fake.drop_after_chunks = None
+                            self.close_connection = True
+                            self.connection.close()
+                            return
+                        start = int(rng.split()[1].split("-")[0])
+                        assert start == len(sess["data"]), "client sent a chunk at the wrong offset"
+                        sess["data"] += body
+                    finally:
+                        with fake.lock:
+                            fake.active -= 1
+
+                received = len(sess["data"])
+                if received >= sess["total"]:
+                    payload = json.dumps({"id": f"vid{received}"}).encode()
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                else:
+                    self.send_response(308)
+                    if received:
+                        self.send_header("Range", f"bytes=0-{received - 1}")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.port = self.server.server_address[1]
+        self.endpoint = f"http://127.0.0.1:{self.port}/upload"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+
+
+_ORIGINAL_UPLOAD = dict(config.UPLOAD)
+
+
+def _setup(tmp: Path, server: FakeUploadServer):
+    config.UPLOAD.update(_ORIGINAL_UPLOAD)
+    config.UPLOAD["state_file"] = str(tmp / "sessions.json")
+    config.UPLOAD["endpoint"] = server.endpoint
+    config.UPLOAD["chunk_size"] = CHUNK
+
+
+def _make_video(path: Path, size: int) -> bytes:
+    data = bytes(i % 251 for i in range(size))
+    path.write_bytes(data)
+    return data
+
+
+def test_interrupted_upload_resumes_from_offset():
+    with tempfile.TemporaryDirectory() as d:
+        tmp = Path(d)
+        server = FakeUploadServer(drop_after_chunks=2)
+        _setup(tmp, server)
+        video = tmp / "a.mp4"
+        data = _make_video(video, CHUNK * 5 + 123)
+
+        # First attempt dies on the third chunk and gives up immediately
+        try:
+            uploader.ResumableUpload(requests.Session(), str(video), {"snippet": {}},
+                                     max_retries=0).run()
+            raise AssertionError("upload should have failed")
+        except requests.ConnectionError:
+            pass
+        assert json.loads((tmp / "sessions.json").read_text()), "session URI was not persisted"
+
+        # Second attempt picks up the persisted session instead of restarting,
+        # retrying its first offset query through a short outage
+        sleep, uploader.time.sleep = uploader.time.sleep, lambda s: None
+        try:
+            response = uploader.ResumableUpload(FlakySession(2), str(video), {"snippet": {}}).run()
+        finally:
+            uploader.time.sleep = sleep
+        assert response["id"] == f"vid{len(data)}"
+        assert len(server.sessions) == 1
+        assert bytes(server.sessions["0"]["data"]) == data
+        assert server.chunks_received == 7      # 6 chunks + 1 dropped
+        assert json.loads((tmp / "sessions.json").read_text()) == {}
+        server.close()
+
+
+def test_upload_many_is_bounded():
+    with tempfile.TemporaryDirectory() as d:
+        tmp = Path(d)
+        server = FakeUploadServer(delay=0.05)
+        _setup(tmp, server)
+        jobs = []
+        for i in range(5):
+            video = tmp / f"v{i}.mp4"
+            _make_video(video, CHUNK * 2 + i)
+            jobs.append({"video_path": str(video), "title": f"t{i}", "description": "",
+                         "tags": [], "session": requests.Session()})
+
+        results = uploader.upload_many(jobs, max_workers=2)
+        assert [r for r in results if isinstance(r, Exception)] == []
+        assert len(set(results)) == 5
+        assert server.max_active <= 2
+        server.close()
+
+
+class FlakySession(requests.Session):
+    """Fails the first `failures` PUTs (chunks and offset queries alike) with a connection error"""
+
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+
+    def put(self, *args, **kwargs):
+        if self.failures:
+            self.failures -= 1
+            raise requests.ConnectionError("network down")
+        return super().put(*args, **kwargs)
+
+
+def test_offset_query_failures_are_retried():
+    with tempfile.TemporaryDirectory() as d:
+        tmp = Path(d)
+        server = FakeUploadServer()
+        _setup(tmp, server)
+        video = tmp / "a.mp4"
+        data = _make_video(video, CHUNK * 2 + 7)
+        sleep, uploader.time.sleep = uploader.time.sleep, lambda s: None
+        try:
+            # The chunk PUT and the two offset queries after it all hit the outage
+            response = uploader.ResumableUpload(FlakySession(3), str(video), {"snippet": {}},
+                                                max_retries=5).run()
+        finally:
+            uploader.time.sleep = sleep
+        assert response["id"] == f"vid{len(data)}"
+        assert bytes(server.sessions["0"]["data"]) == data
+        server.close()
+
+
+def test_client_errors_are_not_retried():
+    class QuotaSession(requests.Session):
+        puts = 0
+
+        def put(self, *args, **kwargs):
+            QuotaSession.puts += 1
+            r = requests.Response()
+            r.status_code = 403
+            r.url = args[0]
+            return r
+
+    with tempfile.TemporaryDirectory() as d:
+        tmp = Path(d)
+        server = FakeUploadServer()
+        _setup(tmp, server)
+        video = tmp / "a.mp4"
+        _make_video(video, CHUNK)
+        try:
+            uploader.ResumableUpload(QuotaSession(), str(video), {"snippet": {}}, max_retries=5).run()
+            raise AssertionError("a 403 should fail the upload")
+        except requests.HTTPError as e:
+            assert e.response.status_code == 403
+        assert QuotaSession.puts == 1
+        server.close()
+
+
+if __name__ == "__main__":
+    for test in [test_interrupted_upload_resumes_from_offset, test_upload_many_is_bounded,
+                 test_offset_query_failures_are_retried, test_client_errors_are_not_retried]:
+        test()
+        print(f"[PASS] {test.__name__}")
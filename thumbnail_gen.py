@@ -0,0 +1,145 @@
+"""Thumbnail generation with Pillow (no MoviePy / ImageMagick)
+- Uses the scene's first slideshow image, normalized to the frame size
+- Overlays metadata.thumbnail_text_overlay (or the headline) as a cached text sprite
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Dict, Any
+import itertools
+import shutil
+import subprocess
+import time
+from PIL import Image, ImageDraw, ImageFont, ImageOps
+import config
+
+
+# Bold sans fonts tried after THUMBNAIL["font_path"]: Windows, macOS, common Linux packages.
+# Pillow looks bare file names up in the system font directories.
+FALLBACK_FONTS = ("arialbd.ttf", "Arial Bold.ttf", "DejaVuSans-Bold.ttf", "LiberationSans-Bold.ttf",
+                  "FreeSansBold.ttf")
+
+
+def _fc_match(pattern: str) -> str | None:
+    """Font file fontconfig picks for a pattern (Linux / BSD), or None"""
+    if not shutil.which("fc-match"):
+        return None
+    proc = subprocess.run(["fc-match", "-f", "%{file}", pattern], capture_output=True, text=True)
+    return proc.stdout.strip() or None
+
+
+@lru_cache(maxsize=8)
+def _load_font(font_path: str, size: int):
+    """
+    A scalable TrueType font; raises if none is installed, so the thumbnail is
+    skipped instead of uploaded with Pillow's tiny fixed-size bitmap font
+    """
+    candidates = itertools.chain([font_path], FALLBACK_FONTS, (_fc_match(p) for p in ("sans:bold", "sans")))
+    for candidate in candidates:
+        if not candidate:
+            continue
+        try:
+            font = ImageFont.truetype(candidate, size)
+        except OSError:
+            continue
+        if candidate != font_path:
+            print(f"[WARN] Font {font_path} not found, using {candidate}")
+        return font
+    raise RuntimeError(f"No TrueType font found (THUMBNAIL['font_path'] = {font_path!r})")
+
+
+@lru_cache(maxsize=32)
+def normalized_frame(image_path: str, width: int, height: int) -> Image.Image:
+    """Decode an image and center-crop/scale it to fill width x height"""
+    img = Image.open(image_path)
+    img.draft("RGB", (width, height))
+    return ImageOps.fit(img.convert("RGB"), (width, height), Image.LANCZOS)
+
+
+def _wrap(text: str, font, max_width: int) -> List[str]:
+    lines, current = [], ""
+    for word in text.split():
+        trial = f"{current} {word}".strip()
+        if current and font.getlength(trial) > max_width:
+            lines.append(current)
+            current = word
+        else:
+            current = trial
+    if current:
+        lines.append(current)
+    return lines
+
+
+@lru_cache(maxsize=64)
+def text_sprite(text: str, width: int) -> Image.Image:
+    """Render wrapped, stroked overlay text on a transparent RGBA sprite"""
+    cfg = config.THUMBNAIL
+    font = _load_font(cfg["font_path"], cfg["fontsize"])
+    lines = _wrap(text.upper(), font, width - 2 * cfg["margin"])
+
+    line_h = int(cfg["fontsize"] * 1.2)
+    pad = cfg["stroke_width"] + 20
+    sprite = Image.new("RGBA", (width, line_h * len(lines) + 2 * pad), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(sprite)
+
+    # Semi-transparent band so the text reads on any photo
+    draw.rectangle([0, 0, width, sprite.height], fill=(0, 0, 0, int(255 * cfg["band_opacity"])))
+
+    for i, line in enumerate(lines):
+        draw.text(
+            (width // 2, pad + i * line_h),
+            line,
+            font=font,
+            fill=cfg["color"],
+            stroke_width=cfg["stroke_width"],
+            stroke_fill=cfg["stroke_color"],
+            anchor="ma"
+        )
+    return sprite
+
+
+def create_thumbnail(images: List[Path], overlay_text: str, output_path: str | Path) -> str:
+    """Compose a JPEG thumbnail from the first usable image and the overlay text"""
+    start = time.time()
+    cfg = config.THUMBNAIL
+    w, h = cfg["width"], cfg["height"]
+
+    frame = None
+    for img_path in images:
+        try:
+            frame = normalized_frame(str(img_path), w, h).copy()
+            break
+        except Exception as e:
+            print(f"[WARN] Thumbnail skipping bad image {img_path}: {e}")
+    if frame is None:
+        frame = Image.new("RGB", (w, h), (20, 20, 40))
+
+    if overlay_text:
+        sprite = text_sprite(overlay_text, w)
+        y = int(h * cfg["position_y"]) - sprite.height // 2
+        y = max(0, min(h - sprite.height, y))
+        frame.paste(sprite, (0, y), sprite)
+
+    path = Path(output_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    frame.save(path, "JPEG", quality=cfg["quality"], optimize=True)
+
+    print(f"[THUMBNAIL] Saved {path} in {(time.time() - start) * 1000:.0f} ms")
+    return str(path)
+
+
+def generate_thumbnails(jobs: List[Dict[str, Any]]) -> List[str | None]:
+    """
+    Render thumbnails for many scenes at once.
+    Each job: {"images": [...], "text": str, "output_path": str}
+    """
+    def run(job):
+        try:
+            return create_thumbnail(job["images"], job["text"], job["output_path"])
+        except Exception as e:
+            print(f"[WARN] Thumbnail failed for {job['output_path']}: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=config.THUMBNAIL["workers"]) as pool:
+        return list(pool.map(run, jobs))
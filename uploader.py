@@ -1,18 +1,232 @@
-# YouTube uploader 
-"""YouTube upload (OAuth flow)"""
+# YouTube uploader
+"""YouTube upload (OAuth flow)
+- OAuth token cached on disk and refreshed, one client reused across uploads
+- Fixed-size resumable chunks; session URIs persisted so interrupted uploads resume
+- Bounded-concurrency queue for uploading many videos
+- Optional SRT caption track (YouTube accepts SRT, not ASS)
+"""
 
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import json
+import os
+import threading
+import time
+from google.auth.transport.requests import AuthorizedSession, Request
+from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from googleapiclient.http import MediaFileUpload
+import requests
 import config
 
+_credentials = None
+_youtube = None
+_auth_lock = threading.Lock()     # one OAuth flow / client build at a time
+_service_lock = threading.Lock()  # googleapiclient (httplib2) is not thread-safe
+_state_lock = threading.Lock()    # upload session state file
+
+
+def get_credentials():
+    """Load cached OAuth credentials, refreshing or re-authorizing only when needed"""
+    global _credentials
+    with _auth_lock:
+        if _credentials and _credentials.valid:
+            return _credentials
+
+        token_file = Path(config.UPLOAD["token_file"])
+        creds = _credentials
+        if creds is None and token_file.exists():
+            try:
+                creds = Credentials.from_authorized_user_file(str(token_file), config.YOUTUBE_SCOPES)
+                if not creds.has_scopes(config.YOUTUBE_SCOPES):
+                    print("[AUTH] Cached token is missing required scopes, re-authorizing")
+                    creds = None
+            except Exception as e:
+                print(f"[WARN] Could not read token cache {token_file}: {e}")
+                creds = None
+
+        if creds and creds.expired and creds.refresh_token:
+            try:
+                creds.refresh(Request())
+                print("[AUTH] Token refreshed")
+            except Exception as e:
+                print(f"[WARN] Token refresh failed: {e}")
+                creds = None
+
+        if not creds or not creds.valid:
+            flow = InstalledAppFlow.from_client_secrets_file(
+                config.YOUTUBE_CLIENT_SECRETS_FILE,
+                scopes=config.YOUTUBE_SCOPES
+            )
+            creds = flow.run_local_server(port=0)
+
+        token_file.parent.mkdir(parents=True, exist_ok=True)
+        token_file.write_text(creds.to_json(), encoding="utf-8")
+        os.chmod(token_file, 0o600)   # the refresh token grants access to the channel
+        _credentials = creds
+        return creds
+
+
 def get_authenticated_service():
-    flow = InstalledAppFlow.from_client_secrets_file(
-        config.YOUTUBE_CLIENT_SECRETS_FILE,
-        scopes=config.YOUTUBE_SCOPES
-    )
-    credentials = flow.run_local_server(port=0)
-    return build("youtube", "v3", credentials=credentials)
+    """YouTube API client, built once per process"""
+    global _youtube
+    creds = get_credentials()
+    with _auth_lock:
+        if _youtube is None:
+            _youtube = build("youtube", "v3", credentials=creds)
+        return _youtube
+
+
+# ───────────────────────────────────────────────
+# Resumable upload protocol
+# ───────────────────────────────────────────────
+
+def _state_key(video_path: str) -> str:
+    st = os.stat(video_path)
+    return f"{os.path.abspath(video_path)}|{st.st_size}|{int(st.st_mtime)}"
+
+
+def _load_state() -> dict:
+    path = Path(config.UPLOAD["state_file"])
+    if path.exists():
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except Exception:
+            pass
+    return {}
+
+
+def _save_session_uri(key: str, uri: str | None):
+    with _state_lock:
+        state = _load_state()
+        if uri:
+            state[key] = uri
+        else:
+            state.pop(key, None)
+        path = Path(config.UPLOAD["state_file"])
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(state, indent=2), encoding="utf-8")
+
+
+class UploadSessionExpired(Exception):
+    pass
+
+
+def _transient(error: Exception) -> bool:
+    """Connection problems and 5xx replies are worth retrying; other HTTP errors are not"""
+    if isinstance(error, requests.HTTPError):
+        return error.response is not None and error.response.status_code >= 500
+    return True
+
+
+class ResumableUpload:
+    """
+    YouTube resumable upload (POST to open a session, PUT fixed-size chunks
+    with Content-Range, PUT "bytes */total" to ask the server for its offset).
+    """
+
+    def __init__(self, session, video_path: str, body: dict, endpoint: str = None,
+                 chunk_size: int = None, max_retries: int = None):
+        self.session = session
+        self.video_path = video_path
+        self.body = body
+        self.endpoint = endpoint or config.UPLOAD["endpoint"]
+        self.chunk_size = chunk_size or config.UPLOAD["chunk_size"]
+        self.max_retries = config.UPLOAD["max_retries"] if max_retries is None else max_retries
+        self.total = os.path.getsize(video_path)
+        self.key = _state_key(video_path)
+        self.uri = _load_state().get(self.key)
+
+    def _start(self):
+        r = self.session.post(
+            self.endpoint,
+            params={"uploadType": "resumable", "part": ",".join(self.body.keys())},
+            json=self.body,
+            headers={
+                "X-Upload-Content-Length": str(self.total),
+                "X-Upload-Content-Type": "video/mp4"
+            },
+            timeout=30
+        )
+        r.raise_for_status()
+        self.uri = r.headers["Location"]
+        _save_session_uri(self.key, self.uri)
+
+    def _handle(self, r):
+        """Return (offset, response_json) from a chunk or status reply"""
+        if r.status_code in (200, 201):
+            return self.total, r.json()
+        if r.status_code == 308:
+            rng = r.headers.get("Range")
+            return (int(rng.split("-")[1]) + 1 if rng else 0), None
+        if r.status_code in (404, 410):
+            raise UploadSessionExpired()
+        r.raise_for_status()
+        raise requests.HTTPError(f"Unexpected status {r.status_code}", response=r)
+
+    def _query_offset(self):
+        r = self.session.put(
+            self.uri,
+            headers={"Content-Range": f"bytes */{self.total}", "Content-Length": "0"},
+            timeout=30
+        )
+        return self._handle(r)
+
+    def run(self, progress=None) -> dict:
+        """Upload the file, resuming a persisted session when there is one"""
+        offset, response = 0, None
+        resuming = bool(self.uri)
+        if not resuming:
+            self._start()
+
+        # A saved session starts with an offset query, retried like any other request
+        retries, need_offset = 0, resuming
+        with open(self.video_path, "rb") as f:
+            while response is None:
+                try:
+                    if need_offset:
+                        # After a failed chunk (or on resume), ask the server how much it kept
+                        offset, response = self._query_offset()
+                        need_offset = False
+                        if resuming:
+                            print(f"[UPLOAD] Resuming {Path(self.video_path).name} at {offset / self.total:.0%}")
+                            resuming = False
+                        if response is not None:
+                            break
+                    f.seek(offset)
+                    chunk = f.read(self.chunk_size)
+                    end = offset + len(chunk) - 1
+                    r = self.session.put(
+                        self.uri,
+                        data=chunk,
+                        headers={"Content-Range": f"bytes {offset}-{end}/{self.total}"},
+                        timeout=120
+                    )
+                    if r.status_code >= 500:
+                        raise requests.HTTPError(f"Server error {r.status_code}", response=r)
+                    offset, response = self._handle(r)
+                    retries = 0
+                    if progress:
+                        progress(offset / self.total)
+                except UploadSessionExpired:
+                    print("[UPLOAD] Upload session expired, starting over")
+                    _save_session_uri(self.key, None)
+                    offset, need_offset, resuming = 0, False, False
+                    self._start()
+                except (requests.ConnectionError, requests.Timeout, requests.HTTPError) as e:
+                    if not _transient(e):
+                        raise   # 4xx: quota, bad request, auth - retrying will not help
+                    retries += 1
+                    if retries > self.max_retries:
+                        raise
+                    delay = min(60, 2 ** retries)
+                    print(f"[UPLOAD] {e} - retry {retries}/{self.max_retries} in {delay}s")
+                    time.sleep(delay)
+                    need_offset = True
+
+        _save_session_uri(self.key, None)
+        return response
 
 
 def upload_video(
@@ -21,10 +235,11 @@ def upload_video(
     description: str,
     tags: list[str],
     category_id="27",   # Education
-    privacy_status="public"
+    privacy_status="public",
+    thumbnail_path=None,
+    session=None,
+    captions_path=None
 ):
-    youtube = get_authenticated_service()
-
     body = {
         "snippet": {
             "title": title,
@@ -37,23 +252,69 @@ def upload_video(
         }
     }
 
-    media = MediaFileUpload(video_path, chunksize=-1, resumable=True)
+    if session is None:
+        session = AuthorizedSession(get_credentials())
 
-    request = youtube.videos().insert(
-        part="snippet,status",
-        body=body,
-        media_body=media
+    name = Path(video_path).name
+    print(f"Uploading {name}...")
+    response = ResumableUpload(session, video_path, body).run(
+        progress=lambda p: print(f"  {name}: uploaded {int(p * 100)}%")
     )
 
-    print("Uploading...")
-    response = None
-    while response is None:
-        status, response = request.next_chunk()
-        if status:
-            print(f"Uploaded {int(status.progress() * 100)}%")
-
     print("Upload complete!")
     print(f"Video ID: {response['id']}")
     print(f"Link: https://youtu.be/{response['id']}")
 
-    return response["id"]
\ No newline at end of file
+    if thumbnail_path:
+        set_thumbnail(get_authenticated_service(), response["id"], thumbnail_path)
+    if captions_path and config.UPLOAD["captions"]:
+        upload_captions(get_authenticated_service(), response["id"], captions_path)
+
+    return response["id"]
+
+
+def upload_many(jobs: list[dict], max_workers: int = None) -> list:
+    """
+    Upload several videos with bounded concurrency.
+    Each job holds upload_video keyword arguments. Returns, in job order,
+    the video ID or the exception raised for that job.
+    """
+    max_workers = max_workers or config.UPLOAD["max_concurrent"]
+
+    def run(job):
+        try:
+            return upload_video(**job)
+        except Exception as e:
+            print(f"[ERROR] Upload failed for {job.get('video_path')}: {e}")
+            return e
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(run, jobs))
+
+
+def set_thumbnail(youtube, video_id: str, thumbnail_path: str):
+    """Attach a custom thumbnail (channel must be verified for custom thumbnails)"""
+    try:
+        with _service_lock:
+            youtube.thumbnails().set(
+                videoId=video_id,
+                media_body=MediaFileUpload(thumbnail_path, mimetype="image/jpeg")
+            ).execute()
+        print(f"Thumbnail set: {thumbnail_path}")
+    except Exception as e:
+        print(f"[WARN] Could not set thumbnail: {e}")
+
+
+def upload_captions(youtube, video_id: str, srt_path: str, language: str = None, name: str = "English"):
+    """Attach an SRT file as a published caption track"""
+    language = language or config.UPLOAD["caption_language"]
+    try:
+        with _service_lock:
+            youtube.captions().insert(
+                part="snippet",
+                body={"snippet": {"videoId": video_id, "language": language, "name": name, "isDraft": False}},
+                media_body=MediaFileUpload(str(srt_path), mimetype="application/octet-stream")
+            ).execute()
+        print(f"Captions uploaded: {srt_path}")
+    except Exception as e:
+        print(f"[WARN] Could not upload captions: {e}")
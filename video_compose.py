@@ -2,299 +2,547 @@ from moviepy.editor import (
     TextClip,
     CompositeVideoClip,
     ImageClip,
-    concatenate_videoclips,
     ColorClip,
-    AudioFileClip,
-    VideoClip,
-    CompositeAudioClip
+    concatenate_videoclips,
+    VideoClip
 )
-from moviepy.video.tools.subtitles import SubtitlesClip
 import config
+from audio_mix import prepare_audio
+from alignment import get_timings, split_sentences
+from ffmpeg_tools import encode_video, has_filter, filter_path
+from renditions import plan_outputs
+from layout import get_plan, layer_window, solid_bitmap
+from asset_pool import get_pool
+from frame_parallel import frame_times, parallel_frames
+from frame_writer import pipe_format, render_frames
+from split_encode import split_encode
+from subtitle_gen import write_srt, write_ass
+import render_cache
+from bisect import bisect_right
+from functools import lru_cache
 from pathlib import Path
+from PIL import Image
+import os
 import time
 import numpy as np
 
-def make_short_video(
-    images: list[Path],
-    audio_path: str,
-    english_text: str,
-    headline: str,
-    hook: str,
-    subscribe_hook: str,
-    news_type: str = "default",  # Add news_type parameter
-    output_path: str = "output/final_short.mp4"
-) -> str:
 
-    start_total = time.time()
-    print(f"[TIMER] Video composition started for: {headline}")
+@lru_cache(maxsize=config.RENDER["text_sprite_cache"])
+def _text_sprite(txt, fontsize, color, stroke_color, stroke_width, font, width, method, align):
+    """Render text once through ImageMagick; keep the RGB frame and alpha mask"""
+    clip = TextClip(
+        txt,
+        fontsize=fontsize,
+        color=color,
+        stroke_color=stroke_color,
+        stroke_width=stroke_width,
+        font=font,
+        size=(width, None),
+        method=method,
+        align=align
+    )
+    frame = clip.get_frame(0)
+    mask = clip.mask.get_frame(0)
+    clip.close()
+    frame.setflags(write=False)
+    mask.setflags(write=False)
+    return frame, mask
 
-    output_dir = Path(output_path).parent
-    output_dir.mkdir(parents=True, exist_ok=True)
 
-    # ───────────────────────────────────────────────
-    # AUDIO PROCESSING
-    # ───────────────────────────────────────────────
-    audio = AudioFileClip(audio_path)
-    
-    if audio.duration is None:
-        print("[ERROR] Could not read audio duration. Check if temp/audio.mp3 is valid.")
-        duration = len(english_text.split()) / 2.5 
-    else:
-        duration = audio.duration
+get_pool().register_counter("text_sprite", lambda: _text_sprite.cache_info()[:2])
 
-    # Use speed factor from config
-    speed_factor = config.AUDIO["speed_factor"]
-    audio = audio.fl_time(lambda t: speed_factor * t, apply_to=['audio'])
-    duration = duration / speed_factor
-    audio = audio.set_duration(duration)
 
-    print(f"[DEBUG] Audio Duration: {duration:.2f}s")
+def text_clip(txt, style: dict, width: int, color=None, method='caption', align='center'):
+    """
+    TextClip equivalent backed by a process-wide sprite cache, so repeated
+    text (highlighted words, channel slogans, long-running daemon jobs) only
+    spawns ImageMagick once.
+    """
+    frame, mask = _text_sprite(
+        txt, style["fontsize"], color or style["color"], style["stroke_color"],
+        style["stroke_width"], style["font"], width, method, align
+    )
+    return ImageClip(frame).set_mask(ImageClip(mask, ismask=True))
 
-    # ───────────────────────────────────────────────
-    # SLIDESHOW GENERATION
-    # ───────────────────────────────────────────────
-    clips = []
-    num_images = max(1, len(images))
-    dur_per_img = duration / num_images
 
+def uniform_timings(english_text, duration):
+    """Fallback timing: sentences by word count, words evenly spread"""
+    sentences = split_sentences(english_text)
+    words_per_second = max(1, len(english_text.split())) / duration
+    result = {"sentences": [], "words": []}
+
+    current_time = 0
+    for sentence in sentences:
+        sentence_duration = max(1.5, len(sentence.split()) / words_per_second)
+        end_time = min(current_time + sentence_duration, duration)
+        result["sentences"].append([current_time, end_time, sentence])
+        current_time = end_time
+        if current_time >= duration:
+            break
+
+    words = english_text.split()
+    word_duration = duration / len(words) if words else 0.1
+    for i, word in enumerate(words):
+        result["words"].append([i * word_duration, min((i + 1) * word_duration, duration), word])
+    return result
+
+
+def write_contact_sheet(clip, times: dict, base_path) -> list[str]:
+    """Key frames of the composition as PNGs, plus one side-by-side sheet"""
+    frames = {name: clip.get_frame(t).astype(np.uint8) for name, t in times.items()}
+    base_path = Path(base_path)
+    paths = []
+    for name, frame in frames.items():
+        path = base_path.with_name(f"{base_path.stem}_{name}.png")
+        Image.fromarray(frame).save(path)
+        paths.append(str(path))
+    sheet = np.concatenate(list(frames.values()), axis=1)
+    path = base_path.with_name(f"{base_path.stem}_sheet.png")
+    Image.fromarray(sheet).save(path)
+    paths.append(str(path))
+    return paths
+
+
+def lazy_slideshow(images, duration, size):
+    """
+    Slideshow as a single VideoClip that decodes only the image on screen.
+    Images are letterboxed (fit to width, centered) on a fixed-size canvas;
+    the previous image's array is dropped as soon as the next one is shown.
+    Returns None if no image can be opened.
+    """
+    width, height = size
+    valid = []
     for img_path in images:
         try:
-            clip = (
-                ImageClip(str(img_path))
-                .set_duration(dur_per_img)
-                .resize(width=config.VIDEO_WIDTH)
-                .set_position(("center", "center"))
-            )
-            clips.append(clip)
+            with Image.open(img_path) as img:   # header only, no pixel decode
+                img.size
+            valid.append(str(img_path))
         except Exception as e:
             print(f"[WARN] Skipping bad image {img_path}: {e}")
+    if not valid:
+        return None
+
+    dur_per_img = duration / len(valid)
+    current = {"path": None, "frame": None}
+
+    def decode(path):
+        with Image.open(path) as img:
+            img.draft("RGB", (width, height))   # JPEG: decode at reduced scale when possible
+            img = img.convert("RGB")
+            h = max(1, round(img.height * width / img.width))
+            img = img.resize((width, h), Image.LANCZOS)
+        canvas = np.zeros((height, width, 3), dtype=np.uint8)
+        src = np.asarray(img)
+        top = (height - h) // 2
+        canvas[max(0, top):max(0, top) + min(h, height)] = src[max(0, -top):max(0, -top) + min(h, height)]
+        return canvas
+
+    def make_frame(t):
+        path = valid[min(int(t / dur_per_img), len(valid) - 1)]
+        if path != current["path"]:   # repeated placeholders are decoded once
+            current["frame"] = None
+            try:
+                current["frame"] = decode(path)
+            except Exception as e:
+                print(f"[WARN] Could not decode {path}: {e}")
+                current["frame"] = solid_bitmap(size, (0, 0, 0))
+            current["path"] = path
+        return current["frame"]
+
+    return VideoClip(make_frame, duration=duration)
+
+
+def subtitle_track(subs, make_textclip):
+    """
+    SubtitlesClip equivalent that keeps only the on-screen text clip alive
+    (SubtitlesClip caches every clip it ever built and scans the list per frame).
+    """
+    starts = [start for (start, _), _ in subs]
+    current = {"index": None, "clip": None}
+
+    def clip_at(t):
+        i = bisect_right(starts, t) - 1
+        if i < 0 or t >= subs[i][0][1]:
+            return None
+        if i != current["index"]:
+            if current["clip"] is not None:
+                current["clip"].close()
+            current.update(index=i, clip=make_textclip(subs[i][1]))
+        return current["clip"]
+
+    def make_frame(t):
+        clip = clip_at(t)
+        return clip.get_frame(t) if clip else np.zeros((1, 1, 3))
+
+    def make_mask_frame(t):
+        clip = clip_at(t)
+        if clip is None:
+            return np.zeros((1, 1))
+        if clip.mask is None:
+            return np.ones(clip.size[::-1])
+        return clip.mask.get_frame(t)
 
-    if not clips:
-        clips.append(ColorClip(size=(config.VIDEO_WIDTH, config.VIDEO_HEIGHT), color=(20, 20, 40)).set_duration(duration))
+    end = max((e for (_, e), _ in subs), default=0)
+    track = VideoClip(make_frame, duration=end, has_constant_size=False)
+    track.mask = VideoClip(make_mask_frame, ismask=True, duration=end, has_constant_size=False)
+    return track
 
-    slideshow = concatenate_videoclips(clips, method="compose")
 
+def compose_scene(spec: dict):
+    """
+    Build the composition of one scene from a picklable spec (images, duration,
+    content, timings, scale, burn_in). Returns (final_video, owned, windows):
+    the clip, every clip to close afterwards, and each layer's (start, end).
+    """
     # ───────────────────────────────────────────────
-    # HEADER (Headline Overlay) - USING CONFIG
+    # SLIDESHOW GENERATION
     # ───────────────────────────────────────────────
-    header_config = config.HEADER
-    header_bg = (
-        ColorClip(size=(config.VIDEO_WIDTH, header_config["height"]), color=header_config["background_color"])
-        .set_opacity(header_config["background_opacity"])
-        .set_duration(duration)
-    )
+    owned = []   # every clip built here, closed once the file is written
+    images, duration, timings = spec["images"], spec["duration"], spec["timings"]
+    plan = get_plan(spec["scale"])
+    size = plan["size"]
+    W, H = size
+
+    slideshow = None
+    if config.RENDER["lazy_images"]:
+        slideshow = lazy_slideshow(images, duration, size)
+    else:
+        clips = []
+        num_images = max(1, len(images))
+        dur_per_img = duration / num_images
 
-    headline_clip = TextClip(
-        headline.upper(),
-        fontsize=header_config["fontsize"],
-        color=header_config["color"],
-        font=header_config["font"],
-        stroke_color=header_config["stroke_color"],
-        stroke_width=header_config["stroke_width"],
-        size=(config.VIDEO_WIDTH - 60, None),
-        method='caption',
-        align='center'
-    ).set_position(('center', header_config["position_y"])).set_duration(duration)
+        for img_path in images:
+            try:
+                clip = (
+                    ImageClip(str(img_path))
+                    .set_duration(dur_per_img)
+                    .resize(width=W)
+                    .set_position(("center", "center"))
+                )
+                clips.append(clip)
+            except Exception as e:
+                print(f"[WARN] Skipping bad image {img_path}: {e}")
+        if clips:
+            owned.extend(clips)
+            slideshow = concatenate_videoclips(clips, method="compose")
 
-    header = CompositeVideoClip([header_bg, headline_clip]).set_position(("center", "top"))
+    if slideshow is None:
+        slideshow = ImageClip(solid_bitmap(size, (20, 20, 40))).set_duration(duration)
+    owned.append(slideshow)
 
     # ───────────────────────────────────────────────
-    # SUBTITLES WITH CONFIG STYLING
+    # SUBTITLE CUES
     # ───────────────────────────────────────────────
-    sentences = [s.strip() + '.' for s in english_text.split('.') if s.strip()]
-    if not sentences:
-        sentences = ["Generating content..."]
-    
-    # Calculate timing for each sentence
-    words_per_second = len(english_text.split()) / duration
-    subs = []
-    
-    current_time = 0
-    for sentence in sentences:
-        words_in_sentence = len(sentence.split())
-        sentence_duration = words_in_sentence / words_per_second
-        sentence_duration = max(1.5, sentence_duration)
-        
-        end_time = min(current_time + sentence_duration, duration)
-        subs.append(((current_time, end_time), sentence))
-        current_time = end_time
-        
-        if current_time >= duration:
-            break
-    
-    # Get subtitle config
-    sub_config = config.SUBTITLE
-    
-    # Create subtitle generator
-    def subtitle_generator(txt):
-        clip = TextClip(
-            txt,
-            fontsize=sub_config["fontsize"],
-            color=sub_config["color"],
-            stroke_color=sub_config["stroke_color"],
-            stroke_width=sub_config["stroke_width"],
-            font=sub_config["font"],
-            size=(config.VIDEO_WIDTH - 100, None),
-            method='caption',
-            align='center'
-        )
-        
-        # Add background if configured
-        if sub_config["background_opacity"] > 0:
-            bg = ColorClip(size=clip.size, color=sub_config["background_color"])\
-                  .set_opacity(sub_config["background_opacity"])
-            clip = CompositeVideoClip([bg, clip])
-        
-        return clip
-    
-    # Word-by-word highlighting
-    words = english_text.split()
-    word_subs = []
-    word_time = 0
-    word_duration = duration / len(words) if words else 0.1
-    
-    for word in words:
-        if word_time < duration:
-            end_word = min(word_time + word_duration, duration)
-            word_subs.append(((word_time, end_word), word))
-            word_time = end_word
-    
-    # Highlight generator
-    def highlight_generator(txt):
-        return TextClip(
-            txt,
-            fontsize=sub_config["fontsize"],
-            color=sub_config["highlight_color"],
-            stroke_color=sub_config["stroke_color"],
-            stroke_width=sub_config["stroke_width"],
-            font=sub_config["font"],
-            size=(config.VIDEO_WIDTH - 100, None),
-            method='caption',
-            align='center'
-        )
-    
-    # Position subtitles
-    subtitle_y = config.VIDEO_HEIGHT - sub_config["position_y_offset"]
-    subtitle_clip = SubtitlesClip(subs, subtitle_generator).set_position(('center', subtitle_y))
-    highlight_clip = SubtitlesClip(word_subs, highlight_generator).set_position(('center', subtitle_y))
+    subs = [((start, min(end, duration)), text) for start, end, text in timings["sentences"] if start < duration]
+    word_subs = [((start, min(end, duration)), word) for start, end, word in timings["words"] if start < duration]
 
     # ───────────────────────────────────────────────
-    # PROGRESS BAR - USING CONFIG
+    # LAYERS FROM THE RENDER PLAN (see layout.py)
     # ───────────────────────────────────────────────
-    bar_config = config.PROGRESS_BAR
-    bar_y = config.VIDEO_HEIGHT - bar_config["position_y_offset"]
-    
-    progress_bg = ColorClip(size=(config.VIDEO_WIDTH, bar_config["height"]), color=bar_config["background_color"])\
-                    .set_duration(duration).set_position(("left", bar_y))
+    content = spec["content"]
+    layers = [slideshow]
+    windows = {}
 
-    def make_progress_frame(t):
-        progress_w = int(config.VIDEO_WIDTH * (t / duration))
-        frame = np.zeros((bar_config["height"], config.VIDEO_WIDTH, 3), dtype=np.uint8)
-        if progress_w > 0:
-            frame[:, :progress_w] = bar_config["fill_color"]
-        return frame
+    for layer in plan["layers"]:
+        style, y = layer["style"], layer["y"]
+        start, end = layer_window(layer, duration)
+        windows[layer["name"]] = (start, end)
 
-    progress_fill = VideoClip(make_progress_frame, duration=duration).set_position(("left", bar_y))
+        if layer["type"] == "box":
+            # Static bitmap from the plan: no per-scene rendering
+            clip = ImageClip(layer["bitmap"]).set_mask(ImageClip(layer["mask"], ismask=True))
+            clip = clip.set_position(("center", y)).set_start(start).set_duration(end - start)
+            layers.append(clip)
 
-    # ───────────────────────────────────────────────
-    # INITIAL HOOK - USING CONFIG
-    # ───────────────────────────────────────────────
-    hook_config = config.HOOK
-    hook_dur = min(hook_config["duration"], duration)
-    
-    initial_hook = TextClip(
-        hook,
-        fontsize=hook_config["fontsize"],
-        color=hook_config["color"],
-        stroke_color=hook_config["stroke_color"],
-        stroke_width=hook_config["stroke_width"],
-        font=hook_config["font"],
-        size=(config.VIDEO_WIDTH - 100, None),
-        method='caption'
-    ).set_position('center').set_duration(hook_dur)
-    
-    if hook_config["zoom_effect"]:
-        initial_hook = initial_hook.resize(lambda t: 1 + hook_config["zoom_speed"] * t)
+        elif layer["type"] == "progress":
+            track, fill = layer["bitmap"], layer["fill"]
+
+            def make_progress_frame(t, track=track, fill=fill):
+                frame = track.copy()
+                frame[:, :int(W * (t / duration))] = fill
+                return frame
+
+            layers.append(VideoClip(make_progress_frame, duration=duration).set_position(("left", y)))
+
+        elif layer["type"] == "text":
+            text = content[layer["field"]]
+            clip = text_clip(text.upper() if layer["upper"] else text, style, layer["width"], align='center')
+            clip = clip.set_position(("center", y)).set_start(start).set_duration(end - start)
+            if layer.get("zoom"):
+                clip = clip.resize(lambda t, speed=layer["zoom"]: 1 + speed * t)
+            layers.append(clip)
+
+        elif layer["type"] == "subtitles" and not spec["burn_in"]:
+            def subtitle_generator(txt, style=style, width=layer["width"]):
+                clip = text_clip(txt, style, width)
+
+                # Add background if configured (sized per line: a local clip, not a pooled bitmap)
+                if style["background_opacity"] > 0:
+                    bg = ColorClip(clip.size, color=style["background_color"])\
+                          .set_opacity(style["background_opacity"])
+                    clip = CompositeVideoClip([bg, clip])
+
+                return clip
+
+            # Word-by-word highlighting
+            def highlight_generator(txt, style=style, width=layer["width"]):
+                return text_clip(txt, style, width, color=style["highlight_color"])
+
+            layers.append(subtitle_track(subs, subtitle_generator).set_position(('center', y)))
+            layers.append(subtitle_track(word_subs, highlight_generator).set_position(('center', y)))
+
+    owned += layers[1:]
 
     # ───────────────────────────────────────────────
-    # BACKGROUND MUSIC
+    # FINAL COMPOSITION
     # ───────────────────────────────────────────────
-    final_audio = audio
-    
-    # Try to load category-specific music
-    music_path = Path(f"background_music/{news_type}_music.mp3")
-    if not music_path.exists():
-        music_path = Path("background_music/default_music.mp3")
-    
-    if music_path.exists():
-        try:
-            print(f"[INFO] Adding background music from {music_path}")
-            bg_music = AudioFileClip(str(music_path))
-            bg_music = bg_music.audio_loop(duration=duration)
-            bg_music = bg_music.volumex(config.AUDIO["background_music_volume"])
-            final_audio = CompositeAudioClip([audio, bg_music])
-        except Exception as e:
-            print(f"[WARN] Could not add background music: {e}")
+    final_video = CompositeVideoClip(layers, size=size).set_duration(duration)
+    owned.append(final_video)
+    return final_video, owned, windows
+
 
+def plan_video(
+    images: list[Path],
+    audio_path: str,
+    english_text: str,
+    headline: str,
+    hook: str,
+    subscribe_hook: str,
+    news_type: str = "default",
+    output_path: str = "output/final_short.mp4",
+    aspect_ratio: str = None,
+    renditions: list[str] = None,
+    preview: bool = False
+) -> dict:
+    """
+    Everything decided before the first frame, as a JSON-serializable render
+    plan: the mixed soundtrack, sentence / word timings, image list and
+    encode profile. render_plan() executes it (see scene_plan.py
+    for plans written to disk).
+    """
     # ───────────────────────────────────────────────
-    # END SCREEN - USING CONFIG
+    # AUDIO PROCESSING (decode once, time-stretch, duck music, one final track)
     # ───────────────────────────────────────────────
-    end_config = config.END_SCREEN
-    end_scr_dur = end_config["duration"]
-    end_start_time = max(0, duration - end_scr_dur)
-
-    end_bg = ColorClip(size=(config.VIDEO_WIDTH, config.VIDEO_HEIGHT), color=end_config["background_color"])\
-                .set_opacity(end_config["background_opacity"]).set_duration(end_scr_dur)
-
-    subscribe_text = TextClip(
-        subscribe_hook,
-        fontsize=end_config["fontsize"],
-        color=end_config["color"],
-        stroke_color=end_config["stroke_color"],
-        stroke_width=end_config["stroke_width"],
-        font=end_config["font"],
-        size=(config.VIDEO_WIDTH - 120, None),
-        method='caption'
-    ).set_position('center').set_duration(end_scr_dur)
-
-    end_screen = CompositeVideoClip([end_bg, subscribe_text]).set_start(end_start_time)
+    soundtrack = prepare_audio(audio_path, news_type)
+    duration = soundtrack["duration"]
+
+    print(f"[DEBUG] Audio Duration: {duration:.2f}s")
+
+    scale = config.PREVIEW["scale"] if preview else 1.0
+    fps = config.PREVIEW["fps"] if preview else config.FPS
+    layout = get_plan(scale)   # compiled once per process, shared by every scene
 
     # ───────────────────────────────────────────────
-    # FINAL COMPOSITION
+    # SUBTITLE TIMINGS
     # ───────────────────────────────────────────────
-    final_video = CompositeVideoClip([
-        slideshow,
-        header,
-        subtitle_clip,
-        highlight_clip,
-        progress_bg,
-        progress_fill,
-        initial_hook,
-        end_screen
-    ]).set_audio(final_audio).set_duration(duration)
+    timings = None
+    if config.ALIGNMENT["enabled"]:
+        try:
+            timings = get_timings(soundtrack["voice"], soundtrack["rate"], english_text,
+                                  cache_path=str(audio_path) + ".timings.json")
+        except Exception as e:
+            print(f"[WARN] Subtitle alignment failed ({e}), using uniform timing")
+    if timings is None:
+        timings = uniform_timings(english_text, duration)
+    del soundtrack["voice"]   # alignment was the last user of the PCM
+
+    if preview:
+        specs = ["preview"]
+    else:
+        specs = [out["spec"] for out in plan_outputs(output_path, aspect_ratio, renditions, layout["size"])]
+
+    return {
+        "output": str(output_path),
+        "preview": preview,
+        "audio": str(soundtrack["path"]),
+        # Everything needed to rebuild the composition, picklable for frame workers
+        "spec": {
+            "images": [str(p) for p in images],
+            "duration": duration,
+            "content": {"headline": headline, "hook": hook, "subscribe_hook": subscribe_hook},
+            "timings": timings,
+            "scale": scale,
+            "burn_in": False   # decided by render_plan, on the machine that renders
+        },
+        "layout": layout["name"],   # label only: the render machine compiles its own layout
+        "encode": {
+            "size": list(layout["size"]),
+            "fps": fps,
+            "renditions": specs,
+            "preset": config.PREVIEW["preset"] if preview else config.OUTPUT["preset"],
+            # Preview keeps subtitles in the Python frames so the contact sheet shows them
+            "subtitles": "python" if preview else config.SUBTITLE["renderer"],
+            "export_subtitles": config.SUBTITLE["export"] and not preview
+        }
+    }
+
+
+def write_subtitles(timings: dict, output_path: str, size: tuple[int, int]) -> str:
+    """<video>.srt (captions upload) and <video>.ass (karaoke); returns the .ass path"""
+    write_srt(timings, Path(output_path).with_suffix(".srt"))
+    return write_ass(timings, Path(output_path).with_suffix(".ass"), *size)
+
+
+def restore_scene(scene_key: str, output_path: str, report: dict = None) -> dict | None:
+    """
+    Place an earlier render of the same scene (render_cache.scene_key) at
+    output_path without planning it again. Returns the plan it was rendered
+    from, or None on a miss.
+    """
+    link = render_cache.recall(scene_key)
+    if link is None:
+        return None
+    plan, encode = link["plan"], link["plan"]["encode"]
+    specs, size = encode["renditions"], tuple(encode["size"])
+    paths = [out["path"] for out in plan_outputs(output_path, specs[0], specs[1:], size)]
+    if not render_cache.restore(link["key"], paths):
+        return None
+    print(f"[CACHE] Scene unchanged since render {link['key'][:12]}, reused for: {output_path}")
+    if encode["export_subtitles"]:
+        write_subtitles(plan["spec"]["timings"], output_path, size)
+    if report is not None:
+        report.update(cached=True, cache_key=link["key"])
+    return plan
+
+
+def render_plan(plan: dict, output_path: str = None, report: dict = None) -> str:
+    """
+    Compose and encode a plan from plan_video(); output_path overrides the
+    planned one. If report is a dict, report["cached"] says whether the
+    render cache supplied the video.
+    """
+    output_path = output_path or plan["output"]
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    encode, preview = plan["encode"], plan["preview"]
+    spec = dict(plan["spec"])
+    size, fps, duration = tuple(encode["size"]), encode["fps"], spec["duration"]
+
+    burn_in = encode["subtitles"] == "libass"
+    if burn_in and not has_filter("subtitles"):
+        print("[WARN] ffmpeg has no libass 'subtitles' filter, drawing subtitles in Python")
+        burn_in = False
+    spec["burn_in"] = burn_in
+
+    # Same scene, assets, settings and encoder as an earlier render: reuse its MP4s
+    cache_key = None
+    if report is not None:
+        report["cached"] = False
+    if config.RENDER_CACHE["enabled"] and not preview:
+        try:
+            cache_key = render_cache.fingerprint(dict(plan, spec=spec))
+            if report is not None:
+                report["cache_key"] = cache_key
+            specs = encode["renditions"]
+            paths = [out["path"] for out in plan_outputs(output_path, specs[0], specs[1:], size)]
+            if render_cache.restore(cache_key, paths):
+                print(f"[CACHE] Identical render {cache_key[:12]} reused for: {output_path}")
+                if encode["export_subtitles"]:
+                    write_subtitles(spec["timings"], output_path, size)
+                if report is not None:
+                    report["cached"] = True
+                return str(output_path)
+            render_cache.release(paths)
+        except Exception as e:
+            print(f"[WARN] Render cache lookup failed ({e}), rendering")
+
+    ass_path = None
+    if encode["export_subtitles"] or burn_in:
+        ass_path = write_subtitles(spec["timings"], output_path, size)
+
+    frame_workers = 1 if preview else min(config.RENDER["frame_workers"], os.cpu_count() or 1)
+    split_chunks = 1 if preview else min(config.RENDER["split_chunks"], os.cpu_count() or 1)
+    if frame_workers > 1 or split_chunks > 1:
+        final_video, owned, windows = None, [], {}
+    else:
+        final_video, owned, windows = compose_scene(spec)
 
     # ───────────────────────────────────────────────
     # RENDER VIDEO
     # ───────────────────────────────────────────────
-    print(f"[RENDER] Writing video file to: {output_path}")
-    
-    final_video.write_videofile(
-        output_path,
-        fps=config.FPS,
-        codec="libx264",
-        audio_codec="aac",
-        threads=2,
-        logger=None,
-        preset='medium',
-        bitrate='2000k'
-    )
+    if preview:
+        sheet_start = time.time()
+        hook_start, hook_end = windows.get("hook", (0, 0))
+        end_start, end_end = windows.get("subscribe", (duration, duration))
+        sheet = write_contact_sheet(final_video, {
+            "hook": (hook_start + hook_end) / 2,
+            "mid": duration / 2,
+            "end": (end_start + min(end_end, duration)) / 2
+        }, output_path)
+        print(f"[PREVIEW] Contact sheet {sheet[-1]} in {time.time() - sheet_start:.2f}s")
+        outputs = [{"spec": "preview", "size": size, "path": str(output_path), "filter": "null",
+                    "bitrate": f"{config.PREVIEW['bitrate_k']}k"}]
+    else:
+        specs = encode["renditions"]
+        outputs = plan_outputs(output_path, specs[0], specs[1:], size)
+    sizes = ", ".join("{}x{}".format(*o["size"]) for o in outputs)
+    print(f"[RENDER] Writing {sizes} to: {output_path}")
+
+    preset = encode["preset"]
+    if split_chunks > 1:
+        # Keyframe-aligned chunks encoded in parallel, joined losslessly, audio muxed once
+        split_encode(spec, fps, outputs, plan["audio"], split_chunks,
+                     subtitles=ass_path if burn_in else None, preset=preset)
+        frames = None
+    # One frame stream, split inside ffmpeg to every rendition; the finished
+    # soundtrack is copied in, and libass draws the karaoke subtitles if enabled
+    elif frame_workers > 1:
+        print(f"[RENDER] Composing frames in {frame_workers} worker processes")
+        frames = parallel_frames(spec, fps, frame_workers, config.RENDER["ring_slots"])
+    else:
+        frames = render_frames(final_video, frame_times(duration, fps))
+    try:
+        if frames is not None:
+            encode_video(
+                frames,
+                size, fps, outputs,
+                audio_path=plan["audio"],
+                pre_filter=f"subtitles={filter_path(ass_path)}" if burn_in else None,
+                preset=preset,
+                pix_fmt=pipe_format()
+            )
+    finally:
+        for clip in reversed(owned):
+            clip.close()
+    for extra in outputs[1:]:
+        print(f"[RENDER] Rendition {extra['spec']}: {extra['path']}")
+    if cache_key:
+        try:
+            render_cache.store(cache_key, [out["path"] for out in outputs])
+        except OSError as e:
+            print(f"[WARN] Could not cache the render: {e}")
+    return str(output_path)
+
+
+def make_short_video(
+    images: list[Path],
+    audio_path: str,
+    english_text: str,
+    headline: str,
+    hook: str,
+    subscribe_hook: str,
+    news_type: str = "default",  # Add news_type parameter
+    output_path: str = "output/final_short.mp4",
+    aspect_ratio: str = None,
+    renditions: list[str] = None,
+    preview: bool = False
+) -> str:
+    """
+    Compose and encode one Short (plan_video + render_plan). The primary
+    rendition (aspect_ratio, e.g. "9:16_FILL") is written to output_path;
+    extra renditions (default config.OUTPUT["renditions"]) come from the same
+    frame stream, see renditions.py.
+    preview=True renders the same layout scaled by PREVIEW["scale"] at
+    PREVIEW["fps"] with an ultrafast encode, plus a contact sheet of key frames.
+    """
+
+    start_total = time.time()
+    print(f"[TIMER] Video composition started for: {headline}")
+
+    plan = plan_video(images, audio_path, english_text, headline, hook, subscribe_hook, news_type,
+                      output_path, aspect_ratio, renditions, preview)
+    render_plan(plan)
 
-    # Close clips to free memory
-    audio.close()
-    if 'bg_music' in locals():
-        bg_music.close()
-    
     print(f"[SUCCESS] Video created: {output_path}")
     print(f"[TIMER] Total composition time: {time.time() - start_total:.2f}s")
 
-    return output_path
\ No newline at end of file
+    return output_path